@@ -5,7 +5,14 @@ from sqlalchemy import create_engine
 from alembic import context
 from app.config import settings
 from app.database import Base
-from app.models import summary  # noqa: F401
+from app.models import (  # noqa: F401
+    job,
+    job_result,
+    minhash_band,
+    summary,
+    summary_search,
+    url_alias,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -22,6 +29,15 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    # The full-text search objects (app/models/summary_search.py) are plain
+    # DDL outside the metadata; keep autogenerate from dropping them
+    if name in summary_search.SEARCH_OBJECTS:
+        return False
+    return not (type_ == "table" and name.startswith("summaries_fts"))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -45,6 +61,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -62,7 +79,11 @@ def run_migrations_online() -> None:
     connectable = create_engine(settings.database_url)
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,36 @@
+"""add url and created_at indexes to summaries
+
+Revision ID: 3f9a1c2d7b84
+Revises: ae6f4c33ef5c
+Create Date: 2026-10-18 09:12:44.301927
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c2d7b84"
+down_revision: str | Sequence[str] | None = "ae6f4c33ef5c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_summaries_url_created_at",
+        "summaries",
+        ["url", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_summaries_created_at"), "summaries", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_summaries_created_at"), table_name="summaries")
+    op.drop_index("ix_summaries_url_created_at", table_name="summaries")
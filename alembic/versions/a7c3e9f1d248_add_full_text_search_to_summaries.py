@@ -0,0 +1,83 @@
+"""add full-text search index to summaries
+
+Revision ID: a7c3e9f1d248
+Revises: f3a9d5e2c7b1
+Create Date: 2026-10-18 19:02:41.517093
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f1d248"
+down_revision: str | Sequence[str] | None = "f3a9d5e2c7b1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Copy of app.models.summary_search at this revision
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE summaries_fts USING fts5(
+        url, summary, content='summaries', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER summaries_fts_ai AFTER INSERT ON summaries BEGIN
+        INSERT INTO summaries_fts (rowid, url, summary)
+        VALUES (new.id, new.url, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER summaries_fts_ad AFTER DELETE ON summaries BEGIN
+        INSERT INTO summaries_fts (summaries_fts, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER summaries_fts_au AFTER UPDATE OF url, summary ON summaries BEGIN
+        INSERT INTO summaries_fts (summaries_fts, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+        INSERT INTO summaries_fts (rowid, url, summary)
+        VALUES (new.id, new.url, new.summary);
+    END
+    """,
+]
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE summaries ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(url, '') || ' ' || coalesce(summary, ''))
+    ) STORED
+    """,
+    "CREATE INDEX ix_summaries_search_vector ON summaries USING gin (search_vector)",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        # Index the existing rows; the triggers only see later writes
+        op.execute("INSERT INTO summaries_fts (summaries_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        # The generated column is computed for existing rows as it is added
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("summaries_fts_ai", "summaries_fts_ad", "summaries_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS summaries_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_summaries_search_vector")
+        op.execute("ALTER TABLE summaries DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,53 @@
+"""create jobs table
+
+Revision ID: b71e0d5c9a3f
+Revises: 3f9a1c2d7b84
+Create Date: 2026-10-18 11:03:27.518204
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71e0d5c9a3f"
+down_revision: str | Sequence[str] | None = "3f9a1c2d7b84"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(), server_default="pending", nullable=False),
+        sa.Column("urls", sa.JSON(), nullable=False),
+        sa.Column("length", sa.String(), server_default="medium", nullable=False),
+        sa.Column("format", sa.String(), server_default="prose", nullable=False),
+        sa.Column("callback_url", sa.String(), nullable=True),
+        sa.Column("results", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_jobs_status"), "jobs", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_jobs_status"), table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,62 @@
+"""add word_count to summaries and backfill it
+
+Revision ID: b8e4d1c9f357
+Revises: a7c3e9f1d248
+Create Date: 2026-10-18 20:11:26.604318
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e4d1c9f357"
+down_revision: str | Sequence[str] | None = "a7c3e9f1d248"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Rows read per backfill query; content runs up to ~50 KB per row
+BATCH = 500
+
+summaries = sa.table(
+    "summaries",
+    sa.column("id", sa.Integer),
+    sa.column("content", sa.Text),
+    sa.column("word_count", sa.Integer),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "summaries",
+        sa.Column("word_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Count the words of the stored content, as Summary does when it is set
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(summaries.c.id, summaries.c.content)
+            .where(summaries.c.id > last_id, summaries.c.content.is_not(None))
+            .order_by(summaries.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        for id, content in rows:
+            connection.execute(
+                summaries.update()
+                .where(summaries.c.id == id)
+                .values(word_count=len(content.split()))
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("summaries", "word_count")
@@ -0,0 +1,37 @@
+"""add etag, last_modified and content_hash to summaries
+
+Revision ID: c4d8e2f1a6b9
+Revises: b71e0d5c9a3f
+Create Date: 2026-10-18 14:21:09.118734
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8e2f1a6b9"
+down_revision: str | Sequence[str] | None = "b71e0d5c9a3f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("summaries", sa.Column("etag", sa.String(), nullable=True))
+    op.add_column("summaries", sa.Column("last_modified", sa.String(), nullable=True))
+    op.add_column(
+        "summaries", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Batch mode, so the columns can also be dropped on SQLite
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.drop_column("content_hash")
+        batch_op.drop_column("last_modified")
+        batch_op.drop_column("etag")
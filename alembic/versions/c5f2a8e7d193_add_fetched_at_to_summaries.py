@@ -0,0 +1,98 @@
+"""add fetched_at to summaries for cache freshness
+
+Revision ID: c5f2a8e7d193
+Revises: b8e4d1c9f357
+Create Date: 2026-10-19 09:41:07.218530
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f2a8e7d193"
+down_revision: str | Sequence[str] | None = "b8e4d1c9f357"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The full-text index triggers of a7c3e9f1d248, dropped when a batch
+# operation recreates `summaries` on SQLite
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER summaries_fts_ai AFTER INSERT ON summaries BEGIN
+        INSERT INTO summaries_fts (rowid, url, summary)
+        VALUES (new.id, new.url, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER summaries_fts_ad AFTER DELETE ON summaries BEGIN
+        INSERT INTO summaries_fts (summaries_fts, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER summaries_fts_au AFTER UPDATE OF url, summary ON summaries BEGIN
+        INSERT INTO summaries_fts (summaries_fts, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+        INSERT INTO summaries_fts (rowid, url, summary)
+        VALUES (new.id, new.url, new.summary);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("summaries", sa.Column("fetched_at", sa.DateTime(), nullable=True))
+    # Until now created_at was moved forward on every refresh, so it holds
+    # the last fetch time
+    op.execute("UPDATE summaries SET fetched_at = created_at")
+
+    op.drop_index("ix_summaries_canonical_url_created_at", table_name="summaries")
+    op.drop_index("ix_summaries_content_hash_created_at", table_name="summaries")
+    # Batch mode, so the column can also be made NOT NULL on SQLite
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.alter_column(
+            "fetched_at",
+            existing_type=sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        )
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+
+    op.create_index(
+        "ix_summaries_canonical_url_fetched_at",
+        "summaries",
+        ["canonical_url", "fetched_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_summaries_content_hash_fetched_at",
+        "summaries",
+        ["content_hash", "fetched_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_summaries_content_hash_fetched_at", table_name="summaries")
+    op.drop_index("ix_summaries_canonical_url_fetched_at", table_name="summaries")
+    op.drop_column("summaries", "fetched_at")
+    op.create_index(
+        "ix_summaries_content_hash_created_at",
+        "summaries",
+        ["content_hash", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_summaries_canonical_url_created_at",
+        "summaries",
+        ["canonical_url", "created_at"],
+        unique=False,
+    )
@@ -0,0 +1,135 @@
+"""add canonical_url to summaries and create url_aliases
+
+Revision ID: d2a7f3b9e815
+Revises: c4d8e2f1a6b9
+Create Date: 2026-10-18 15:47:52.604113
+
+"""
+
+from collections.abc import Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a7f3b9e815"
+down_revision: str | Sequence[str] | None = "c4d8e2f1a6b9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Rows read per backfill query
+BATCH = 500
+
+summaries = sa.table(
+    "summaries",
+    sa.column("id", sa.Integer),
+    sa.column("url", sa.String),
+    sa.column("canonical_url", sa.String),
+)
+
+# Frozen copy of app.utils.urls.canonicalize_url with the default settings at
+# the time of this revision, so later changes to either do not alter it
+DEFAULT_PORTS = {"http": 80, "https": 443}
+TRACKING_PARAMS = (
+    "utm_*,fbclid,gclid,dclid,gbraid,wbraid,msclkid,yclid,mc_cid,mc_eid,"
+    "_ga,_gl,igshid,ref_src,ref_url,cmpid,spm"
+).split(",")
+
+
+def canonicalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    params = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(name)
+    ]
+    query = urlencode(sorted(params, key=lambda param: param[0]))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    for pattern in TRACKING_PARAMS:
+        if pattern.endswith("*"):
+            if name.startswith(pattern[:-1]):
+                return True
+        elif name == pattern:
+            return True
+    return False
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("summaries", sa.Column("canonical_url", sa.String(), nullable=True))
+
+    # Backfill existing rows with the canonical form of their requested URL
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(summaries.c.id, summaries.c.url)
+            .where(summaries.c.id > last_id)
+            .order_by(summaries.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        for id, url in rows:
+            connection.execute(
+                summaries.update()
+                .where(summaries.c.id == id)
+                .values(canonical_url=canonicalize_url(url))
+            )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.alter_column(
+            "canonical_url", existing_type=sa.String(), nullable=False
+        )
+        batch_op.drop_index("ix_summaries_url_created_at")
+        batch_op.create_index(
+            "ix_summaries_canonical_url_created_at",
+            ["canonical_url", "created_at"],
+            unique=False,
+        )
+
+    op.create_table(
+        "url_aliases",
+        sa.Column("alias", sa.String(), nullable=False),
+        sa.Column("canonical_url", sa.String(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("alias"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("url_aliases")
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.drop_index("ix_summaries_canonical_url_created_at")
+        batch_op.create_index(
+            "ix_summaries_url_created_at", ["url", "created_at"], unique=False
+        )
+        batch_op.drop_column("canonical_url")
@@ -0,0 +1,121 @@
+"""add job leases and move job results to their own table
+
+Revision ID: d9b3f6a1c482
+Revises: c5f2a8e7d193
+Create Date: 2026-10-19 11:26:48.903157
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9b3f6a1c482"
+down_revision: str | Sequence[str] | None = "c5f2a8e7d193"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Jobs read per copy query; each carries up to max_batch_size results
+BATCH = 100
+
+jobs = sa.table(
+    "jobs",
+    sa.column("id", sa.String),
+    sa.column("results", sa.JSON),
+)
+
+job_results = sa.table(
+    "job_results",
+    sa.column("job_id", sa.String),
+    sa.column("index", sa.Integer),
+    sa.column("result", sa.JSON),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("jobs", sa.Column("owner", sa.String(), nullable=True))
+    op.add_column("jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+    op.create_table(
+        "job_results",
+        sa.Column("job_id", sa.String(length=32), nullable=False),
+        sa.Column("index", sa.Integer(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_id", "index"),
+    )
+
+    # One row per stored result; "index" moves from the item to the key
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(jobs.c.id, jobs.c.results)
+            .where(jobs.c.id > last_id)
+            .order_by(jobs.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        by_index = {
+            (id, result["index"]): {k: v for k, v in result.items() if k != "index"}
+            for id, results in rows
+            for result in results or []
+        }
+        if by_index:
+            op.bulk_insert(
+                job_results,
+                [
+                    {"job_id": id, "index": index, "result": result}
+                    for (id, index), result in by_index.items()
+                ],
+            )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("results")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("results", sa.JSON(), nullable=True))
+
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        ids = (
+            connection.execute(
+                sa.select(jobs.c.id)
+                .where(jobs.c.id > last_id)
+                .order_by(jobs.c.id)
+                .limit(BATCH)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            break
+        results: dict[str, list[dict]] = {id: [] for id in ids}
+        rows = connection.execute(
+            sa.select(job_results.c.job_id, job_results.c.index, job_results.c.result)
+            .where(job_results.c.job_id.in_(ids))
+            .order_by(job_results.c.job_id, job_results.c.index)
+        )
+        for job_id, index, result in rows:
+            results[job_id].append({"index": index, **result})
+        for id, items in results.items():
+            connection.execute(
+                jobs.update().where(jobs.c.id == id).values(results=items)
+            )
+        last_id = ids[-1]
+
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.alter_column("results", existing_type=sa.JSON(), nullable=False)
+
+    op.drop_table("job_results")
+    op.drop_column("jobs", "heartbeat_at")
+    op.drop_column("jobs", "owner")
@@ -0,0 +1,73 @@
+"""add content_hash index to summaries and backfill hashes
+
+Revision ID: e6c1b8d4f072
+Revises: d2a7f3b9e815
+Create Date: 2026-10-18 16:32:40.271905
+
+"""
+
+import hashlib
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6c1b8d4f072"
+down_revision: str | Sequence[str] | None = "d2a7f3b9e815"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Rows read per backfill query; content runs up to ~50 KB per row
+BATCH = 500
+
+summaries = sa.table(
+    "summaries",
+    sa.column("id", sa.Integer),
+    sa.column("content", sa.Text),
+    sa.column("content_hash", sa.String),
+)
+
+
+def content_hash(text: str) -> str:
+    # Frozen copy of app.utils.hashing.content_hash at this revision
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (Re)hash the stored content of every row, so earlier summaries can be
+    # found as duplicates too
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(summaries.c.id, summaries.c.content)
+            .where(summaries.c.id > last_id, summaries.c.content.is_not(None))
+            .order_by(summaries.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        for id, content in rows:
+            connection.execute(
+                summaries.update()
+                .where(summaries.c.id == id)
+                .values(content_hash=content_hash(content))
+            )
+        last_id = rows[-1].id
+
+    op.create_index(
+        "ix_summaries_content_hash_created_at",
+        "summaries",
+        ["content_hash", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_summaries_content_hash_created_at", table_name="summaries")
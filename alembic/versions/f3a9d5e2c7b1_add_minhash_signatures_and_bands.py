@@ -0,0 +1,156 @@
+"""add minhash to summaries and create minhash_bands
+
+Revision ID: f3a9d5e2c7b1
+Revises: e6c1b8d4f072
+Create Date: 2026-10-18 17:14:03.880412
+
+"""
+
+import hashlib
+import re
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9d5e2c7b1"
+down_revision: str | Sequence[str] | None = "e6c1b8d4f072"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Rows read per backfill query; content runs up to ~50 KB per row
+BATCH = 500
+
+summaries = sa.table(
+    "summaries",
+    sa.column("id", sa.Integer),
+    sa.column("content", sa.Text),
+    sa.column("minhash", sa.LargeBinary),
+)
+
+# Frozen copy of app.utils.minhash at this revision. The stored signatures and
+# band buckets must match what that module computed then, whatever it becomes
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+CHUNK = 4096
+SEED = 0x5EED_D157_111A_0001
+
+WORD = re.compile(r"\w+")
+
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    x = x ^ (x >> np.uint64(30))
+    x = x * _M1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _M2
+    return x ^ (x >> np.uint64(31))
+
+
+def _permutations() -> tuple[np.ndarray, np.ndarray]:
+    counters = np.uint64(SEED) + np.arange(2 * NUM_PERM, dtype=np.uint64) * _GOLDEN
+    values = _mix(counters)
+    return values[:NUM_PERM] | np.uint64(1), values[NUM_PERM:]
+
+
+_A, _B = _permutations()
+
+
+def shingles(text: str) -> np.ndarray:
+    words = WORD.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    vocabulary, ids = np.unique(np.array(words), return_inverse=True)
+    word_hashes = np.array(
+        [zlib.crc32(word.encode()) for word in vocabulary], dtype=np.uint64
+    )[ids]
+
+    width = min(SHINGLE_WORDS, len(words))
+    count = len(words) - width + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        hashes = hashes * _GOLDEN + word_hashes[offset : offset + count]
+    return np.unique(_mix(hashes))
+
+
+def signature(text: str) -> bytes | None:
+    values = shingles(text)
+    if not len(values):
+        return None
+    minima = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint64)
+    for start in range(0, len(values), CHUNK):
+        chunk = values[start : start + CHUNK]
+        hashed = (_A[:, None] * chunk[None, :] + _B[:, None]) >> np.uint64(32)
+        np.minimum(minima, hashed.min(axis=1), out=minima)
+    return minima.astype("<u4").tobytes()
+
+
+def bands(sig: bytes) -> list[int]:
+    buckets = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS * 4 : (band + 1) * ROWS * 4]
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("summaries", sa.Column("minhash", sa.LargeBinary(), nullable=True))
+    minhash_bands = op.create_table(
+        "minhash_bands",
+        sa.Column("summary_id", sa.Integer(), nullable=False),
+        sa.Column("band", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["summary_id"], ["summaries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("summary_id", "band"),
+    )
+    op.create_index(
+        "ix_minhash_bands_bucket", "minhash_bands", ["bucket"], unique=False
+    )
+
+    # Sign and index the stored content of existing rows
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(summaries.c.id, summaries.c.content)
+            .where(summaries.c.id > last_id, summaries.c.content.is_not(None))
+            .order_by(summaries.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        for id, content in rows:
+            sig = signature(content)
+            if sig is None:
+                continue
+            connection.execute(
+                summaries.update().where(summaries.c.id == id).values(minhash=sig)
+            )
+            op.bulk_insert(
+                minhash_bands,
+                [
+                    {"summary_id": id, "band": band, "bucket": bucket}
+                    for band, bucket in enumerate(bands(sig))
+                ],
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_minhash_bands_bucket", table_name="minhash_bands")
+    op.drop_table("minhash_bands")
+    # Batch mode, so the column can also be dropped on SQLite
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.drop_column("minhash")
@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.summary import Summary, utcnow
+from app.utils.urls import canonicalize_url
+
+CacheKey = tuple[str, str, str]
+
+# Rough per-entry bookkeeping cost (slots object, key tuple, dict slot)
+_ENTRY_OVERHEAD_BYTES = 256
+
+
+def cache_cutoff() -> datetime:
+    """
+    Return the oldest `fetched_at` (naive UTC, as stored) still considered fresh.
+    """
+    return utcnow() - timedelta(minutes=settings.cache_ttl_minutes)
+
+
+def stale_cutoff(cutoff: datetime) -> datetime:
+    """
+    Return the oldest `fetched_at` that may still be served stale, given the
+    freshness `cutoff` from cache_cutoff().
+    """
+    return cutoff - timedelta(minutes=settings.cache_stale_minutes)
+
+
+class CachedSummary:
+    """
+    Compact, immutable snapshot of the response fields of a Summary record.
+
+    Detached from any database session, so it can be served without touching
+    the database and without keeping the (potentially large) content around.
+    """
+
+    __slots__ = (
+        "id",
+        "url",
+        "canonical_url",
+        "summary",
+        "model",
+        "length",
+        "format",
+        "reading_time_minutes",
+        "created_at",
+        "fetched_at",
+        "size",
+    )
+
+    def __init__(self, record: Summary) -> None:
+        self.id = record.id
+        self.url = record.url
+        self.canonical_url = record.canonical_url
+        self.summary = record.summary
+        self.model = record.model
+        self.length = record.length
+        self.format = record.format
+        self.reading_time_minutes = record.reading_time_minutes
+        self.created_at = record.created_at
+        self.fetched_at = record.fetched_at
+        self.size = (
+            len(self.url.encode())
+            + len(self.canonical_url.encode())
+            + len(self.summary.encode())
+            + len(self.model.encode())
+            + _ENTRY_OVERHEAD_BYTES
+        )
+
+
+class SummaryCache:
+    """
+    Bounded in-memory LRU cache of summaries keyed by (canonical URL, length,
+    format); lookups canonicalize the given URL and follow known aliases.
+
+    Entries expire `cache_ttl_minutes` after the record was fetched, matching
+    the database cache check, and are evicted least-recently-used first when
+    either `max_entries` or `max_bytes` is exceeded. Safe to use from both the
+    event loop and threadpool routes.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, CachedSummary] = OrderedDict()
+        # Canonical requested URL -> canonical URL its summary is stored under
+        self._aliases: OrderedDict[str, str] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, url: str, length: str, format: str) -> CachedSummary | None:
+        url = canonicalize_url(url)
+        cutoff = cache_cutoff()
+        with self._lock:
+            key = (self._aliases.get(url, url), length, format)
+            entry = self._entries.get(key)
+            if entry is not None and entry.fetched_at < cutoff:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, record: Summary) -> CachedSummary:
+        entry = CachedSummary(record)
+        key = (entry.canonical_url, entry.length, entry.format)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if entry.size > self.max_bytes:
+                return entry
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return entry
+
+    def alias(self, url: str, canonical_url: str) -> None:
+        """
+        Make lookups of `url` find the entries stored under `canonical_url`
+        (see url_aliases). Keeps at most `max_entries` aliases.
+        """
+        url = canonicalize_url(url)
+        with self._lock:
+            self._aliases[url] = canonical_url
+            self._aliases.move_to_end(url)
+            if len(self._aliases) > self.max_entries:
+                self._aliases.popitem(last=False)
+
+    def invalidate(self, url: str, length: str, format: str) -> None:
+        with self._lock:
+            self._remove((canonicalize_url(url), length, format))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+summary_cache = SummaryCache(
+    max_entries=settings.summary_cache_max_entries,
+    max_bytes=settings.summary_cache_max_bytes,
+)
+
+
+class CountCache:
+    """
+    Short-lived cache of row counts keyed by filter, so paginated listings
+    need not count the whole (filtered) table on every request. A cached
+    count may lag behind inserts and deletes by up to `ttl` seconds. Safe to
+    use from threadpool routes.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, count: Callable[[], int]) -> int:
+        """
+        Return the cached count for `key`, calling `count()` to (re)compute
+        it if missing or older than `ttl`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[1] > now:
+                return cached[0]
+        value = count()
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+history_counts = CountCache(ttl=settings.history_total_cache_seconds)
@@ -0,0 +1,64 @@
+import httpx
+
+from app.config import settings
+from app.services.dns import PinnedTransport
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+
+
+def _build_client(
+    timeout: float, transport: httpx.AsyncBaseTransport | None = None
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=timeout, limits=_limits(), transport=transport)
+
+
+def get_scraper_client() -> httpx.AsyncClient:
+    """
+    Return the shared client used to fetch pages. It only connects to public
+    addresses, pinned at connect time (see app/services/dns.py).
+
+    The client is normally created by the application lifespan; it is created
+    lazily here so services also work outside of a running app (e.g. scripts).
+    """
+    client = _clients.get("scraper")
+    if client is None or client.is_closed:
+        client = _clients["scraper"] = _build_client(
+            settings.scraper_timeout_seconds, PinnedTransport(_limits())
+        )
+    return client
+
+
+def get_ollama_client() -> httpx.AsyncClient:
+    """
+    Return the shared client used to talk to Ollama.
+    """
+    client = _clients.get("ollama")
+    if client is None or client.is_closed:
+        client = _clients["ollama"] = _build_client(settings.ollama_timeout_seconds)
+    return client
+
+
+def open_clients() -> None:
+    """
+    Create the shared HTTP clients. Called once on application startup.
+    """
+    get_scraper_client()
+    get_ollama_client()
+
+
+async def close_clients() -> None:
+    """
+    Close the shared HTTP clients and release their pooled connections.
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
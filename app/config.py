@@ -1,3 +1,6 @@
+from typing import Literal, Self
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,7 +14,11 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./distill.db"
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3.2"
-    max_content_chars: int = 50_000
+    # Hard cap on scraped text; longer documents are summarized map-reduce
+    # style (see ollama.condense) rather than truncated to the context window
+    max_content_chars: int = 200_000
+    ollama_context_tokens: int = 8192
+    map_reduce_concurrency: int = 4
     api_key: str | None = None
 
     # Comma-separated lists, e.g. "example.com,bad.org"
@@ -20,6 +27,109 @@ class Settings(BaseSettings):
 
     rate_limit_per_minute: int = 10
     cache_ttl_minutes: int = 60
+    # Stale-while-revalidate: for this long after `cache_ttl_minutes`, an
+    # expired summary is still served (X-Cache: STALE) while it is refreshed
+    # in the background (0: disabled)
+    cache_stale_minutes: int = 0
+    # A fresh summary of a page whose content has at least this estimated
+    # (MinHash) Jaccard similarity is reused instead of generating a new one;
+    # above 1.0 only exact duplicates are reused
+    near_duplicate_threshold: float = 0.9
+
+    # Cursor-paginated history reuses its total for this long (0: always count)
+    history_total_cache_seconds: float = 30.0
+
+    # In-process LRU tier in front of the database cache lookup
+    summary_cache_max_entries: int = 1024
+    summary_cache_max_bytes: int = 16 * 1024 * 1024
+
+    # Shared HTTP connection pools (see app/clients.py)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    scraper_timeout_seconds: float = 5.0
+    ollama_timeout_seconds: float = 120.0
+
+    # Concurrency caps shared by every request in the worker
+    scrape_concurrency: int = 16
+    scrape_per_host_concurrency: int = 2
+    generation_concurrency: int = 4
+    max_batch_size: int = 200
+
+    # A running job whose worker has not heartbeated for this long is taken
+    # over by the next worker that starts up
+    job_lease_seconds: float = 60.0
+
+    # Page bodies are streamed and cut off after this many (decompressed) bytes
+    max_download_bytes: int = 5_000_000
+
+    # Redirects followed per fetch (each hop is re-checked against SSRF rules)
+    max_redirects: int = 5
+
+    # Failed fetches are answered from memory for this long (0: never), and
+    # a host is backed off after this many consecutive timeouts / connection
+    # errors / 5xx, for base * 2^n seconds (capped) after the n-th extra one
+    negative_cache_ttl_seconds: float = 60.0
+    negative_cache_max_entries: int = 4096
+    host_backoff_threshold: int = 3
+    host_backoff_base_seconds: float = 5.0
+    host_backoff_max_seconds: float = 300.0
+
+    # URL canonicalization for cache keys: query parameters dropped (exact
+    # names, or prefixes ending in "*") and whether "www." is ignored
+    url_tracking_params: str = (
+        "utm_*,fbclid,gclid,dclid,gbraid,wbraid,msclkid,yclid,mc_cid,mc_eid,"
+        "_ga,_gl,igshid,ref_src,ref_url,cmpid,spm"
+    )
+    canonical_strip_www: bool = True
+
+    # HTML-to-text backend: "lxml" (fast, default) or "bs4" (pure Python).
+    # "bs4" requires content_extraction="full": main-content scoring always
+    # works on the lxml tree
+    html_extractor: Literal["lxml", "bs4"] = "lxml"
+    # "main" keeps only the article body (readability-style; all text on pages
+    # with no single article, such as front pages), "full" all text
+    content_extraction: Literal["main", "full"] = "main"
+    # Extraction runs in this many worker processes for pages of at least
+    # `extraction_process_threshold_bytes`, in a thread otherwise (0: always)
+    extraction_workers: int = 2
+    extraction_process_threshold_bytes: int = 256_000
+
+    # Cache of host lookups used for the SSRF check and the connection itself
+    dns_cache_ttl_seconds: float = 300.0
+    dns_negative_ttl_seconds: float = 30.0
+    dns_cache_max_entries: int = 4096
+
+    @model_validator(mode="after")
+    def _check_extraction(self) -> Self:
+        if self.html_extractor == "bs4" and self.content_extraction == "main":
+            raise ValueError(
+                'html_extractor="bs4" has no effect with content_extraction="main"'
+                " (main-content extraction always uses lxml); set"
+                ' content_extraction="full" to extract with bs4'
+            )
+        return self
+
+    @property
+    def async_database_url(self) -> str:
+        """`database_url` with the matching asyncio driver selected."""
+        scheme, sep, rest = self.database_url.partition("://")
+        if "+" in scheme:
+            return self.database_url
+        drivers = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+        return f"{drivers.get(scheme, scheme)}{sep}{rest}"
+
+    @property
+    def database_connect_args(self) -> dict[str, object]:
+        """
+        Driver options for the sync engine. SQLite connections are shared
+        across the threads running sync routes; other drivers (e.g. psycopg2)
+        reject `check_same_thread`.
+        """
+        scheme = self.database_url.partition("://")[0]
+        if scheme.split("+")[0] == "sqlite":
+            return {"check_same_thread": False}
+        return {}
 
     @property
     def blocked_domains(self) -> list[str]:
@@ -29,5 +139,11 @@ class Settings(BaseSettings):
     def allowed_domains(self) -> list[str]:
         return [d.strip() for d in self.url_allowlist.split(",") if d.strip()]
 
+    @property
+    def tracking_params(self) -> list[str]:
+        return [
+            p.strip().lower() for p in self.url_tracking_params.split(",") if p.strip()
+        ]
+
 
 settings = Settings()
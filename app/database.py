@@ -1,12 +1,27 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import settings
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+engine = create_engine(
+    settings.database_url, connect_args=settings.database_connect_args
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(settings.async_database_url)
+
+# expire_on_commit=False so records can still be serialized after a commit
+# without triggering an implicit (and, under asyncio, illegal) lazy load.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     """Base class that all SQLAlchemy models will inherit from."""
@@ -27,3 +42,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    FastAPI dependency that yields an AsyncSession for `async def` routes, so
+    database work does not block the event loop.
+
+    Usage in a route:
+        async def my_route(db: AsyncSession = Depends(get_async_db)): ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    FastAPI dependency returning the AsyncSession factory, for work that
+    outlives the request (e.g. background jobs) and so cannot use the
+    request-scoped session from get_async_db.
+    """
+    return AsyncSessionLocal
@@ -0,0 +1,101 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TypeVar
+
+from app.config import settings
+from app.logger import log
+
+T = TypeVar("T")
+
+
+class CPUOffloader:
+    """
+    Runs CPU-bound work off the event loop: in a process pool for large
+    inputs, so a multi-megabyte page cannot stall the worker (the GIL makes
+    threads useless for that), and in the default thread pool for small ones,
+    where process start-up and pickling would cost more than the work.
+
+    Only the function's arguments and return value cross the process
+    boundary, so `fn` must be a picklable module-level function.
+    """
+
+    def __init__(self, workers: int, threshold_bytes: int) -> None:
+        self.workers = workers
+        self.threshold_bytes = threshold_bytes
+        self._pool: ProcessPoolExecutor | None = None
+        self._in_flight = {"process": 0, "thread": 0}
+        self._completed = {"process": 0, "thread": 0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # "spawn" does not copy the parent's threads and locks into workers
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], data: bytes, *args: object) -> T:
+        """
+        Run `fn(data, *args)` in a worker process if `data` is at least
+        `threshold_bytes` long (and a pool is configured), otherwise in a thread.
+        """
+        if self.workers > 0 and len(data) >= self.threshold_bytes:
+            try:
+                return await self._submit("process", fn, data, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start a fresh pool next time
+                log.info("process pool broken, retrying in a thread")
+                self.shutdown()
+        return await self._submit("thread", fn, data, *args)
+
+    async def _submit(self, kind: str, fn: Callable[..., T], *args: object) -> T:
+        loop = asyncio.get_running_loop()
+        executor = self._get_pool() if kind == "process" else None
+        self._in_flight[kind] += 1
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        finally:
+            self._in_flight[kind] -= 1
+            self._completed[kind] += 1
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes; queued work is cancelled.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Tasks waiting for a worker process (`queued`) vs running, for sizing
+        `extraction_workers`.
+        """
+        in_flight = self._in_flight["process"]
+        return {
+            "workers": self.workers,
+            "threshold_bytes": self.threshold_bytes,
+            "queued": max(0, in_flight - self.workers),
+            "running": min(in_flight, self.workers),
+            "threads_running": self._in_flight["thread"],
+            "completed_in_processes": self._completed["process"],
+            "completed_in_threads": self._completed["thread"],
+        }
+
+
+# HTML extraction; see app/services/scraper.py
+extraction_offloader = CPUOffloader(
+    workers=settings.extraction_workers,
+    threshold_bytes=settings.extraction_process_threshold_bytes,
+)
+
+
+def close_executors() -> None:
+    """
+    Stop the worker processes. Called once on application shutdown.
+    """
+    extraction_offloader.shutdown()
@@ -1,3 +1,6 @@
+import math
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import cast
 
 import httpx
@@ -8,16 +11,38 @@ from slowapi.errors import RateLimitExceeded
 from starlette.types import ExceptionHandler
 
 from app import limiter
+from app.clients import close_clients, open_clients
+from app.database import async_engine, get_async_session_factory
 from app.dependencies import require_api_key
+from app.executors import close_executors
 from app.logger import configure_logging
 from app.middleware import RequestIDMiddleware
 from app.routes import health, summarize
+from app.services import dns, failures, jobs, scraper, summarizer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    open_clients()
+    session_factory = app.dependency_overrides.get(
+        get_async_session_factory, get_async_session_factory
+    )()
+    await jobs.resume(session_factory)
+    jobs.watch(session_factory)
+    yield
+    await jobs.shutdown()
+    await summarizer.shutdown()
+    await close_clients()
+    close_executors()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Distill",
     description="URL summarizer powered by a local LLM via Ollama.",
     version="0.1.0",
     dependencies=[Depends(require_api_key)],
+    lifespan=lifespan,
 )
 
 app.state.limiter = limiter
@@ -41,6 +66,15 @@ async def http_status_error_handler(request: Request, exc: httpx.HTTPStatusError
     )
 
 
+@app.exception_handler(failures.HostBackoffError)
+async def host_backoff_handler(request: Request, exc: failures.HostBackoffError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Could not reach {exc.host}. Please try again later."},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 @app.exception_handler(httpx.RequestError)
 async def request_error_handler(request: Request, exc: httpx.RequestError):
     return JSONResponse(
@@ -49,3 +83,14 @@ async def request_error_handler(request: Request, exc: httpx.RequestError):
             "detail": "Could not reach an external service. Please try again later."
         },
     )
+
+
+@app.exception_handler(dns.BlockedAddressError)
+async def blocked_address_handler(request: Request, exc: dns.BlockedAddressError):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
+@app.exception_handler(scraper.UnsupportedContentError)
+@app.exception_handler(scraper.RedirectError)
+async def rejected_page_handler(request: Request, exc: ValueError):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
@@ -0,0 +1,58 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.models.job_result import JobResult
+from app.schemas.summary import JobStatus, SummaryFormat, SummaryLength
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[str] = mapped_column(
+        String(32), primary_key=True, default=lambda: uuid.uuid4().hex
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        String, nullable=False, server_default="pending", index=True
+    )
+    urls: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    length: Mapped[SummaryLength] = mapped_column(
+        String, nullable=False, server_default="medium"
+    )
+    format: Mapped[SummaryFormat] = mapped_column(
+        String, nullable=False, server_default="prose"
+    )
+    callback_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Lease of the worker processing the job: it heartbeats while running, and
+    # a running job whose heartbeat went stale may be claimed by another one
+    owner: Mapped[str | None] = mapped_column(String, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # One row per processed URL, in index order; loaded with the job, as
+    # every read of a job needs them
+    result_rows: Mapped[list[JobResult]] = relationship(
+        order_by=JobResult.index,
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
+
+    @property
+    def total(self) -> int:
+        return len(self.urls)
+
+    @property
+    def results(self) -> list[dict[str, Any]]:
+        return [row.result for row in sorted(self.result_rows, key=lambda r: r.index)]
+
+    @property
+    def completed(self) -> int:
+        return len(self.result_rows)
@@ -0,0 +1,21 @@
+from typing import Any
+
+from sqlalchemy import JSON, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class JobResult(Base):
+    """
+    The BatchResultItem of one processed URL of a Job. Keyed by the URL's
+    index in the job, so recording a URL twice cannot inflate its progress.
+    """
+
+    __tablename__ = "job_results"
+
+    job_id: Mapped[str] = mapped_column(
+        String(32), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    index: Mapped[int] = mapped_column(Integer, primary_key=True)
+    result: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class MinHashBand(Base):
+    """
+    One LSH band of a summary's MinHash signature (see app/utils/minhash.py).
+    Summaries whose content is similar share a bucket in at least one band
+    with high probability, so near-duplicate candidates are found through
+    the bucket index instead of comparing against every stored signature.
+    """
+
+    __tablename__ = "minhash_bands"
+    __table_args__ = (
+        # Serves the candidate lookup: WHERE bucket IN (...)
+        Index("ix_minhash_bands_bucket", "bucket"),
+    )
+
+    summary_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True
+    )
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, nullable=False)
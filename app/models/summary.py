@@ -1,19 +1,45 @@
-from datetime import datetime
+from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Index, Integer, LargeBinary, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, validates
 from sqlalchemy.sql import func
 
 from app.database import Base
 from app.schemas.summary import SummaryFormat, SummaryLength
 
 
+def utcnow() -> datetime:
+    """
+    Return the current time as naive UTC, matching the server default of the
+    timestamp columns.
+    """
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
 class Summary(Base):
     __tablename__ = "summaries"
+    __table_args__ = (
+        # Serves the cache lookup:
+        # WHERE canonical_url = ? ORDER BY fetched_at DESC
+        Index("ix_summaries_canonical_url_fetched_at", "canonical_url", "fetched_at"),
+        # Serves the duplicate-content lookup across URLs:
+        # WHERE content_hash = ? AND ... ORDER BY fetched_at DESC
+        Index("ix_summaries_content_hash_fetched_at", "content_hash", "fetched_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     url: Mapped[str] = mapped_column(String, nullable=False)
-    content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Cache key: the canonical form of the page's final URL (after
+    # redirects), see app/utils/urls.py
+    canonical_url: Mapped[str] = mapped_column(String, nullable=False)
+    # Scraped text, up to `max_content_chars`. Deferred: only regeneration and
+    # the duplicate lookups need it, never a response
+    content: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    # Words in `content`, counted whenever it is set (see _count_words), so
+    # serializing a record never loads the text
+    word_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     summary: Mapped[str] = mapped_column(Text, nullable=False)
     model: Mapped[str] = mapped_column(String, nullable=False)
     length: Mapped[SummaryLength] = mapped_column(
@@ -22,11 +48,50 @@ class Summary(Base):
     format: Mapped[SummaryFormat] = mapped_column(
         String, nullable=False, server_default="prose"
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    # Cache validators and content fingerprint from the last fetch, used to
+    # skip regeneration when the page has not changed, and to reuse a summary
+    # of the same text found under another URL
+    etag: Mapped[str | None] = mapped_column(String, nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # MinHash signature of `content`, used to reuse a summary of a
+    # near-identical page; its LSH bands are indexed in `minhash_bands`
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Set in Python (naive UTC, microseconds) so rows created within the same
+    # second keep their order and compare exactly against bound datetimes
+    # (SQLite stores server-side now() as text without fractional seconds)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utcnow, server_default=func.now(), index=True
+    )
+    # When the page was last fetched, or found unchanged on a retry / refresh:
+    # the cache TTL and stale window run from here. created_at never changes
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utcnow, server_default=func.now()
+    )
+
+    @validates("content")
+    def _count_words(self, key: str, content: str | None) -> str | None:
+        self.word_count = len(content.split()) if content else 0
+        return content
 
     @property
     def reading_time_minutes(self) -> int:
-        if not self.content:
+        if not self.word_count:
             return 0
-        word_count = len(self.content.split())
-        return max(1, round(word_count / 200))  # average 200 wpm
+        return max(1, round(self.word_count / 200))  # average 200 wpm
+
+
+# All that responses and the summary cache read of a record (see
+# SummaryResponse and app/cache.py); list and cache-hit queries load only these
+RESPONSE_ATTRIBUTES = (
+    Summary.id,
+    Summary.url,
+    Summary.canonical_url,
+    Summary.summary,
+    Summary.model,
+    Summary.length,
+    Summary.format,
+    Summary.word_count,
+    Summary.created_at,
+    Summary.fetched_at,
+)
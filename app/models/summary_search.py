@@ -0,0 +1,73 @@
+from sqlalchemy import DDL, Integer, column, event, table
+
+from app.models.summary import Summary
+
+# Full-text index over summaries (url, summary), maintained by the database
+# itself: an FTS5 external-content table kept in sync by triggers on SQLite, a
+# generated tsvector column with a GIN index on Postgres. Attached to the
+# `summaries` table so `create_all` sets it up; existing databases get it from
+# migration a7c3e9f1d248.
+#
+# Note: SQLite batch migrations that recreate `summaries` drop its triggers,
+# which must then be recreated (and the index rebuilt) by the same migration.
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE summaries_fts USING fts5(
+        url, summary, content='summaries', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER summaries_fts_ai AFTER INSERT ON summaries BEGIN
+        INSERT INTO summaries_fts (rowid, url, summary)
+        VALUES (new.id, new.url, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER summaries_fts_ad AFTER DELETE ON summaries BEGIN
+        INSERT INTO summaries_fts (summaries_fts, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER summaries_fts_au AFTER UPDATE OF url, summary ON summaries BEGIN
+        INSERT INTO summaries_fts (summaries_fts, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+        INSERT INTO summaries_fts (rowid, url, summary)
+        VALUES (new.id, new.url, new.summary);
+    END
+    """,
+]
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE summaries ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(url, '') || ' ' || coalesce(summary, ''))
+    ) STORED
+    """,
+    "CREATE INDEX ix_summaries_search_vector ON summaries USING gin (search_vector)",
+]
+
+# Names alembic autogenerate must leave alone (see alembic/env.py)
+SEARCH_OBJECTS = ("summaries_fts", "search_vector", "ix_summaries_search_vector")
+
+# For queries against the FTS5 table; its hidden `rank` column is bm25()
+summaries_fts = table(
+    "summaries_fts",
+    column("rowid", Integer),
+    column("summaries_fts"),
+    column("rank"),
+)
+
+for statement in SQLITE_DDL:
+    event.listen(
+        Summary.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in POSTGRES_DDL:
+    event.listen(
+        Summary.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class UrlAlias(Base):
+    """
+    Maps the canonical form of a requested URL to the canonical URL its page
+    was stored under, when they differ because of a redirect (short links,
+    moved pages, ...).
+    """
+
+    __tablename__ = "url_aliases"
+
+    alias: Mapped[str] = mapped_column(String, primary_key=True)
+    canonical_url: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,241 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer
+
+from app.models.minhash_band import MinHashBand
+from app.models.summary import RESPONSE_ATTRIBUTES, Summary, utcnow
+from app.schemas.summary import SummaryFormat, SummaryLength
+from app.utils.minhash import bands
+from app.utils.urls import canonicalize_url
+
+
+async def create(
+    db: AsyncSession,
+    url: str,
+    content: str | None,
+    summary: str,
+    model: str,
+    length: SummaryLength = "medium",
+    format: SummaryFormat = "prose",
+    canonical_url: str | None = None,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    content_hash: str | None = None,
+    minhash: bytes | None = None,
+) -> Summary:
+    """
+    Insert a new Summary record into the database and return it.
+
+    `canonical_url` defaults to the canonical form of `url`. The LSH bands of
+    `minhash` are indexed along with the record.
+    """
+    record = Summary(
+        url=url,
+        canonical_url=canonical_url or canonicalize_url(url),
+        content=content,
+        summary=summary,
+        model=model,
+        length=length,
+        format=format,
+        etag=etag,
+        last_modified=last_modified,
+        content_hash=content_hash,
+        minhash=minhash,
+    )
+    db.add(record)
+    await db.flush()
+    _index_bands(db, record)
+    await db.commit()
+    await db.refresh(record)
+    return record
+
+
+async def get_by_id(db: AsyncSession, summary_id: int) -> Summary | None:
+    """
+    Fetch a single Summary by primary key.
+
+    Returns:
+        The Summary instance if found, otherwise None.
+    """
+    return await db.get(Summary, summary_id)
+
+
+async def get_by_url(
+    db: AsyncSession,
+    url: str,
+    since: datetime | None = None,
+    length: SummaryLength | None = None,
+    format: SummaryFormat | None = None,
+) -> Summary | None:
+    """
+    Fetch the most recently fetched Summary for url, matched by canonical
+    URL. If `since` is provided, only records fetched on or after since will
+    be considered. If `length` / `format` are provided, only that variant is
+    considered.
+
+    Only the RESPONSE_ATTRIBUTES are loaded: this is the cache-hit path.
+
+    Returns:
+        The Summary instance if found, otherwise None.
+    """
+    query = (
+        select(Summary)
+        .options(load_only(*RESPONSE_ATTRIBUTES))
+        .where(Summary.canonical_url == canonicalize_url(url))
+    )
+    if since:
+        query = query.where(Summary.fetched_at >= since)
+    if length:
+        query = query.where(Summary.length == length)
+    if format:
+        query = query.where(Summary.format == format)
+
+    result = await db.scalars(query.order_by(Summary.fetched_at.desc()).limit(1))
+    return result.first()
+
+
+async def get_variants(
+    db: AsyncSession, url: str, since: datetime | None = None
+) -> list[Summary]:
+    """
+    Fetch every Summary for url (any length / format, matched by canonical
+    URL), most recently fetched first, with their content loaded. If
+    `since` is provided, only records fetched on or after since are returned.
+    """
+    query = (
+        select(Summary)
+        .options(undefer(Summary.content))
+        .where(Summary.canonical_url == canonicalize_url(url))
+    )
+    if since:
+        query = query.where(Summary.fetched_at >= since)
+
+    result = await db.scalars(query.order_by(Summary.fetched_at.desc()))
+    return list(result)
+
+
+async def get_by_content_hash(
+    db: AsyncSession,
+    content_hash: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+    since: datetime | None = None,
+) -> Summary | None:
+    """
+    Fetch the most recently fetched Summary of the given variant whose content
+    hashes to `content_hash`, whatever its URL. If `since` is provided, only
+    records fetched on or after since will be considered.
+
+    Returns:
+        The Summary instance if found, otherwise None.
+    """
+    query = select(Summary).where(
+        Summary.content_hash == content_hash,
+        Summary.length == length,
+        Summary.format == format,
+    )
+    if since:
+        query = query.where(Summary.fetched_at >= since)
+
+    result = await db.scalars(query.order_by(Summary.fetched_at.desc()).limit(1))
+    return result.first()
+
+
+async def get_near_duplicates(
+    db: AsyncSession,
+    minhash: bytes,
+    length: SummaryLength,
+    format: SummaryFormat,
+    since: datetime | None = None,
+    exclude_id: int | None = None,
+) -> list[Summary]:
+    """
+    Fetch the Summaries of the given variant that share at least one LSH band
+    bucket with `minhash`: the candidates for being near-duplicates of the
+    content it was computed from. If `since` is provided, only records
+    fetched on or after since are returned.
+
+    Candidates are not guaranteed to be similar; compare their signatures.
+    """
+    candidates = select(MinHashBand.summary_id).where(
+        MinHashBand.bucket.in_(bands(minhash))
+    )
+    query = select(Summary).where(
+        Summary.id.in_(candidates),
+        Summary.length == length,
+        Summary.format == format,
+    )
+    if since:
+        query = query.where(Summary.fetched_at >= since)
+    if exclude_id is not None:
+        query = query.where(Summary.id != exclude_id)
+
+    result = await db.scalars(query)
+    return list(result)
+
+
+async def update(
+    db: AsyncSession,
+    record: Summary,
+    content: str,
+    summary: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+    model: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    content_hash: str | None = None,
+    canonical_url: str | None = None,
+    minhash: bytes | None = None,
+) -> Summary:
+    """
+    Update a Summary record by id, re-indexing the LSH bands of its new
+    `minhash`.
+    """
+    if canonical_url:
+        record.canonical_url = canonical_url
+    record.content = content
+    record.summary = summary
+    record.model = model
+    record.length = length
+    record.format = format
+    record.etag = etag
+    record.last_modified = last_modified
+    record.content_hash = content_hash
+    record.minhash = minhash
+    record.fetched_at = utcnow()
+    await db.execute(delete(MinHashBand).where(MinHashBand.summary_id == record.id))
+    _index_bands(db, record)
+    await db.commit()
+    await db.refresh(record)
+    return record
+
+
+async def revalidate(
+    db: AsyncSession,
+    record: Summary,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> Summary:
+    """
+    Mark a Summary as fresh again after its page was found unchanged, keeping
+    its summary. New validators replace the stored ones when given.
+    """
+    if etag:
+        record.etag = etag
+    if last_modified:
+        record.last_modified = last_modified
+    record.fetched_at = utcnow()
+    await db.commit()
+    await db.refresh(record)
+    return record
+
+
+def _index_bands(db: AsyncSession, record: Summary) -> None:
+    if record.minhash:
+        db.add_all(
+            MinHashBand(summary_id=record.id, band=band, bucket=bucket)
+            for band, bucket in enumerate(bands(record.minhash))
+        )
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import ColumnElement, CursorResult, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.models.job_result import JobResult
+from app.models.summary import utcnow
+from app.schemas.summary import JobStatus, SummaryFormat, SummaryLength
+
+
+async def create(
+    db: AsyncSession,
+    urls: list[str],
+    length: SummaryLength = "medium",
+    format: SummaryFormat = "prose",
+    callback_url: str | None = None,
+) -> Job:
+    """
+    Insert a new pending Job and return it.
+    """
+    job = Job(
+        urls=urls,
+        length=length,
+        format=format,
+        callback_url=callback_url,
+        status="pending",
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def get_by_id(db: AsyncSession, job_id: str) -> Job | None:
+    """
+    Fetch a single Job by id, with its results.
+
+    Returns:
+        The Job instance if found, otherwise None.
+    """
+    return await db.get(Job, job_id)
+
+
+def _claimable(stale_before: datetime) -> ColumnElement[bool]:
+    # Pending, or running under a lease that was not renewed in time
+    return or_(
+        Job.status == "pending",
+        (Job.status == "running")
+        & (Job.heartbeat_at.is_(None) | (Job.heartbeat_at < stale_before)),
+    )
+
+
+async def get_claimable(db: AsyncSession, stale_before: datetime) -> list[str]:
+    """
+    Return the ids of jobs that are pending, or running with no heartbeat
+    since `stale_before` (their worker is presumed gone).
+    """
+    result = await db.scalars(select(Job.id).where(_claimable(stale_before)))
+    return list(result)
+
+
+async def claim(
+    db: AsyncSession, job_id: str, owner: str, stale_before: datetime
+) -> bool:
+    """
+    Atomically mark the job running under `owner`, if it is claimable (see
+    get_claimable). Returns False if another worker holds it or it finished.
+    """
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, _claimable(stale_before))
+        .values(status="running", owner=owner, heartbeat_at=utcnow())
+    )
+    await db.commit()
+    return cast(CursorResult[Any], result).rowcount == 1
+
+
+async def heartbeat(db: AsyncSession, job_id: str, owner: str) -> bool:
+    """
+    Renew the lease of `owner` on a running job. Returns False if the lease
+    was lost (taken over by another worker, or the job finished).
+    """
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.owner == owner, Job.status == "running")
+        .values(heartbeat_at=utcnow())
+    )
+    await db.commit()
+    return cast(CursorResult[Any], result).rowcount == 1
+
+
+async def set_status(db: AsyncSession, job_id: str, status: JobStatus) -> Job | None:
+    """
+    Update the status of a Job.
+
+    Returns:
+        The updated Job, with its results, or None if it does not exist.
+    """
+    job = await db.get(Job, job_id)
+    if job is None:
+        return None
+    job.status = status
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def add_result(
+    db: AsyncSession, job_id: str, index: int, result: dict[str, Any]
+) -> None:
+    """
+    Record the result for the URL at `index` of a Job, replacing any earlier
+    one, and renew the job's heartbeat. Only that row is written, however
+    many results the job has.
+    """
+    await db.merge(JobResult(job_id=job_id, index=index, result=result))
+    await db.execute(update(Job).where(Job.id == job_id).values(heartbeat_at=utcnow()))
+    await db.commit()
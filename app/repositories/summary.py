@@ -1,11 +1,19 @@
+import re
 from datetime import datetime
-from typing import TypedDict
+from typing import Any, NamedTuple, TypedDict
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Select, func, literal_column, null, or_, select
+from sqlalchemy.orm import Query, Session, load_only
 
-from app.models.summary import Summary
+from app.models.minhash_band import MinHashBand
+from app.models.summary import RESPONSE_ATTRIBUTES, Summary
+from app.models.summary_search import summaries_fts
 from app.schemas.summary import SummaryFormat, SummaryLength
+from app.utils.pagination import Cursor
+from app.utils.urls import canonicalize_url
+
+# Listing order; ties on created_at are broken by id so it is total
+_NEWEST_FIRST = (Summary.created_at.desc(), Summary.id.desc())
 
 
 class SummaryPage(TypedDict):
@@ -13,6 +21,20 @@ class SummaryPage(TypedDict):
     total: int
     page: int
     size: int
+    snippets: dict[int, str]  # by id, for search results
+
+
+class SummaryCursorPage(TypedDict):
+    items: list[Summary]
+    has_next: bool  # older items follow
+    has_prev: bool  # newer items precede
+    snippets: dict[int, str]  # by id, for search results
+
+
+class _Search(NamedTuple):
+    query: Query[Any]  # (Summary, snippet) rows
+    rank: ColumnElement[Any] | None  # ascending: most relevant first
+    count_query: Select[Any]
 
 
 def create(
@@ -29,6 +51,7 @@ def create(
     """
     record = Summary(
         url=url,
+        canonical_url=canonicalize_url(url),
         content=content,
         summary=summary,
         model=model,
@@ -45,7 +68,8 @@ def get_all(
     db: Session, page: int = 1, size: int = 10, q: str | None = None
 ) -> SummaryPage:
     """
-    Return a paginated slice of all Summary records, ordered by most recent first.
+    Return a paginated slice of all Summary records, ordered by most recent
+    first, or with a search term `q`, by relevance (see _search).
 
     Returns:
         {
@@ -53,17 +77,85 @@ def get_all(
             "total": int,
             "page": int,
             "size": int,
+            "snippets": dict[int, str],
         }
     """
-    query = db.query(Summary)
-    if q:
-        query = query.filter(
-            or_(Summary.url.ilike(f"%{q}%"), Summary.summary.ilike(f"%{q}%"))
-        )
-    total = query.count()
+    search = _search(db, q)
+    total = db.scalar(search.count_query) or 0
+    order = _NEWEST_FIRST if search.rank is None else (search.rank, *_NEWEST_FIRST)
     offset = (page - 1) * size
-    items = query.order_by(Summary.created_at.desc()).offset(offset).limit(size).all()
-    return {"items": items, "total": total, "page": page, "size": size}
+    rows = search.query.order_by(*order).offset(offset).limit(size).all()
+    return {
+        "items": [row[0] for row in rows],
+        "total": total,
+        "page": page,
+        "size": size,
+        "snippets": _snippets(rows),
+    }
+
+
+def get_page(
+    db: Session, size: int = 10, q: str | None = None, cursor: Cursor | None = None
+) -> SummaryCursorPage:
+    """
+    Return the Summary records after `cursor` (or before it, if
+    `cursor.before`), most recent first, ordered by (created_at, id). A
+    search term `q` filters the records (see _search) but keeps this order.
+
+    Keyset pagination: the cursor position is found through the created_at
+    index instead of skipping rows, so every page costs the same however deep
+    it is, and nothing is counted.
+
+    Returns:
+        {
+            "items": list[Summary],
+            "has_next": bool,
+            "has_prev": bool,
+            "snippets": dict[int, str],
+        }
+    """
+    query = _search(db, q).query
+    if cursor is None:
+        rows = query.order_by(*_NEWEST_FIRST).limit(size + 1).all()
+        return _cursor_page(rows[:size], len(rows) > size, False)
+
+    # Compare against the cursor row as stored (so SQLite's text timestamps
+    # match exactly), falling back to the cursor's copy if it was deleted.
+    # Both agree: created_at never changes (freshness is in fetched_at).
+    # The plain range condition lets the created_at index seek to the cursor.
+    created_at = func.coalesce(
+        select(Summary.created_at).where(Summary.id == cursor.id).scalar_subquery(),
+        cursor.created_at,
+    )
+    if cursor.before:
+        rows = (
+            query.filter(
+                Summary.created_at >= created_at,
+                or_(Summary.created_at > created_at, Summary.id > cursor.id),
+            )
+            .order_by(Summary.created_at.asc(), Summary.id.asc())
+            .limit(size + 1)
+            .all()
+        )
+        return _cursor_page(rows[:size][::-1], True, len(rows) > size)
+
+    rows = (
+        query.filter(
+            Summary.created_at <= created_at,
+            or_(Summary.created_at < created_at, Summary.id < cursor.id),
+        )
+        .order_by(*_NEWEST_FIRST)
+        .limit(size + 1)
+        .all()
+    )
+    return _cursor_page(rows[:size], len(rows) > size, True)
+
+
+def count(db: Session, q: str | None = None) -> int:
+    """
+    Return the number of Summary records matching the search term `q`.
+    """
+    return db.scalar(_search(db, q).count_query) or 0
 
 
 def get_by_id(db: Session, summary_id: int) -> Summary | None:
@@ -76,19 +168,37 @@ def get_by_id(db: Session, summary_id: int) -> Summary | None:
     return db.get(Summary, summary_id)
 
 
-def get_by_url(db: Session, url: str, since: datetime | None = None) -> Summary | None:
+def get_by_url(
+    db: Session,
+    url: str,
+    since: datetime | None = None,
+    length: SummaryLength | None = None,
+    format: SummaryFormat | None = None,
+) -> Summary | None:
     """
-    Fetch a single Summary by url. If `since` is provided, only records
-    created on or after since will be considered
+    Fetch the most recently fetched Summary for url, matched by canonical
+    URL. If `since` is provided, only records fetched on or after since will
+    be considered. If `length` / `format` are provided, only that variant is
+    considered.
+
+    Only the RESPONSE_ATTRIBUTES are loaded: this is the cache-hit path.
 
     Returns:
         The Summary instance if found, otherwise None.
     """
-    query = db.query(Summary).filter(Summary.url == url)
+    query = (
+        db.query(Summary)
+        .options(load_only(*RESPONSE_ATTRIBUTES))
+        .filter(Summary.canonical_url == canonicalize_url(url))
+    )
     if since:
-        query = query.filter(Summary.created_at >= since)
+        query = query.filter(Summary.fetched_at >= since)
+    if length:
+        query = query.filter(Summary.length == length)
+    if format:
+        query = query.filter(Summary.format == format)
 
-    return query.order_by(Summary.created_at.desc()).first()
+    return query.order_by(Summary.fetched_at.desc()).first()
 
 
 def delete(db: Session, summary_id: int) -> Summary | None:
@@ -99,6 +209,7 @@ def delete(db: Session, summary_id: int) -> Summary | None:
     if record is None:
         return None
 
+    db.query(MinHashBand).filter(MinHashBand.summary_id == summary_id).delete()
     db.delete(record)
     db.commit()
     return record
@@ -124,3 +235,72 @@ def update(
     db.commit()
     db.refresh(record)
     return record
+
+
+def _search(db: Session, q: str | None) -> _Search:
+    """
+    Build the query for (Summary, snippet) rows matching the search term `q`,
+    or for all rows (without snippets) if `q` is empty. Only the
+    RESPONSE_ATTRIBUTES of the summaries are loaded.
+
+    Every word of `q` must match a word of the url or summary, the last one
+    as a prefix (so results follow as-you-type input). The match goes through
+    the database's full-text index (see app/models/summary_search.py): FTS5
+    ranked by bm25 on SQLite, the tsvector column ranked by ts_rank on
+    Postgres. Other databases fall back to unranked substring matching.
+    """
+    summaries = db.query(Summary).options(load_only(*RESPONSE_ATTRIBUTES))
+    if not q:
+        return _Search(
+            summaries.add_columns(null()),
+            None,
+            select(func.count()).select_from(Summary),
+        )
+
+    words = re.findall(r"\w+", q.lower())
+    dialect = db.get_bind().dialect.name
+    if words and dialect == "sqlite":
+        terms = [f'"{word}"' for word in words]
+        terms[-1] += "*"
+        match = literal_column("summaries_fts").op("MATCH")(" ".join(terms))
+        snippet = func.snippet(
+            literal_column("summaries_fts"), 1, "<b>", "</b>", "…", 16
+        )
+        query = (
+            summaries.add_columns(snippet)
+            .join(summaries_fts, summaries_fts.c.rowid == Summary.id)
+            .filter(match)
+        )
+        count_query = select(func.count()).select_from(summaries_fts).where(match)
+        return _Search(query, summaries_fts.c.rank, count_query)
+
+    if words and dialect == "postgresql":
+        vector = literal_column("summaries.search_vector")
+        tsquery = func.to_tsquery("simple", " & ".join(words) + ":*")
+        match = vector.op("@@")(tsquery)
+        snippet = func.ts_headline(
+            "simple", Summary.summary, tsquery, "StartSel=<b>, StopSel=</b>"
+        )
+        query = summaries.add_columns(snippet).filter(match)
+        count_query = select(func.count()).select_from(Summary).where(match)
+        return _Search(query, func.ts_rank(vector, tsquery).desc(), count_query)
+
+    match = or_(Summary.url.ilike(f"%{q}%"), Summary.summary.ilike(f"%{q}%"))
+    return _Search(
+        summaries.add_columns(null()).filter(match),
+        None,
+        select(func.count()).select_from(Summary).where(match),
+    )
+
+
+def _snippets(rows: list[Any]) -> dict[int, str]:
+    return {summary.id: snippet for summary, snippet in rows if snippet}
+
+
+def _cursor_page(rows: list[Any], has_next: bool, has_prev: bool) -> SummaryCursorPage:
+    return {
+        "items": [row[0] for row in rows],
+        "has_next": has_next,
+        "has_prev": has_prev,
+        "snippets": _snippets(rows),
+    }
@@ -0,0 +1,21 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.url_alias import UrlAlias
+
+
+async def resolve(db: AsyncSession, url: str) -> str:
+    """
+    Return the canonical URL recorded for the canonical URL `url`, or `url`
+    itself if no alias is recorded.
+    """
+    alias = await db.get(UrlAlias, url)
+    return alias.canonical_url if alias is not None else url
+
+
+async def record(db: AsyncSession, alias: str, canonical_url: str) -> None:
+    """
+    Record that `alias` leads to the page stored under `canonical_url`,
+    replacing any earlier target.
+    """
+    await db.merge(UrlAlias(alias=alias, canonical_url=canonical_url))
+    await db.commit()
@@ -3,8 +3,10 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.cache import summary_cache
 from app.database import get_db
-from app.services import ollama
+from app.executors import extraction_offloader
+from app.services import dns, failures, ollama, scraper
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -28,3 +30,18 @@ async def health_check(db: Session = Depends(get_db)):
         "ollama": "ok" if ollama_connectivity else "unreachable",
     }
     return JSONResponse(content=response, status_code=status_code)
+
+
+@router.get("/metrics")
+def metrics():
+    """
+    Return in-process cache and queue counters for capacity tuning.
+    """
+    return {
+        "summary_cache": summary_cache.stats(),
+        "scrape_slots": scraper.fetch_limiter.stats(),
+        "generation_slots": ollama.generation_limiter.stats(),
+        "dns_cache": dns.dns_cache.stats(),
+        "fetch_failures": failures.fetch_failures.stats(),
+        "extraction": extraction_offloader.stats(),
+    }
@@ -1,28 +1,46 @@
 import asyncio
-from datetime import UTC, datetime, timedelta
-from typing import Literal
+import json
+from typing import Any, Literal
 
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from pydantic import HttpUrl
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
+from app.cache import (
+    CachedSummary,
+    cache_cutoff,
+    history_counts,
+    stale_cutoff,
+    summary_cache,
+)
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_async_session_factory, get_db
 from app.dependencies import require_api_key
 from app.limiter import limiter
 from app.logger import log
+from app.models.summary import Summary
+from app.repositories import job as job_repo
 from app.repositories import summary as summary_repo
 from app.schemas.summary import (
-    BatchResultItem,
+    BatchJobRequest,
     BatchSummarizeRequest,
     BatchSummarizeResponse,
+    JobResponse,
     SummarizeRequest,
+    SummaryHistoryItem,
     SummaryListResponse,
     SummaryResponse,
 )
-from app.services import ollama, scraper
+from app.services import jobs, ollama, scraper, summarizer
 from app.utils.export import export_csv, export_jsonl
-from app.utils.pagination import build_pagination_links
+from app.utils.pagination import (
+    Cursor,
+    build_pagination_links,
+    decode_cursor,
+    encode_cursor,
+)
 
 router = APIRouter(
     prefix="/summarize", tags=["summarize"], dependencies=[Depends(require_api_key)]
@@ -35,55 +53,178 @@ async def create_summary(
     request: Request,
     body: SummarizeRequest,
     response: Response,
-    db: Session = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
 ):
     """
     Accept a URL, scrape its content, generate a summary via Ollama, persist
     the result, and return it.
+
+    Within `cache_stale_minutes` after expiry, the expired summary is
+    returned at once (X-Cache: STALE) and refreshed in the background.
     """
     url = str(body.url)
     log.info("summary requested", url=url)
-    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(
-        minutes=settings.cache_ttl_minutes
+    cached = summary_cache.get(url, body.length, body.format)
+    if cached is not None:
+        log.info("summary from memory cache", id=cached.id, url=cached.url)
+        response.status_code = 200
+        response.headers["X-Cache"] = "HIT"
+        return cached
+
+    cutoff = cache_cutoff()
+    record = await summarizer.lookup(
+        session_factory, url, body.length, body.format, since=stale_cutoff(cutoff)
     )
-    record = summary_repo.get_by_url(db, url=url, since=cutoff)
-    if record is not None:
+    if record is not None and record.fetched_at >= cutoff:
         log.info("summary from cache", id=record.id, url=record.url, since=cutoff)
+        summary_cache.put(record)
         response.status_code = 200
         response.headers["X-Cache"] = "HIT"
         return record
+    if record is not None:
+        log.info("stale summary from cache", id=record.id, url=record.url)
+        summarizer.refresh_in_background(session_factory, record.id)
+        response.status_code = 200
+        response.headers["X-Cache"] = "STALE"
+        return record
 
-    text = await scraper.fetch_text(url)
-    text = text[: settings.max_content_chars]
-    summary = await ollama.summarize(text=text, length=body.length, format=body.format)
-    record = summary_repo.create(
-        db,
-        url=url,
-        content=text,
-        summary=summary,
-        length=body.length,
-        format=body.format,
-        model=settings.ollama_model,
+    record = await summarizer.create(
+        session_factory, url, length=body.length, format=body.format
     )
-    log.info("summary created", id=record.id)
     response.headers["X-Cache"] = "MISS"
     return record
 
 
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/stream")
+@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
+async def stream_summary(
+    request: Request,
+    body: SummarizeRequest,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+):
+    """
+    Like POST /summarize, but stream the summary as Server-Sent Events while
+    Ollama generates it. The record is persisted once the stream completes.
+    A cached (or stale, see POST /summarize) summary is sent as a single
+    `done` event.
+
+    Events:
+        token — {"token": str} for each generated chunk
+        done  — the persisted summary (same shape as SummaryResponse)
+        error — {"detail": str} if generation fails mid-stream
+    """
+    url = str(body.url)
+    log.info("streaming summary requested", url=url)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    cached: CachedSummary | Summary | None = summary_cache.get(
+        url, body.length, body.format
+    )
+    status = "HIT"
+    if cached is None:
+        cutoff = cache_cutoff()
+        record = await summarizer.lookup(
+            session_factory, url, body.length, body.format, since=stale_cutoff(cutoff)
+        )
+        if record is not None and record.fetched_at >= cutoff:
+            cached = summary_cache.put(record)
+        elif record is not None:
+            summarizer.refresh_in_background(session_factory, record.id)
+            cached, status = record, "STALE"
+    if cached is not None:
+        log.info("summary from cache", id=cached.id, url=cached.url, status=status)
+        done = SummaryResponse.model_validate(cached).model_dump(mode="json")
+        return StreamingResponse(
+            iter([_sse("done", done)]),
+            media_type="text/event-stream",
+            headers={**headers, "X-Cache": status},
+        )
+
+    # Scrape before the stream starts so fetch errors still map to 422/503.
+    # No session is held across the scrape or the stream: each open stream
+    # would otherwise keep a pooled connection for its whole duration.
+    page = summarizer.truncate(await scraper.fetch_page(url))
+    signature = await summarizer.signature(page.text)
+    async with session_factory() as db:
+        duplicate = await summarizer.find_duplicate(
+            db, page, body.length, body.format, signature
+        )
+        record = (
+            await summarizer.persist(
+                db, url, body.length, body.format, page, duplicate.summary, signature
+            )
+            if duplicate is not None
+            else None
+        )
+    if record is not None:
+        done = SummaryResponse.model_validate(record).model_dump(mode="json")
+        return StreamingResponse(
+            iter([_sse("done", done)]),
+            media_type="text/event-stream",
+            headers={**headers, "X-Cache": "MISS"},
+        )
+
+    async def events():
+        tokens: list[str] = []
+        try:
+            async for token in ollama.summarize_stream(
+                text=page.text, length=body.length, format=body.format
+            ):
+                tokens.append(token)
+                yield _sse("token", {"token": token})
+        except httpx.HTTPError as e:
+            log.info("streaming summary failed", url=url, error=str(e))
+            yield _sse("error", {"detail": "Summarization failed"})
+            return
+
+        async with session_factory() as db:
+            record = await summarizer.persist(
+                db, url, body.length, body.format, page, "".join(tokens), signature
+            )
+        log.info("summary created", id=record.id)
+        done = SummaryResponse.model_validate(record).model_dump(mode="json")
+        yield _sse("done", done)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={**headers, "X-Cache": "MISS"}
+    )
+
+
 @router.get("/history", response_model=SummaryListResponse)
 def list_summaries(
     page: int = 1,
     size: int = 10,
     q: str | None = None,
+    cursor: str | None = None,
+    with_total: bool = False,
     db: Session = Depends(get_db),
 ):
     """
     Return a paginated list of all stored summaries.
 
     Query parameters:
-        page — 1-based page number (default: 1)
-        size — number of items per page (default: 10)
+        page   — 1-based page number (default: 1)
+        size   — number of items per page (default: 10)
+        q      — full-text search: every word must match a word of the url
+                 or summary, the last one as a prefix. Results are ranked by
+                 relevance and carry a `snippet` of the summary.
+        cursor — switches to cursor pagination: pass an empty value for the
+                 first page, then follow the `next` / `prev` links. Every
+                 page then costs the same however deep it is.
+        with_total — in cursor mode, include `total` (a count cached for
+                 `history_total_cache_seconds`)
     """
+    if cursor is not None:
+        return _list_summaries_by_cursor(db, cursor, size, q, with_total)
+
     log.info("history requested", page=page, size=size, q=q)
     result = summary_repo.get_all(db, page=page, size=size, q=q)
 
@@ -96,7 +237,7 @@ def list_summaries(
     )
 
     return SummaryListResponse(
-        items=[SummaryResponse.model_validate(item) for item in result["items"]],
+        items=_history_items(result["items"], result["snippets"]),
         total=result["total"],
         page=result["page"],
         size=result["size"],
@@ -105,6 +246,54 @@ def list_summaries(
     )
 
 
+def _list_summaries_by_cursor(
+    db: Session, cursor: str, size: int, q: str | None, with_total: bool
+) -> SummaryListResponse:
+    log.info("history requested", cursor=cursor, size=size, q=q)
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    result = summary_repo.get_page(db, size=size, q=q, cursor=position)
+
+    items = result["items"]
+    next_cursor = prev_cursor = None
+    if items and result["has_next"]:
+        next_cursor = encode_cursor(Cursor(items[-1].created_at, items[-1].id))
+    if items and result["has_prev"]:
+        prev_cursor = encode_cursor(Cursor(items[0].created_at, items[0].id, True))
+    next_url, prev_url = build_pagination_links(
+        base_path="/summarize/history",
+        size=size,
+        extra_params={"q": q} if q else None,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+    total = None
+    if with_total:
+        total = history_counts.get(q, lambda: summary_repo.count(db, q=q))
+    return SummaryListResponse(
+        items=_history_items(items, result["snippets"]),
+        total=total,
+        page=None,
+        size=size,
+        next=next_url,
+        prev=prev_url,
+    )
+
+
+def _history_items(
+    records: list[Summary], snippets: dict[int, str]
+) -> list[SummaryHistoryItem]:
+    return [
+        SummaryHistoryItem.model_validate(record).model_copy(
+            update={"snippet": snippets.get(record.id)}
+        )
+        for record in records
+    ]
+
+
 @router.get("/history/export")
 def export_history(
     format: Literal["csv", "jsonl"] = "csv",
@@ -145,6 +334,7 @@ def delete_summary(summary_id: int, db: Session = Depends(get_db)):
     record = summary_repo.delete(db, summary_id)
     if record is None:
         raise HTTPException(status_code=404, detail="Not found")
+    summary_cache.invalidate(record.canonical_url, record.length, record.format)
     log.info("summary deleted", summary_id=summary_id)
     return Response(None, status_code=204)
 
@@ -152,56 +342,79 @@ def delete_summary(summary_id: int, db: Session = Depends(get_db)):
 @router.post(
     "/history/{summary_id}/retry", response_model=SummaryResponse, status_code=200
 )
-async def retry_summary(summary_id: int, db: Session = Depends(get_db)):
+async def retry_summary(
+    summary_id: int,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+):
     """
     Retry a single summary by its ID.
 
+    The page is re-fetched conditionally; the summary is only regenerated if
+    the page changed since it was stored.
+
     Raise HTTP 404 if no record with the given ID exists.
     """
     log.info("retry requested", summary_id=summary_id)
-    record = summary_repo.get_by_id(db, summary_id)
-    if record is None:
+    updated_record = await summarizer.refresh(session_factory, summary_id)
+    if updated_record is None:
         raise HTTPException(status_code=404, detail="Not found")
-    text = await scraper.fetch_text(record.url)
-    text = text[: settings.max_content_chars]
-    summary = await ollama.summarize(
-        text=text, format=record.format, length=record.length
-    )
-    updated_record = summary_repo.update(
-        db,
-        record=record,
-        content=text,
-        summary=summary,
-        length=record.length,
-        format=record.format,
-        model=record.model,
-    )
     log.info("summary updated after retry", id=updated_record.id)
     return updated_record
 
 
 @router.post("/batch", status_code=200)
-async def batch_summarize(body: BatchSummarizeRequest, db: Session = Depends(get_db)):
-    async def process(url: HttpUrl) -> BatchResultItem:
-        try:
-            text = await scraper.fetch_text(str(url))
-            summary_text = await ollama.summarize(text, body.length)
-            record = summary_repo.create(
-                db,
-                url=str(url),
-                summary=summary_text,
-                model=settings.ollama_model,
-                content=text,
-                length=body.length,
-                format=body.format,
-            )
-            return BatchResultItem(
-                url=str(url),
-                result=SummaryResponse.model_validate(record),
-                success=True,
-            )
-        except Exception as e:
-            return BatchResultItem(url=str(url), error=str(e), success=False)
-
-    results = await asyncio.gather(*[process(url) for url in body.urls])
+async def batch_summarize(
+    body: BatchSummarizeRequest,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+):
+    results = await asyncio.gather(
+        *[
+            summarizer.batch_item(session_factory, str(url), body.length, body.format)
+            for url in body.urls
+        ]
+    )
     return BatchSummarizeResponse(results=list(results))
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(
+    body: BatchJobRequest,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+):
+    """
+    Queue a batch of URLs for summarization and return immediately with
+    HTTP 202 and the job. Poll GET /summarize/jobs/{id} for progress; if
+    `callback_url` is set, the finished job is also POSTed there.
+    """
+    job = await job_repo.create(
+        db,
+        urls=[str(url) for url in body.urls],
+        length=body.length,
+        format=body.format,
+        callback_url=str(body.callback_url) if body.callback_url else None,
+    )
+    log.info("job created", job_id=job.id, total=job.total)
+    jobs.start(job.id, session_factory)
+    response.headers["Location"] = f"/summarize/jobs/{job.id}"
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Return the status and results collected so far for a batch job.
+
+    Raise HTTP 404 if no job with the given ID exists.
+    """
+    job = await job_repo.get_by_id(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return job
@@ -1,16 +1,46 @@
-import ipaddress
-import socket
 from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, HttpUrl, field_validator
 
 from app.config import settings
+from app.utils.urls import ip_literal, is_public_address
 
 SummaryLength = Literal["short", "medium", "long"]
 
 SummaryFormat = Literal["prose", "markdown"]
 
+JobStatus = Literal["pending", "running", "completed", "failed"]
+
+
+def validate_public_url(v: HttpUrl) -> HttpUrl:
+    """
+    Reject URLs that point at a private/loopback IP literal or whose domain is
+    blocked (or not allowlisted) by configuration.
+
+    Host names are not resolved here (validation must not block the event
+    loop); their addresses are checked when the page is fetched, see
+    app/services/dns.py.
+    """
+    host = v.host or ""
+
+    ip = ip_literal(host)
+    if ip is not None and not is_public_address(str(ip)):
+        raise ValueError("URL must point to a public address")
+
+    # Blocklist check
+    if any(host == d or host.endswith(f".{d}") for d in settings.blocked_domains):
+        raise ValueError("URL domain is blocked")
+
+    # Allowlist check (if configured)
+    if settings.allowed_domains:
+        if not any(
+            host == d or host.endswith(f".{d}") for d in settings.allowed_domains
+        ):
+            raise ValueError("URL domain is not in the allowlist")
+
+    return v
+
 
 class SummarizeRequest(BaseModel):
     """Request body for POST /summarize."""
@@ -22,24 +52,7 @@ class SummarizeRequest(BaseModel):
     @field_validator("url")
     @classmethod
     def no_private_or_blocked_urls(cls, v: HttpUrl) -> HttpUrl:
-        host = v.host or ""
-
-        ip = socket.gethostbyname(host)
-        if ipaddress.ip_address(ip).is_private or ipaddress.ip_address(ip).is_loopback:
-            raise ValueError("URL must point to a public address")
-
-        # Blocklist check
-        if any(host == d or host.endswith(f".{d}") for d in settings.blocked_domains):
-            raise ValueError("URL domain is blocked")
-
-        # Allowlist check (if configured)
-        if settings.allowed_domains:
-            if not any(
-                host == d or host.endswith(f".{d}") for d in settings.allowed_domains
-            ):
-                raise ValueError("URL domain is not in the allowlist")
-
-        return v
+        return validate_public_url(v)
 
 
 class SummaryResponse(BaseModel):
@@ -55,12 +68,25 @@ class SummaryResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class SummaryListResponse(BaseModel):
-    """Response body for GET /history (paginated)."""
+class SummaryHistoryItem(SummaryResponse):
+    """
+    One item of GET /history. When searching, `snippet` is the excerpt of the
+    summary that best matches, with the matched words in <b>...</b>.
+    """
 
-    items: list[SummaryResponse]
-    total: int
-    page: int
+    snippet: str | None = None
+
+
+class SummaryListResponse(BaseModel):
+    """
+    Response body for GET /history (paginated). In cursor mode `page` is None,
+    and so is `total` unless requested. Search results (`q`) are ordered by
+    relevance, except in cursor mode.
+    """
+
+    items: list[SummaryHistoryItem]
+    total: int | None
+    page: int | None
     size: int
     next: str | None = None
     prev: str | None = None
@@ -74,8 +100,8 @@ class BatchSummarizeRequest(BaseModel):
     @field_validator("urls")
     @classmethod
     def limit_batch_size(cls, v):
-        if len(v) > 10:
-            raise ValueError("Batch size cannot exceed 10 URLs")
+        if len(v) > settings.max_batch_size:
+            raise ValueError(f"Batch size cannot exceed {settings.max_batch_size} URLs")
         return v
 
 
@@ -88,3 +114,28 @@ class BatchResultItem(BaseModel):
 
 class BatchSummarizeResponse(BaseModel):
     results: list[BatchResultItem]
+
+
+class BatchJobRequest(BatchSummarizeRequest):
+    """Request body for POST /summarize/jobs."""
+
+    callback_url: HttpUrl | None = None
+
+    @field_validator("callback_url")
+    @classmethod
+    def no_private_or_blocked_callback(cls, v: HttpUrl | None) -> HttpUrl | None:
+        return validate_public_url(v) if v is not None else None
+
+
+class JobResponse(BaseModel):
+    """Status and (partial) results of a batch job."""
+
+    id: str
+    status: JobStatus
+    total: int
+    completed: int
+    results: list[BatchResultItem]
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,192 @@
+import asyncio
+import socket
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import cast
+
+import httpcore
+import httpx
+from httpcore import SOCKET_OPTION
+
+from app.config import settings
+from app.utils.singleflight import SingleFlight
+from app.utils.urls import ip_literal, is_public_address
+
+
+class BlockedAddressError(ValueError):
+    """Raised when a URL resolves to a private or loopback address."""
+
+
+class _Entry:
+    __slots__ = ("addresses", "expires_at")
+
+    def __init__(self, addresses: list[str] | None, expires_at: float) -> None:
+        self.addresses = addresses  # None caches a failed lookup
+        self.expires_at = expires_at
+
+
+class DNSCache:
+    """
+    Bounded LRU cache of host lookups with separate TTLs for successful
+    (positive) and failed (negative) resolutions. Used from the event loop
+    only, so it needs no locking.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, host: str) -> _Entry | None:
+        entry = self._entries.get(host)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[host]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(host)
+        self.hits += 1
+        return entry
+
+    def put(self, host: str, addresses: list[str] | None, ttl: float) -> _Entry:
+        entry = _Entry(addresses, time.monotonic() + ttl)
+        self._entries[host] = entry
+        self._entries.move_to_end(host)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+dns_cache = DNSCache(max_entries=settings.dns_cache_max_entries)
+
+# Concurrent lookups of the same host share one getaddrinfo call
+_lookups = SingleFlight()
+
+
+async def resolve(host: str) -> list[str]:
+    """
+    Resolve `host` to its IP addresses without blocking the event loop,
+    answering repeat lookups from the TTL cache.
+
+    Raises:
+        httpx.ConnectError — if the host does not resolve
+    """
+    literal = ip_literal(host)
+    if literal is not None:
+        return [str(literal)]
+
+    entry = dns_cache.get(host)
+    if entry is None:
+        entry = await _lookups.do(host, lambda: _resolve_and_cache(host))
+    if entry.addresses is None:
+        raise httpx.ConnectError(f"Could not resolve host: {host}")
+    return entry.addresses
+
+
+async def resolve_public(host: str) -> str:
+    """
+    Resolve `host` and return the address to connect to.
+
+    Raises:
+        BlockedAddressError — if any address of the host is private/loopback
+        httpx.ConnectError  — if the host does not resolve
+    """
+    addresses = await resolve(host)
+    if not all(is_public_address(address) for address in addresses):
+        raise BlockedAddressError("URL must point to a public address")
+    return addresses[0]
+
+
+class PinnedBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that connects to the address resolve_public
+    vetted for a host, instead of letting the socket layer resolve the name
+    again. The check and the connection use the same lookup, so a DNS change
+    between the two (rebinding) cannot redirect a request to a private
+    address. TLS still uses the host name for SNI and the certificate check.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend | None = None) -> None:
+        # httpcore types AnyIOBackend loosely, as it depends on anyio
+        self._backend = backend or cast(
+            httpcore.AsyncNetworkBackend, httpcore.AnyIOBackend()
+        )
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        address = await resolve_public(host)
+        return await self._backend.connect_tcp(
+            address,
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PinnedTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport whose connections are opened through PinnedBackend.
+
+    Requests keep their host name in the URL, so pooled connections stay keyed
+    by (scheme, host, port): two host names served from the same address
+    never share a connection, nor its TLS session.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits,
+        backend: httpcore.AsyncNetworkBackend | None = None,
+    ) -> None:
+        super().__init__(limits=limits)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=PinnedBackend(backend),
+        )
+
+
+async def _resolve_and_cache(host: str) -> _Entry:
+    try:
+        addresses = await _lookup(host)
+    except OSError:
+        return dns_cache.put(host, None, settings.dns_negative_ttl_seconds)
+    return dns_cache.put(host, addresses, settings.dns_cache_ttl_seconds)
+
+
+async def _lookup(host: str) -> list[str]:
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        host, None, type=socket.SOCK_STREAM
+    )
+    return list(dict.fromkeys(str(info[4][0]) for info in infos))
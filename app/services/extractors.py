@@ -0,0 +1,140 @@
+from typing import Literal, NamedTuple, Protocol
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.html import HtmlElement
+
+from app.config import settings
+from app.logger import log
+from app.services import readability
+
+ExtractorName = Literal["lxml", "bs4"]
+ExtractionMode = Literal["main", "full"]
+
+# Elements whose text is never part of the readable page
+SKIPPED_TAGS = ("script", "style")
+
+
+class Extractor(Protocol):
+    """Turns an HTML document into its plain-text content."""
+
+    name: str
+
+    def extract(self, html: str) -> str: ...
+
+
+class SoupExtractor:
+    """
+    BeautifulSoup with the pure-Python `html.parser`. Slow, but tolerant of
+    anything and free of C dependencies; used as the fallback.
+    """
+
+    name = "bs4"
+
+    def extract(self, html: str) -> str:
+        soup = BeautifulSoup(html, "html.parser")
+        for tag in soup.find_all(SKIPPED_TAGS):
+            tag.decompose()
+        return soup.get_text(separator=" ", strip=True)
+
+
+class LxmlExtractor:
+    """
+    libxml2's HTML parser through lxml. Produces the same text as
+    `SoupExtractor` (stripped text nodes joined by single spaces) several
+    times faster.
+    """
+
+    name = "lxml"
+
+    def extract(self, html: str) -> str:
+        root = self.parse(html)
+        if root is None:
+            return SoupExtractor().extract(html) if html.strip() else ""
+        return readability.text_of(root)
+
+    def parse(self, html: str) -> HtmlElement | None:
+        """
+        Parse `html` and strip script/style, comments and processing
+        instructions. Returns None if lxml cannot parse the document.
+        """
+        if not html.strip():
+            return None
+        try:
+            root = lxml_html.document_fromstring(html)
+        except (ValueError, etree.ParserError) as e:
+            # e.g. a str carrying an XML encoding declaration
+            log.info("lxml could not parse page, using fallback", error=str(e))
+            return None
+        etree.strip_elements(
+            root,
+            *SKIPPED_TAGS,
+            etree.Comment,
+            etree.ProcessingInstruction,
+            with_tail=False,
+        )
+        return root
+
+
+EXTRACTORS: dict[str, type[Extractor]] = {
+    "lxml": LxmlExtractor,
+    "bs4": SoupExtractor,
+}
+
+
+def get_extractor(name: ExtractorName | None = None) -> Extractor:
+    """
+    Return the extractor called `name` (default: `settings.html_extractor`).
+    """
+    return EXTRACTORS[name or settings.html_extractor]()
+
+
+class Extraction(NamedTuple):
+    text: str
+    # Length of the page's full text, to report how much main-content
+    # extraction removed
+    full_chars: int
+    # href of the page's <link rel="canonical">, unresolved
+    canonical_link: str | None = None
+
+
+def extract_document(
+    content: bytes, encoding: str, name: ExtractorName, mode: ExtractionMode = "full"
+) -> Extraction:
+    """
+    Decode a fetched page and return its text: all of it, or in "main" mode
+    only the article body (falling back to all of it if no article is found,
+    e.g. on a front page or other listing), along with its rel=canonical link.
+    Module-level and bytes-in / text-out so it can run in a worker process.
+    """
+    html = content.decode(encoding, errors="replace")
+    # The canonical link and main-content scoring need the lxml tree,
+    # whichever backend is configured
+    root = LxmlExtractor().parse(html)
+    if root is None:
+        text = get_extractor(name).extract(html)
+        return Extraction(text, len(text))
+
+    link = canonical_link(root)
+    if mode == "full" and name != "lxml":
+        text = get_extractor(name).extract(html)
+        return Extraction(text, len(text), link)
+
+    full_text = readability.text_of(root)
+    if mode == "full":
+        return Extraction(full_text, len(full_text), link)
+    main_text = readability.extract_main_text(root)
+    return Extraction(main_text or full_text, len(full_text), link)
+
+
+def canonical_link(root: HtmlElement) -> str | None:
+    """
+    Return the href of the document's first <link rel="canonical">, if any.
+    """
+    for link in root.iter("link"):
+        rel = (link.get("rel") or "").lower().split()
+        href = (link.get("href") or "").strip()
+        if "canonical" in rel and href:
+            return href
+    return None
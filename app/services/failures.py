@@ -0,0 +1,173 @@
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+from app.utils.urls import canonicalize_url
+
+
+class HostBackoffError(httpx.RequestError):
+    """Raised without fetching while a host that keeps failing is backed off."""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(f"{host} is failing, retry in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class _Failure:
+    """
+    What is needed to raise a failure again: its class and message, plus the
+    status code for HTTPStatusError. The exception itself is not kept, as
+    raising one instance from concurrent requests rewrites its traceback and
+    context under each of them.
+    """
+
+    __slots__ = ("error_type", "detail", "url", "status_code", "expires_at")
+
+    def __init__(self, error: Exception, url: str, expires_at: float) -> None:
+        self.error_type = type(error)
+        self.detail = str(error)
+        self.url = url
+        self.status_code = (
+            error.response.status_code
+            if isinstance(error, httpx.HTTPStatusError)
+            else None
+        )
+        self.expires_at = expires_at
+
+    def error(self) -> Exception:
+        """A new instance of the failure."""
+        if self.status_code is not None:
+            request = httpx.Request("GET", self.url)
+            response = httpx.Response(self.status_code, request=request)
+            return httpx.HTTPStatusError(
+                self.detail, request=request, response=response
+            )
+        return self.error_type(self.detail)
+
+
+class _HostState:
+    __slots__ = ("failures", "retry_at")
+
+    def __init__(self) -> None:
+        self.failures = 0  # consecutive host-level failures
+        self.retry_at = 0.0
+
+
+def is_host_failure(error: Exception) -> bool:
+    """
+    Whether `error` says something about the host rather than the one URL:
+    timeouts, connection errors, 5xx and 429 responses. A 404 on one page of
+    a site does not back off the rest of it.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, httpx.RequestError)
+
+
+class FailureCache:
+    """
+    Negative cache of failed page fetches, keyed by canonical URL, plus
+    exponential backoff for hosts that keep failing. Used from the event loop
+    only, so it needs no locking.
+
+    A failed URL is answered with the same error for `ttl` seconds instead of
+    being resolved, fetched and rejected again. After `backoff_threshold`
+    consecutive host-level failures (see `is_host_failure`) every URL of the
+    host is refused for `backoff_base` seconds, doubling with each further
+    failure up to `backoff_max`; a successful fetch resets the host.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        backoff_threshold: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backoff_threshold = backoff_threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._failures: OrderedDict[str, _Failure] = OrderedDict()
+        self._hosts: OrderedDict[str, _HostState] = OrderedDict()
+        self.hits = 0
+        self.backed_off = 0
+
+    def check(self, url: str) -> None:
+        """
+        Raise the cached error for `url`, or HostBackoffError if its host is
+        backed off. Returns if the URL may be fetched.
+        """
+        key = canonicalize_url(url)
+        now = time.monotonic()
+        failure = self._failures.get(key)
+        if failure is not None:
+            if failure.expires_at > now:
+                self.hits += 1
+                raise failure.error()
+            del self._failures[key]
+
+        host = _host(key)
+        state = self._hosts.get(host)
+        if state is not None and state.retry_at > now:
+            self.backed_off += 1
+            raise HostBackoffError(host, state.retry_at - now)
+
+    def record_failure(self, url: str, error: Exception) -> None:
+        key = canonicalize_url(url)
+        now = time.monotonic()
+        if self.ttl > 0:
+            self._failures[key] = _Failure(error, url, now + self.ttl)
+            self._failures.move_to_end(key)
+            while len(self._failures) > self.max_entries:
+                self._failures.popitem(last=False)
+
+        if not is_host_failure(error):
+            return
+        host = _host(key)
+        state = self._hosts.setdefault(host, _HostState())
+        self._hosts.move_to_end(host)
+        state.failures += 1
+        excess = state.failures - self.backoff_threshold
+        if excess >= 0:
+            delay = min(self.backoff_base * 2**excess, self.backoff_max)
+            state.retry_at = now + delay
+        while len(self._hosts) > self.max_entries:
+            self._hosts.popitem(last=False)
+
+    def record_success(self, url: str) -> None:
+        self._hosts.pop(_host(canonicalize_url(url)), None)
+
+    def clear(self) -> None:
+        self._failures.clear()
+        self._hosts.clear()
+        self.hits = self.backed_off = 0
+
+    def stats(self) -> dict[str, int]:
+        now = time.monotonic()
+        return {
+            "entries": len(self._failures),
+            "hosts_backed_off": sum(s.retry_at > now for s in self._hosts.values()),
+            "hits": self.hits,
+            "backed_off": self.backed_off,
+        }
+
+
+def _host(canonical_url: str) -> str:
+    return urlsplit(canonical_url).hostname or ""
+
+
+fetch_failures = FailureCache(
+    ttl=settings.negative_cache_ttl_seconds,
+    max_entries=settings.negative_cache_max_entries,
+    backoff_threshold=settings.host_backoff_threshold,
+    backoff_base=settings.host_backoff_base_seconds,
+    backoff_max=settings.host_backoff_max_seconds,
+)
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.clients import get_scraper_client
+from app.config import settings
+from app.logger import log
+from app.models.summary import utcnow
+from app.repositories import job as job_repo
+from app.schemas.summary import JobResponse, JobStatus
+from app.services import summarizer
+
+# Identifies this worker as the owner of the jobs it claims
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Strong references to running jobs, so they are not garbage collected
+_tasks: set[asyncio.Task[None]] = set()
+
+
+def start(job_id: str, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """
+    Run a job in the background of the current event loop.
+    """
+    task = asyncio.create_task(run(job_id, session_factory))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def run(job_id: str, session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """
+    Claim a job, process every URL of it that has no result yet, recording
+    progress after each one, then notify the callback URL (if any).
+
+    The claim is atomic, so a job is run by one worker at a time; the worker
+    heartbeats while it runs. Already processed URLs are skipped, so a job
+    interrupted by a restart resumes where it left off.
+    """
+    async with session_factory() as db:
+        if not await job_repo.claim(db, job_id, WORKER_ID, _stale_before()):
+            return
+        job = await job_repo.get_by_id(db, job_id)
+    if job is None:
+        return
+
+    # Every write gets a short session of its own: none is held while URLs
+    # are summarized or the callback is posted
+    heartbeat = asyncio.create_task(_heartbeat(job_id, session_factory))
+    try:
+        done = {row.index for row in job.result_rows}
+
+        async def process(index: int, url: str) -> None:
+            item = await summarizer.batch_item(
+                session_factory, url, job.length, job.format
+            )
+            async with session_factory() as db:
+                await job_repo.add_result(
+                    db, job_id, index, item.model_dump(mode="json")
+                )
+
+        await asyncio.gather(
+            *[
+                process(index, url)
+                for index, url in enumerate(job.urls)
+                if index not in done
+            ]
+        )
+        status: JobStatus = "completed"
+        log.info("job completed", job_id=job_id, total=job.total)
+    except Exception as e:
+        log.info("job failed", job_id=job_id, error=str(e))
+        status = "failed"
+    finally:
+        heartbeat.cancel()
+
+    async with session_factory() as db:
+        finished = await job_repo.set_status(db, job_id, status)
+    if finished is not None and finished.callback_url:
+        await notify(finished.callback_url, JobResponse.model_validate(finished))
+
+
+async def _heartbeat(
+    job_id: str, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    # Renew the lease well before it goes stale, until it is lost
+    while True:
+        await asyncio.sleep(settings.job_lease_seconds / 3)
+        async with session_factory() as db:
+            if not await job_repo.heartbeat(db, job_id, WORKER_ID):
+                log.info("job lease lost", job_id=job_id)
+                return
+
+
+def _stale_before() -> datetime:
+    return utcnow() - timedelta(seconds=settings.job_lease_seconds)
+
+
+async def notify(callback_url: str, job: JobResponse) -> None:
+    """
+    POST the finished job to its callback URL. Failures are logged, not raised.
+    """
+    try:
+        response = await get_scraper_client().post(
+            callback_url, json=job.model_dump(mode="json")
+        )
+        response.raise_for_status()
+        log.info("job callback delivered", job_id=job.id)
+    except Exception as e:
+        log.info("job callback failed", job_id=job.id, error=str(e))
+
+
+async def resume(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """
+    Start jobs left pending, or running by a worker that stopped heartbeating
+    (e.g. a previous process). Jobs another live worker holds are left to it.
+    """
+    async with session_factory() as db:
+        claimable = await job_repo.get_claimable(db, _stale_before())
+    for job_id in claimable:
+        log.info("resuming job", job_id=job_id)
+        start(job_id, session_factory)
+
+
+def watch(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """
+    Resume claimable jobs every `job_lease_seconds` in the background, so
+    the jobs of a worker that died are taken over without waiting for a
+    restart.
+    """
+    task = asyncio.create_task(_watch(session_factory))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _watch(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    while True:
+        await asyncio.sleep(settings.job_lease_seconds)
+        try:
+            await resume(session_factory)
+        except Exception as e:
+            log.info("job sweep failed", error=str(e))
+
+
+async def shutdown() -> None:
+    """
+    Cancel running jobs and the sweep. The jobs stay "running" in the
+    database, and are resumed by another worker once their lease goes stale.
+    """
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
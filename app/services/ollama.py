@@ -1,8 +1,112 @@
+import asyncio
+import json
+import math
+import re
+from collections.abc import AsyncIterator
+
 import httpx
 
+from app.clients import get_ollama_client
 from app.config import settings
 from app.logger import log
 from app.schemas.summary import SummaryFormat, SummaryLength
+from app.utils.concurrency import ConcurrencyLimiter
+
+LENGTH_MAP: dict[SummaryLength, str] = {
+    "short": "1-2",
+    "medium": "3-5",
+    "long": "8-10",
+}
+PROMPTS: dict[SummaryFormat, str] = {
+    "prose": """Summarize the following article in {n} sentences. 
+                Return only the summary:""",
+    "markdown": """Summarize the following article as Markdown with a bold title 
+                and {n} bullet points. Return only the Markdown:""",
+}
+
+
+class GenerationError(httpx.RequestError):
+    """Raised when Ollama reports an error mid-stream or generates nothing."""
+
+
+# Used for the "map" step of long documents: condense one section of the
+# article, keeping enough detail for the final summary to draw on.
+CHUNK_PROMPT = """Summarize the following section of a longer article in detail,
+                keeping key facts, names and figures. Return only the summary:"""
+
+# Caps concurrent generations worker-wide; Ollama is the scarcest resource
+generation_limiter = ConcurrencyLimiter(settings.generation_concurrency)
+
+# Tokens kept free in the context window for the instructions and the output
+RESERVED_TOKENS = 1024
+
+_WORD = re.compile(r"\w+")
+_SYMBOL = re.compile(r"[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheaply estimate how many tokens `text` takes for a BPE tokenizer:
+    roughly 1.3 tokens per word plus one per punctuation mark.
+    """
+    words = len(_WORD.findall(text))
+    symbols = len(_SYMBOL.findall(text))
+    return math.ceil(words * 1.3) + symbols
+
+
+def input_token_budget() -> int:
+    """
+    Return how many tokens of article text fit in a single prompt.
+    """
+    return max(256, settings.ollama_context_tokens - RESERVED_TOKENS)
+
+
+def split_text(text: str, max_tokens: int) -> list[str]:
+    """
+    Split `text` into chunks of at most ~`max_tokens` tokens, breaking on
+    paragraph and then sentence boundaries. Only a single sentence longer than
+    the budget is split mid-sentence (on word boundaries).
+    """
+    pieces: list[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            words = sentence.split()
+            step = max(1, int(max_tokens / 1.5))
+            pieces.extend(
+                " ".join(words[i : i + step]) for i in range(0, len(words), step)
+            )
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        tokens = estimate_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def build_prompt(text: str, length: SummaryLength, format: SummaryFormat) -> str:
+    """
+    Build the summarization prompt for `text` in the requested variant.
+    """
+    return f"{PROMPTS[format].format(n=LENGTH_MAP[length])}\n\n{text}"
 
 
 async def check_health() -> bool:
@@ -12,9 +116,8 @@ async def check_health() -> bool:
     Returns True if healthy; False otherwise.
     """
     try:
-        async with httpx.AsyncClient(timeout=120) as client:
-            log.info("check ollama health")
-            response = await client.get(f"{settings.ollama_base_url}/api/tags")
+        log.info("check ollama health")
+        response = await get_ollama_client().get(f"{settings.ollama_base_url}/api/tags")
         response.raise_for_status()
         log.info("ollama is healthy")
         return True
@@ -35,25 +138,107 @@ async def summarize(
     Raises:
         httpx.HTTPStatusError  — if Ollama returns an error response
         httpx.RequestError     — if the request to Ollama fails
+        GenerationError        — if the summary is empty
     """
-    LENGTH_MAP: dict[SummaryLength, str] = {
-        "short": "1-2",
-        "medium": "3-5",
-        "long": "8-10",
-    }
-    PROMPTS: dict[SummaryFormat, str] = {
-        "prose": """Summarize the following article in {n} sentences. 
-                Return only the summary:""",
-        "markdown": """Summarize the following article as Markdown with a bold title 
-                and {n} bullet points. Return only the Markdown:""",
-    }
-    prompt = f"{PROMPTS[format].format(n=LENGTH_MAP[length])}\n\n{text}"
-    async with httpx.AsyncClient(timeout=120) as client:
-        log.info("summarizing", model=settings.ollama_model)
-        response = await client.post(
+    text = await condense(text)
+    log.info("summarizing", model=settings.ollama_model)
+    summary = await _generate(build_prompt(text, length, format))
+    if not summary.strip():
+        raise GenerationError("Ollama returned an empty summary")
+    log.info("summarization complete", model=settings.ollama_model)
+    return summary
+
+
+async def condense(text: str) -> str:
+    """
+    Map step for documents that do not fit the model context: split `text` on
+    paragraph/sentence boundaries, summarize the chunks concurrently (at most
+    `map_reduce_concurrency` at a time) and join the partial summaries. Repeats
+    until the result fits in a single prompt; if a round does not shrink the
+    text, it is cut to the budget instead. Short texts are returned as is.
+    """
+    budget = input_token_budget()
+    semaphore = asyncio.Semaphore(settings.map_reduce_concurrency)
+
+    async def summarize_chunk(chunk: str) -> str:
+        async with semaphore:
+            return await _generate(f"{CHUNK_PROMPT}\n\n{chunk}")
+
+    while estimate_tokens(text) > budget:
+        chunks = split_text(text, budget)
+        log.info("summarizing in chunks", chunks=len(chunks))
+        partials = await asyncio.gather(*[summarize_chunk(c) for c in chunks])
+        condensed = "\n\n".join(partials)
+        if len(condensed) >= len(text):
+            # The model is not shrinking the input: stop looping and keep as
+            # much of it as fits, cut on a paragraph/sentence boundary
+            log.info("condensing stalled, truncating", tokens=estimate_tokens(text))
+            return chunks[0]
+        text = condensed
+    return text
+
+
+async def _generate(prompt: str) -> str:
+    async with generation_limiter.slot():
+        response = await get_ollama_client().post(
             f"{settings.ollama_base_url}/api/generate",
-            json={"model": settings.ollama_model, "prompt": prompt, "stream": False},
+            json={
+                "model": settings.ollama_model,
+                "prompt": prompt,
+                "stream": False,
+                "options": {"num_ctx": settings.ollama_context_tokens},
+            },
         )
+    response.raise_for_status()
+    return response.json()["response"]
+
+
+async def summarize_stream(
+    text: str, length: SummaryLength = "medium", format: SummaryFormat = "prose"
+) -> AsyncIterator[str]:
+    """
+    Send `text` to the local Ollama instance and yield the summary token by
+    token as Ollama generates it.
+
+    Raises:
+        httpx.HTTPStatusError  — if Ollama returns an error response
+        httpx.RequestError     — if the request to Ollama fails
+        GenerationError        — if Ollama sends an error line, or the stream
+                                 ends before it is done or without any text;
+                                 tokens yielded so far are then incomplete
+    """
+    text = await condense(text)
+    prompt = build_prompt(text, length, format)
+    log.info("summarizing (streaming)", model=settings.ollama_model)
+    async with (
+        generation_limiter.slot(),
+        get_ollama_client().stream(
+            "POST",
+            f"{settings.ollama_base_url}/api/generate",
+            json={
+                "model": settings.ollama_model,
+                "prompt": prompt,
+                "stream": True,
+                "options": {"num_ctx": settings.ollama_context_tokens},
+            },
+        ) as response,
+    ):
         response.raise_for_status()
-        log.info("summarization complete", model=settings.ollama_model)
-        return response.json()["response"]
+        generated = done = False
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise GenerationError(f"Ollama error: {chunk['error']}")
+            if chunk.get("response"):
+                generated = generated or not chunk["response"].isspace()
+                yield chunk["response"]
+            if chunk.get("done"):
+                done = True
+                break
+        if not done:
+            raise GenerationError("Ollama stream ended before the summary was done")
+        if not generated:
+            raise GenerationError("Ollama returned an empty summary")
+    log.info("summarization complete", model=settings.ollama_model)
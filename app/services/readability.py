@@ -0,0 +1,175 @@
+import re
+
+from lxml import etree
+from lxml.html import HtmlElement
+
+# Never part of the main content
+BOILERPLATE_TAGS = (
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "form",
+    "button",
+    "noscript",
+    "iframe",
+    "svg",
+    "select",
+)
+
+# Elements whose text is scored; their parents become candidates
+TEXT_BLOCK_TAGS = {"p", "pre", "td", "blockquote", "li", "dd"}
+
+HEADING_TAGS = {"h1", "h2", "h3"}
+
+CANDIDATE_TAGS = {"div", "article", "section", "main", "td", "blockquote", "body"}
+
+NEGATIVE = re.compile(
+    r"banner|breadcrumb|comment|consent|cookie|disqus|footer|menu|modal|"
+    r"nav|newsletter|popup|promo|related|share|sidebar|social|sponsor|"
+    r"subscribe|widget",
+    re.IGNORECASE,
+)
+POSITIVE = re.compile(
+    r"article|body|content|entry|main|page|post|story|text", re.IGNORECASE
+)
+
+MIN_BLOCK_CHARS = 25
+# Below this the page is probably not an article; the caller keeps the full text
+MIN_CONTENT_CHARS = 250
+# Nor is it if the best block holds less than this share of the text left
+# after boilerplate removal (e.g. the lead teaser of a front page), ...
+MIN_CONTENT_SHARE = 0.1
+# ... or if at least this many blocks alike in tag and class, within or beside
+# the best, score within SIMILAR_SCORE_RATIO of each other (listing items)
+LISTING_MIN_ITEMS = 4
+SIMILAR_SCORE_RATIO = 0.5
+
+
+def text_of(element: HtmlElement) -> str:
+    return " ".join(s for s in (t.strip() for t in element.itertext()) if s)
+
+
+def class_weight(element: HtmlElement) -> int:
+    """
+    +25 / -25 for class and id names that usually mark content / boilerplate.
+    """
+    weight = 0
+    for name in (element.get("class"), element.get("id")):
+        if not name:
+            continue
+        if NEGATIVE.search(name):
+            weight -= 25
+        if POSITIVE.search(name):
+            weight += 25
+    return weight
+
+
+def link_density(element: HtmlElement, text_length: int) -> float:
+    """
+    Share of the element's text that sits inside links.
+    """
+    if text_length == 0:
+        return 0.0
+    link_chars = sum(len(text_of(a)) for a in element.iter("a"))
+    return min(1.0, link_chars / text_length)
+
+
+def remove_boilerplate(root: HtmlElement) -> None:
+    etree.strip_elements(root, *BOILERPLATE_TAGS, with_tail=False)
+    for element in list(root.iter("div", "section", "ul", "ol", "span", "table")):
+        if class_weight(element) < 0 and element.getparent() is not None:
+            element.drop_tree()
+
+
+def score_candidates(root: HtmlElement) -> dict[HtmlElement, float]:
+    """
+    Score each text block (roughly 1 point per 100 characters plus one per
+    comma) and credit it to its parent in full and its grandparent by half.
+    """
+    scores: dict[HtmlElement, float] = {}
+    for block in root.iter(*TEXT_BLOCK_TAGS):
+        text = text_of(block)
+        if len(text) < MIN_BLOCK_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        parent = block.getparent()
+        grandparent = parent.getparent() if parent is not None else None
+        for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+            if ancestor is None or ancestor.tag not in CANDIDATE_TAGS:
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = class_weight(ancestor)
+            scores[ancestor] += score * share
+
+    for element in scores:
+        scores[element] *= 1 - link_density(element, len(text_of(element)))
+    return scores
+
+
+def is_listing(best: HtmlElement, scores: dict[HtmlElement, float]) -> bool:
+    """
+    Whether the best block is, or is made of, several alike and similarly
+    scored blocks, as the teasers of a front page or search results are.
+    """
+    parent = best.getparent()
+    for group in (list(best), [] if parent is None else list(parent)):
+        candidates = [element for element in group if element in scores]
+        if not candidates:
+            continue
+        top = max(candidates, key=scores.__getitem__)
+        alike = [
+            element
+            for element in candidates
+            if element.tag == top.tag
+            and element.get("class") == top.get("class")
+            and scores[element] >= scores[top] * SIMILAR_SCORE_RATIO
+        ]
+        if len(alike) >= LISTING_MIN_ITEMS:
+            return True
+    return False
+
+
+def extract_main_text(root: HtmlElement) -> str:
+    """
+    Readability-style main-content extraction: drop boilerplate elements,
+    score the remaining blocks by text and link density, and return the text
+    of the best block plus sibling blocks that look like part of the same
+    article. Navigation, cookie banners, footers and comment sections are
+    thereby left out of the prompt.
+
+    Returns "" if no block has enough prose, or the page looks like a listing
+    rather than an article: the best block holds little of the page's text,
+    or is one of several alike blocks (the caller then keeps the full text).
+    `root` must already be stripped of script/style; it is modified in place.
+    """
+    remove_boilerplate(root)
+    scores = score_candidates(root)
+    if not scores:
+        return ""
+    best = max(scores, key=scores.__getitem__)
+    if is_listing(best, scores):
+        return ""
+    threshold = max(10.0, scores[best] * 0.2)
+
+    parent = best.getparent()
+    siblings = [best] if parent is None else list(parent)
+    parts = []
+    for sibling in siblings:
+        if not isinstance(sibling.tag, str):
+            continue
+        if sibling is best or scores.get(sibling, 0) >= threshold:
+            parts.append(text_of(sibling))
+        elif sibling.tag in HEADING_TAGS:
+            parts.append(text_of(sibling))
+        elif sibling.tag == "p":
+            text = text_of(sibling)
+            if len(text) > 80 and link_density(sibling, len(text)) < 0.25:
+                parts.append(text)
+
+    text = " ".join(p for p in parts if p)
+    if len(text) < MIN_CONTENT_CHARS:
+        return ""
+    if len(text) < len(text_of(root)) * MIN_CONTENT_SHARE:
+        return ""
+    return text
@@ -1,26 +1,210 @@
+from typing import NamedTuple
+from urllib.parse import urljoin, urlsplit
+
 import httpx
-from bs4 import BeautifulSoup
+from pydantic import HttpUrl
 
+from app.clients import get_scraper_client
+from app.config import settings
+from app.executors import extraction_offloader
 from app.logger import log
+from app.schemas.summary import validate_public_url
+from app.services import dns, extractors
+from app.services.failures import fetch_failures
+from app.utils.concurrency import ConcurrencyLimiter
+from app.utils.urls import canonicalize_url
+
+# Caps concurrent page fetches worker-wide and per target host
+fetch_limiter = ConcurrencyLimiter(
+    settings.scrape_concurrency, per_key_limit=settings.scrape_per_host_concurrency
+)
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+class UnsupportedContentError(ValueError):
+    """Raised when a URL serves something other than an HTML page."""
+
+
+class RedirectError(ValueError):
+    """Raised for redirect loops and redirects to disallowed URLs."""
+
 
+class Page(NamedTuple):
+    text: str
+    # Validators for conditional re-fetches; None if the server sent none
+    etag: str | None = None
+    last_modified: str | None = None
+    # True if a conditional fetch got 304 Not Modified; `text` is then empty
+    not_modified: bool = False
+    # URL the page was served from, after redirects
+    url: str | None = None
+    # Absolute rel=canonical URL declared by the page (same site only). Not
+    # trusted as a cache key: it may only lead to an existing summary of it
+    canonical_url: str | None = None
 
-async def fetch_text(url: str) -> str:
+
+async def fetch_page(
+    url: str, etag: str | None = None, last_modified: str | None = None
+) -> Page:
     """
-    Fetch the HTML at `url` and return its plain-text content.
+    Fetch the HTML at `url` and return its plain-text content along with the
+    response's cache validators, final URL and canonical link.
+
+    If `etag` / `last_modified` (from an earlier fetch) are given, the request
+    is conditional; if the server answers 304 Not Modified, the returned page
+    has `not_modified` set and no text.
+
+    Up to `max_redirects` redirects are followed; every hop is checked against
+    the domain policy and pinned to a public address like the first request.
+
+    The body is streamed: non-HTML responses are rejected from their headers
+    before any of it is read, and at most `max_download_bytes` are kept.
 
-    Returns:
-        Plain text extracted from the page.
+    Failures are remembered (see app/services/failures.py): a URL that just
+    failed raises the same error again without being fetched, and a host
+    that keeps failing is backed off.
 
     Raises:
         httpx.HTTPStatusError  — if the server returns a 4xx/5xx response
         httpx.RequestError     — if the request itself fails (timeout, DNS, …)
+        failures.HostBackoffError — while the URL's host is backed off
+        dns.BlockedAddressError — if the host resolves to a private address
+        UnsupportedContentError — if the response is not HTML
+        RedirectError          — on too many or disallowed redirects
+    """
+    fetch_failures.check(url)
+    try:
+        page = await _fetch_page(url, etag, last_modified)
+    except (
+        httpx.HTTPError,
+        dns.BlockedAddressError,
+        UnsupportedContentError,
+        RedirectError,
+    ) as e:
+        log.info("fetch failed", url=url, error_type=type(e).__name__)
+        fetch_failures.record_failure(url, e)
+        raise
+    fetch_failures.record_success(url)
+    return page
+
+
+async def _fetch_page(url: str, etag: str | None, last_modified: str | None) -> Page:
+    conditional = {}
+    if etag:
+        conditional["If-None-Match"] = etag
+    if last_modified:
+        conditional["If-Modified-Since"] = last_modified
+
+    current = url
+    for _ in range(settings.max_redirects + 1):
+        host = urlsplit(current).hostname or ""
+        # Fail fast; the connection itself is pinned to this same lookup
+        await dns.resolve_public(host)
+        async with fetch_limiter.slot(host):
+            log.info("fetching page", url=current, conditional=bool(conditional))
+            async with get_scraper_client().stream(
+                "GET", current, headers=conditional
+            ) as response:
+                if response.has_redirect_location:
+                    current = redirect_target(current, response)
+                    continue
+                if response.status_code == 304:
+                    log.info("page not modified", url=current)
+                    return Page("", etag, last_modified, not_modified=True, url=current)
+                response.raise_for_status()
+                check_content_type(response)
+                content = await read_capped(response, settings.max_download_bytes)
+                encoding = response.encoding or "utf-8"
+                validators = (
+                    response.headers.get("etag"),
+                    response.headers.get("last-modified"),
+                )
+                break
+    else:
+        raise RedirectError(f"More than {settings.max_redirects} redirects")
+
+    log.info("page fetched", url=current, bytes=len(content))
+    extraction = await extraction_offloader.run(
+        extractors.extract_document,
+        content,
+        encoding,
+        settings.html_extractor,
+        settings.content_extraction,
+    )
+    log.info(
+        "content extracted",
+        url=current,
+        mode=settings.content_extraction,
+        chars=len(extraction.text),
+        full_chars=extraction.full_chars,
+        reduction=round(extraction.full_chars / max(1, len(extraction.text)), 2),
+    )
+    return Page(
+        extraction.text,
+        *validators,
+        url=current,
+        canonical_url=resolve_canonical_link(current, extraction.canonical_link),
+    )
+
+
+def redirect_target(url: str, response: httpx.Response) -> str:
+    """
+    Return the absolute URL a redirect response points to, if it passes the
+    same checks as a requested URL.
+    """
+    target = urljoin(url, response.headers["location"])
+    try:
+        validate_public_url(HttpUrl(target))
+    except ValueError as e:
+        raise RedirectError(f"Redirect to disallowed URL: {e}") from e
+    log.info("following redirect", url=url, target=target)
+    return target
+
+
+def resolve_canonical_link(url: str, href: str | None) -> str | None:
+    """
+    Resolve a rel=canonical `href` against the page `url`. Links to another
+    site are ignored.
+    """
+    if not href:
+        return None
+    target = urljoin(url, href)
+    if urlsplit(target).scheme not in ("http", "https"):
+        return None
+    if urlsplit(canonicalize_url(target)).netloc != (
+        urlsplit(canonicalize_url(url)).netloc
+    ):
+        return None
+    return target
+
+
+def check_content_type(response: httpx.Response) -> None:
+    """
+    Reject responses whose Content-Type is not HTML. A missing header is let
+    through, as many servers omit it for pages.
+    """
+    content_type = response.headers.get("content-type")
+    if content_type is None:
+        return
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type not in HTML_CONTENT_TYPES:
+        raise UnsupportedContentError(
+            f"URL must point to an HTML page, got {media_type or 'unknown'}"
+        )
+
+
+async def read_capped(response: httpx.Response, limit: int) -> bytes:
+    """
+    Read the (decompressed) body of a streamed response chunk by chunk and
+    stop after `limit` bytes, closing the connection instead of downloading
+    the rest.
     """
-    async with httpx.AsyncClient() as client:
-        log.info("fetching page", url=url)
-        response = await client.get(url)
-        response.raise_for_status()
-        log.info("page fetched", url=url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        for tag in soup.find_all(["script", "style"]):
-            tag.decompose()
-        return soup.get_text(separator=" ", strip=True)
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body += chunk
+        if len(body) >= limit:
+            log.info("download truncated", url=str(response.url), limit=limit)
+            del body[limit:]
+            break
+    return bytes(body)
@@ -0,0 +1,481 @@
+import asyncio
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import cache_cutoff, summary_cache
+from app.config import settings
+from app.logger import log
+from app.models.summary import Summary
+from app.repositories import async_summary as async_summary_repo
+from app.repositories import url_alias as url_alias_repo
+from app.schemas.summary import (
+    BatchResultItem,
+    SummaryFormat,
+    SummaryLength,
+    SummaryResponse,
+)
+from app.services import ollama, scraper
+from app.utils import minhash
+from app.utils.hashing import content_hash
+from app.utils.singleflight import SingleFlight
+from app.utils.urls import canonicalize_url
+
+# Longer variants can be condensed into shorter ones without re-scraping
+LENGTH_RANK: dict[SummaryLength, int] = {"short": 0, "medium": 1, "long": 2}
+
+# Concurrent requests for the same (url, length, format) share one scrape and
+# one Ollama generation; concurrent creations also share a single record, and
+# concurrent refreshes of a record a single conditional fetch.
+_generations = SingleFlight()
+_creations = SingleFlight()
+_refreshes = SingleFlight()
+
+# Strong references to background refreshes, so they are not garbage collected
+_background: set[asyncio.Task[Summary | None]] = set()
+
+
+class Generation(NamedTuple):
+    page: scraper.Page
+    summary: str
+    # MinHash signature of `page.text`, computed once for the near-duplicate
+    # check and stored with the record
+    signature: bytes | None
+
+
+async def generate(
+    session_factory: async_sessionmaker[AsyncSession],
+    url: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+) -> Generation:
+    """
+    Scrape `url` and summarize it, coalescing concurrent calls for the same
+    variant into a single run. If the same text is already summarized under
+    another URL, that summary is reused instead of calling Ollama.
+
+    The shared run outlives any single caller, so it looks up duplicates in
+    its own session from `session_factory`.
+
+    Returns:
+        The scraped page (text truncated to `max_content_chars`), the summary
+        and the page's MinHash signature.
+
+    Raises:
+        httpx.HTTPStatusError / httpx.RequestError from the scraper or Ollama.
+    """
+    key = (canonicalize_url(url), length, format)
+    return await _generations.do(
+        key, lambda: _generate(session_factory, url, length, format)
+    )
+
+
+async def create(
+    session_factory: async_sessionmaker[AsyncSession],
+    url: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+) -> Summary:
+    """
+    Generate and persist a summary for `url`. Concurrent calls for the same
+    variant share both the generation and the resulting record, which is
+    written in a session of the shared run's own.
+    """
+    key = (canonicalize_url(url), length, format)
+    return await _creations.do(
+        key, lambda: _create(session_factory, url, length, format)
+    )
+
+
+async def _generate(
+    session_factory: async_sessionmaker[AsyncSession],
+    url: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+) -> Generation:
+    page = truncate(await scraper.fetch_page(url))
+    page_signature = await signature(page.text)
+    async with session_factory() as db:
+        duplicate = await find_duplicate(db, page, length, format, page_signature)
+    if duplicate is not None:
+        return Generation(page, duplicate.summary, page_signature)
+    summary = await ollama.summarize(text=page.text, length=length, format=format)
+    return Generation(page, summary, page_signature)
+
+
+def truncate(page: scraper.Page) -> scraper.Page:
+    return page._replace(text=page.text[: settings.max_content_chars])
+
+
+async def signature(text: str) -> bytes | None:
+    """
+    MinHash signature of `text`, computed off the event loop. Callers pass it
+    to both find_duplicate and persist rather than computing it twice.
+    """
+    return await asyncio.to_thread(minhash.signature, text)
+
+
+async def find_duplicate(
+    db: AsyncSession,
+    page: scraper.Page,
+    length: SummaryLength,
+    format: SummaryFormat,
+    page_signature: bytes | None,
+    exclude_id: int | None = None,
+) -> Summary | None:
+    """
+    Return a fresh stored summary of the requested variant of the URL `page`
+    declares as canonical, or failing that, one whose content is the same
+    text as `page` (e.g. a syndicated copy or mirror under another URL), or
+    near-identical text (differing only in ads, timestamps, related links,
+    ...) by `page_signature`, see signature(). Returns None if there is none.
+    """
+    if page.canonical_url:
+        # One way only: the page may borrow the summary of the URL it claims
+        # to be a copy of, but is never stored under that URL's key
+        canonical = await async_summary_repo.get_by_url(
+            db, page.canonical_url, since=cache_cutoff(), length=length, format=format
+        )
+        if canonical is not None and canonical.id != exclude_id:
+            log.info(
+                "summary reused from canonical link",
+                url=page.url,
+                source_id=canonical.id,
+                source_url=canonical.url,
+            )
+            return canonical
+    if not page.text:
+        return None
+    duplicate = await async_summary_repo.get_by_content_hash(
+        db, content_hash(page.text), length=length, format=format, since=cache_cutoff()
+    )
+    if duplicate is not None and duplicate.id != exclude_id:
+        log.info(
+            "summary reused from duplicate content",
+            url=page.url,
+            source_id=duplicate.id,
+            source_url=duplicate.url,
+        )
+        return duplicate
+
+    if page_signature is None:
+        return None
+    candidates = await async_summary_repo.get_near_duplicates(
+        db,
+        page_signature,
+        length=length,
+        format=format,
+        since=cache_cutoff(),
+        exclude_id=exclude_id,
+    )
+    signed = [(c, c.minhash) for c in candidates if c.minhash]
+    if not signed:
+        return None
+    candidates = [c for c, _ in signed]
+    scores = minhash.similarities(page_signature, [sig for _, sig in signed])
+    best = int(scores.argmax())
+    if scores[best] < settings.near_duplicate_threshold:
+        return None
+    duplicate = candidates[best]
+    log.info(
+        "summary reused from near-duplicate content",
+        url=page.url,
+        source_id=duplicate.id,
+        source_url=duplicate.url,
+        similarity=round(float(scores[best]), 3),
+    )
+    return duplicate
+
+
+async def refresh(
+    session_factory: async_sessionmaker[AsyncSession], record_id: int
+) -> Summary | None:
+    """
+    Re-fetch the page behind the summary `record_id` and regenerate its
+    summary only if the page changed. Returns None if the record is gone.
+
+    The fetch is conditional on the stored ETag / Last-Modified. On
+    304 Not Modified, or if the re-extracted text hashes to the stored
+    `content_hash`, Ollama is not called: the record is just marked fresh.
+    Concurrent refreshes of the same record share one run, in a session of
+    its own.
+    """
+    return await _refreshes.do(record_id, lambda: _refresh(session_factory, record_id))
+
+
+async def _refresh(
+    session_factory: async_sessionmaker[AsyncSession], record_id: int
+) -> Summary | None:
+    # No session is held open while the page is re-fetched and summarized
+    async with session_factory() as db:
+        record = await async_summary_repo.get_by_id(db, record_id)
+    if record is None:
+        return None
+    page = await scraper.fetch_page(
+        record.url, etag=record.etag, last_modified=record.last_modified
+    )
+    page = truncate(page)
+    if page.not_modified or content_hash(page.text) == record.content_hash:
+        log.info(
+            "page unchanged, summary kept",
+            id=record.id,
+            not_modified=page.not_modified,
+        )
+        async with session_factory() as db:
+            record = await async_summary_repo.get_by_id(db, record_id)
+            if record is None:
+                return None
+            record = await async_summary_repo.revalidate(
+                db, record, etag=page.etag, last_modified=page.last_modified
+            )
+    else:
+        page_signature = await signature(page.text)
+        async with session_factory() as db:
+            duplicate = await find_duplicate(
+                db,
+                page,
+                record.length,
+                record.format,
+                page_signature,
+                exclude_id=record.id,
+            )
+        summary = (
+            duplicate.summary
+            if duplicate is not None
+            else await ollama.summarize(
+                text=page.text, length=record.length, format=record.format
+            )
+        )
+        async with session_factory() as db:
+            record = await async_summary_repo.get_by_id(db, record_id)
+            if record is None:
+                return None
+            record = await async_summary_repo.update(
+                db,
+                record=record,
+                content=page.text,
+                summary=summary,
+                length=record.length,
+                format=record.format,
+                model=settings.ollama_model,
+                etag=page.etag,
+                last_modified=page.last_modified,
+                content_hash=content_hash(page.text),
+                canonical_url=stored_canonical_url(record.url, page),
+                minhash=page_signature,
+            )
+        log.info("summary regenerated", id=record.id)
+    summary_cache.put(record)
+    return record
+
+
+def refresh_in_background(
+    session_factory: async_sessionmaker[AsyncSession], record_id: int
+) -> None:
+    """
+    Refresh the summary `record_id` in a background task with its own
+    session, for stale-while-revalidate serving. Shares the run of any
+    refresh of the record already in flight; failures are logged.
+    """
+    task = asyncio.create_task(_refresh_in_background(session_factory, record_id))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def _refresh_in_background(
+    session_factory: async_sessionmaker[AsyncSession], record_id: int
+) -> Summary | None:
+    log.info("refreshing stale summary", id=record_id)
+    try:
+        return await refresh(session_factory, record_id)
+    except Exception as e:
+        log.info("background refresh failed", id=record_id, error=str(e))
+        return None
+
+
+async def shutdown() -> None:
+    """
+    Cancel background refreshes; the stale records are refreshed again on
+    their next request.
+    """
+    for task in list(_background):
+        task.cancel()
+    await asyncio.gather(*_background, return_exceptions=True)
+
+
+async def derive(
+    db: AsyncSession, url: str, length: SummaryLength, format: SummaryFormat
+) -> Generation | None:
+    """
+    Produce the requested variant from a fresh stored variant of the same URL,
+    without re-scraping.
+
+    A stored summary at least as long as the requested one is condensed (a far
+    smaller prompt than the article); failing that, the stored content is
+    summarized again.
+
+    Returns:
+        The source's stored content, validators and signature, and the
+        summary — or None if no fresh variant of `url` is stored.
+    """
+    variants = await async_summary_repo.get_variants(db, url, since=cache_cutoff())
+    longer = [v for v in variants if LENGTH_RANK[v.length] >= LENGTH_RANK[length]]
+    if longer:
+        source = min(longer, key=lambda v: (LENGTH_RANK[v.length], v.format != format))
+        log.info("deriving summary", url=url, source_id=source.id, source="summary")
+        summary = await ollama.summarize(
+            text=source.summary, length=length, format=format
+        )
+        return Generation(stored_page(source), summary, source.minhash)
+
+    with_content = [v for v in variants if v.content]
+    if with_content:
+        source = with_content[0]
+        log.info("deriving summary", url=url, source_id=source.id, source="content")
+        page = stored_page(source)
+        summary = await ollama.summarize(text=page.text, length=length, format=format)
+        return Generation(page, summary, source.minhash)
+
+    return None
+
+
+def stored_page(record: Summary) -> scraper.Page:
+    # The page is served from the stored key, not the URL as requested before
+    # redirects, so variants derived from it are stored under the same key
+    return scraper.Page(
+        record.content or "",
+        record.etag,
+        record.last_modified,
+        url=record.canonical_url,
+        canonical_url=record.canonical_url,
+    )
+
+
+def stored_canonical_url(url: str, page: scraper.Page) -> str:
+    """
+    Return the cache key to store a summary of `page` (requested as `url`)
+    under: the canonical form of the URL it was served from after redirects.
+
+    The page's rel=canonical link is deliberately not used: any page could
+    then overwrite the entry of another path on its host.
+    """
+    return canonicalize_url(page.url or url)
+
+
+async def resolve_url(db: AsyncSession, url: str) -> str:
+    """
+    Return the cache key for a requested `url`: its canonical form, or the
+    canonical URL it was found to redirect to on an earlier fetch. A found
+    alias is also taught to the memory cache.
+    """
+    requested = canonicalize_url(url)
+    resolved = await url_alias_repo.resolve(db, requested)
+    if resolved != requested:
+        summary_cache.alias(requested, resolved)
+    return resolved
+
+
+async def lookup(
+    session_factory: async_sessionmaker[AsyncSession],
+    url: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+    since: datetime,
+) -> Summary | None:
+    """
+    Return the stored summary of the requested variant of `url` fetched since
+    `since`, or None. The session is released before returning, so callers
+    hold no pooled connection while they go on to scrape and summarize.
+    """
+    async with session_factory() as db:
+        return await async_summary_repo.get_by_url(
+            db,
+            url=await resolve_url(db, url),
+            since=since,
+            length=length,
+            format=format,
+        )
+
+
+async def persist(
+    db: AsyncSession,
+    url: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+    page: scraper.Page,
+    summary: str,
+    page_signature: bytes | None,
+) -> Summary:
+    """
+    Store a new summary of `page` (requested as `url`), with the page's
+    MinHash signature, and cache it. If the request was redirected to a
+    different canonical URL, the requested URL is recorded as an alias of it.
+    """
+    canonical_url = stored_canonical_url(url, page)
+    record = await async_summary_repo.create(
+        db,
+        url=url,
+        canonical_url=canonical_url,
+        content=page.text,
+        summary=summary,
+        length=length,
+        format=format,
+        model=settings.ollama_model,
+        etag=page.etag,
+        last_modified=page.last_modified,
+        content_hash=content_hash(page.text),
+        minhash=page_signature,
+    )
+    requested = canonicalize_url(url)
+    if requested != canonical_url:
+        log.info("recording url alias", alias=requested, canonical_url=canonical_url)
+        await url_alias_repo.record(db, requested, canonical_url)
+        summary_cache.alias(requested, canonical_url)
+    summary_cache.put(record)
+    return record
+
+
+async def _create(
+    session_factory: async_sessionmaker[AsyncSession],
+    url: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+) -> Summary:
+    # No session is held open while the page is scraped and summarized
+    async with session_factory() as db:
+        derived = await derive(db, await resolve_url(db, url), length, format)
+    page, summary, page_signature = derived or await generate(
+        session_factory, url, length, format
+    )
+    async with session_factory() as db:
+        record = await persist(db, url, length, format, page, summary, page_signature)
+    log.info("summary created", id=record.id)
+    return record
+
+
+async def batch_item(
+    session_factory: async_sessionmaker[AsyncSession],
+    url: str,
+    length: SummaryLength,
+    format: SummaryFormat,
+) -> BatchResultItem:
+    """
+    Generate and persist a summary for one URL of a batch, capturing any
+    failure in the returned item instead of raising.
+
+    Items run concurrently across the batch, each in sessions of its own.
+    """
+    try:
+        page, summary, page_signature = await generate(
+            session_factory, url, length, format
+        )
+        async with session_factory() as db:
+            record = await persist(
+                db, url, length, format, page, summary, page_signature
+            )
+        return BatchResultItem(
+            url=url, result=SummaryResponse.model_validate(record), success=True
+        )
+    except Exception as e:
+        return BatchResultItem(url=url, error=str(e), success=False)
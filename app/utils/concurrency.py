@@ -0,0 +1,90 @@
+import asyncio
+import weakref
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class _LoopState:
+    semaphore: asyncio.Semaphore
+    per_key: dict[Hashable, tuple[asyncio.Semaphore, int]] = field(default_factory=dict)
+
+
+class ConcurrencyLimiter:
+    """
+    Cap how many operations run at once, globally and (optionally) per key,
+    e.g. per target host.
+
+    Semaphores are created lazily for each running event loop, so a module
+    level instance is safe to use from any loop. Per-key semaphores are
+    dropped as soon as no operation holds or waits for them.
+    """
+
+    def __init__(self, limit: int, per_key_limit: int | None = None) -> None:
+        self.limit = limit
+        self.per_key_limit = per_key_limit
+        self.active = 0
+        self.waiting = 0
+        self._states: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _LoopState
+        ] = weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable | None = None) -> AsyncIterator[None]:
+        state = self._state()
+        key_semaphore = self._enter_key(state, key)
+        try:
+            self.waiting += 1
+            try:
+                if key_semaphore is not None:
+                    await key_semaphore.acquire()
+                try:
+                    await state.semaphore.acquire()
+                except BaseException:
+                    if key_semaphore is not None:
+                        key_semaphore.release()
+                    raise
+            finally:
+                self.waiting -= 1
+
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+                state.semaphore.release()
+                if key_semaphore is not None:
+                    key_semaphore.release()
+        finally:
+            self._exit_key(state, key)
+
+    def stats(self) -> dict[str, int]:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting}
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState(asyncio.Semaphore(self.limit))
+        return state
+
+    def _enter_key(
+        self, state: _LoopState, key: Hashable | None
+    ) -> asyncio.Semaphore | None:
+        if key is None or self.per_key_limit is None:
+            return None
+        semaphore, users = state.per_key.get(
+            key, (asyncio.Semaphore(self.per_key_limit), 0)
+        )
+        state.per_key[key] = (semaphore, users + 1)
+        return semaphore
+
+    def _exit_key(self, state: _LoopState, key: Hashable | None) -> None:
+        if key is None or key not in state.per_key:
+            return
+        semaphore, users = state.per_key[key]
+        if users <= 1:
+            del state.per_key[key]
+        else:
+            state.per_key[key] = (semaphore, users - 1)
@@ -0,0 +1,15 @@
+import hashlib
+import unicodedata
+
+
+def content_hash(text: str) -> str:
+    """
+    Return the SHA-256 hex digest of `text`, used to tell whether a page's
+    content changed between fetches and to find the same article under
+    different URLs.
+
+    The text is NFC-normalized and its whitespace collapsed first, so
+    differences in markup layout do not change the hash.
+    """
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
@@ -1,22 +1,70 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import NamedTuple
 from urllib.parse import urlencode
 
 
+class Cursor(NamedTuple):
+    """
+    A position in a listing ordered by (created_at, id) descending: the item
+    to continue after (older items), or with `before` set, the item to go back
+    from (newer items).
+    """
+
+    created_at: datetime
+    id: int
+    before: bool = False
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Return `cursor` as an opaque, URL-safe token."""
+    payload = [cursor.created_at.isoformat(), cursor.id, int(cursor.before)]
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Parse a token from encode_cursor().
+
+    Raises:
+        ValueError — if the token is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, id, before = json.loads(data)
+        return Cursor(datetime.fromisoformat(created_at), int(id), bool(before))
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
 def build_pagination_links(
     base_path: str,
-    page: int,
-    size: int,
-    total: int,
+    page: int | None = None,
+    size: int = 10,
+    total: int | None = None,
     extra_params: dict[str, str] | None = None,
+    next_cursor: str | None = None,
+    prev_cursor: str | None = None,
 ) -> tuple[str | None, str | None]:
     """
     Return (next_url, prev_url) for a paginated response.
 
-    Returns None for next if on the last page, None for prev if on the first.
+    With `page` (and `total`), the links are page numbers: None for next if
+    on the last page, None for prev if on the first. Without, they carry the
+    given opaque cursors, and are None where no cursor is given.
     extra_params are appended as additional query string values (e.g. {"q": "python"}).
     """
     params = {"size": size, **(extra_params or {})}
     base = f"{base_path}?{urlencode(params)}"
 
-    next_url = f"{base}&page={page + 1}" if page * size < total else None
+    if page is None:
+        next_url = f"{base}&cursor={next_cursor}" if next_cursor else None
+        prev_url = f"{base}&cursor={prev_cursor}" if prev_cursor else None
+        return next_url, prev_url
+
+    next_url = f"{base}&page={page + 1}" if page * size < (total or 0) else None
     prev_url = f"{base}&page={page - 1}" if page > 1 else None
     return next_url, prev_url
@@ -0,0 +1,35 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the work as a task; every caller that
+    arrives while it is still running awaits the same task and receives the
+    same result (or exception). The key is released as soon as the task
+    finishes, so later calls start fresh work.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        # Shield so a disconnecting caller does not cancel the shared work
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def _release(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
@@ -0,0 +1,73 @@
+import ipaddress
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.config import settings
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Return the canonical form of `url`, used as the cache / in-flight key so
+    trivially different URLs of the same page share one summary.
+
+    Lowercases the scheme and host, strips a leading "www." (if
+    `canonical_strip_www`), the default port, the fragment and a trailing
+    slash, drops the tracking parameters listed in `tracking_params`
+    (`name` or `prefix*`) and sorts the remaining query parameters by name.
+    Idempotent: canonicalizing a canonical URL returns it unchanged.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if settings.canonical_strip_www and host.startswith("www."):
+        host = host[4:]
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    params = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(name)
+    ]
+    # Stable sort: repeated parameters keep their relative order
+    query = urlencode(sorted(params, key=lambda param: param[0]))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    for pattern in settings.tracking_params:
+        if pattern.endswith("*"):
+            if name.startswith(pattern[:-1]):
+                return True
+        elif name == pattern:
+            return True
+    return False
+
+
+def ip_literal(host: str) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    """
+    Return `host` as an IP address if it is an IP literal, otherwise None.
+    """
+    try:
+        return ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return None
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Return False for private and loopback addresses, which must never be
+    fetched on behalf of a client (SSRF).
+    """
+    ip = ipaddress.ip_address(address)
+    return not (ip.is_private or ip.is_loopback)
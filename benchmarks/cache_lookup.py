@@ -0,0 +1,101 @@
+"""
+Benchmark the cache lookup and history queries with and without the
+`summaries` indexes.
+
+Usage:
+    uv run python -m benchmarks.cache_lookup [--rows 1000000] [--lookups 200]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Index, create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.summary import Summary
+from app.repositories import summary as summary_repo
+
+INDEXES = [
+    index
+    for index in Summary.__table__.indexes
+    if index.name
+    in ("ix_summaries_canonical_url_created_at", "ix_summaries_created_at")
+]
+
+
+def seed(engine, rows: int, distinct_urls: int) -> None:
+    Base.metadata.create_all(engine)
+    start = datetime(2026, 1, 1)
+    batch = []
+    with engine.begin() as connection:
+        for i in range(rows):
+            batch.append(
+                {
+                    "url": f"https://example-{i % distinct_urls}.com/article",
+                    "canonical_url": f"https://example-{i % distinct_urls}.com/article",
+                    "summary": "A summary",
+                    "model": "llama3.2",
+                    "created_at": start + timedelta(seconds=i),
+                }
+            )
+            if len(batch) == 50_000:
+                connection.execute(Summary.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(Summary.__table__.insert(), batch)
+
+
+def time_queries(engine, lookups: int, distinct_urls: int) -> tuple[float, float]:
+    urls = [
+        f"https://example-{random.randrange(distinct_urls)}.com/article"
+        for _ in range(lookups)
+    ]
+    since = datetime(2026, 1, 1)
+    with Session(engine) as db:
+        start = time.perf_counter()
+        for url in urls:
+            summary_repo.get_by_url(db, url, since=since)
+        lookup_ms = (time.perf_counter() - start) / lookups * 1000
+
+        start = time.perf_counter()
+        for _ in range(10):
+            db.query(Summary).order_by(Summary.created_at.desc()).limit(10).all()
+        history_ms = (time.perf_counter() - start) / 10 * 1000
+    return lookup_ms, history_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    distinct_urls = max(1, args.rows // 10)
+
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    engine = create_engine(f"sqlite:///{path}")
+    print(f"seeding {args.rows:,} rows into {path} ...")
+    seed(engine, args.rows, distinct_urls)
+
+    with engine.begin() as connection:
+        for index in INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    before = time_queries(engine, args.lookups, distinct_urls)
+
+    for index in INDEXES:
+        Index.create(index, bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    after = time_queries(engine, args.lookups, distinct_urls)
+
+    print(f"{'query':<24}{'no index (ms)':>16}{'indexed (ms)':>16}")
+    print(f"{'get_by_url':<24}{before[0]:>16.3f}{after[0]:>16.3f}")
+    print(f"{'history first page':<24}{before[1]:>16.3f}{after[1]:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark HTML-to-text extraction throughput per extractor backend over the
+saved pages in `benchmarks/corpus/`, and report how much text main-content
+extraction keeps per page.
+
+Usage:
+    uv run python -m benchmarks.extraction [--repeat 50] [--corpus DIR]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from app.services.extractors import EXTRACTORS, extract_document
+
+CORPUS = Path(__file__).parent / "corpus"
+
+
+def time_extractor(name: str, pages: dict[str, str], repeat: int) -> dict[str, float]:
+    """Return seconds per extraction for each page."""
+    extractor = EXTRACTORS[name]()
+    timings = {}
+    for page, html in pages.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            extractor.extract(html)
+        timings[page] = (time.perf_counter() - start) / repeat
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    args = parser.parse_args()
+
+    pages = {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(args.corpus.glob("*.html"))
+    }
+    total_mb = sum(len(html.encode()) for html in pages.values()) / 1e6
+    print(f"{len(pages)} pages, {total_mb:.2f} MB, {args.repeat} runs each\n")
+
+    outputs = {name: EXTRACTORS[name]().extract for name in EXTRACTORS}
+    for page, html in pages.items():
+        texts = {name: extract(html) for name, extract in outputs.items()}
+        if len(set(texts.values())) != 1:
+            print(f"warning: backends disagree on {page}")
+
+    print(f"{'page':<34} {'full chars':>10} {'main chars':>10} {'reduction':>9}")
+    for page, html in pages.items():
+        extraction = extract_document(html.encode(), "utf-8", "lxml", "main")
+        ratio = extraction.full_chars / max(1, len(extraction.text))
+        print(
+            f"{page:<34} {extraction.full_chars:>10} {len(extraction.text):>10}"
+            f" {ratio:>8.1f}x"
+        )
+    print()
+
+    results = {name: time_extractor(name, pages, args.repeat) for name in EXTRACTORS}
+    baseline = sum(results["bs4"].values())
+    print(f"{'backend':<8} {'page':<34} {'ms/page':>9} {'MB/s':>8}")
+    for name, timings in results.items():
+        for page, seconds in timings.items():
+            mb = len(pages[page].encode()) / 1e6
+            print(f"{name:<8} {page:<34} {seconds * 1e3:>9.2f} {mb / seconds:>8.1f}")
+        total = sum(timings.values())
+        print(
+            f"{name:<8} {'total':<34} {total * 1e3:>9.2f} {total_mb / total:>8.1f}"
+            f"   ({baseline / total:.1f}x bs4)\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
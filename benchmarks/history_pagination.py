@@ -0,0 +1,68 @@
+"""
+Benchmark GET /summarize/history pagination at increasing depths: page-number
+(OFFSET + COUNT) versus cursor (keyset) pages.
+
+Usage:
+    uv run python -m benchmarks.history_pagination [--rows 1000000] [--size 20]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.models.summary import Summary
+from app.repositories import summary as summary_repo
+from app.utils.pagination import Cursor
+from benchmarks.cache_lookup import seed
+
+REPEAT = 5
+
+
+def timed(fn) -> float:
+    """Return milliseconds per call of `fn`."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=20)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    engine = create_engine(f"sqlite:///{path}")
+    print(f"seeding {args.rows:,} rows into {path} ...")
+    seed(engine, args.rows, max(1, args.rows // 10))
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+    print(f"{'page':>10}{'offset (ms)':>14}{'cursor (ms)':>14}")
+    with Session(engine) as db:
+        ordered = db.query(Summary.created_at, Summary.id).order_by(
+            Summary.created_at.desc(), Summary.id.desc()
+        )
+        pages = args.rows // args.size
+        for page in sorted({1, 10, 100, pages // 10, pages // 2, pages}):
+            if page < 1:
+                continue
+            offset_ms = timed(
+                lambda: summary_repo.get_all(db, page=page, size=args.size)
+            )
+            # The cursor a client would hold after paging down to `page`
+            position = ordered.offset((page - 1) * args.size - 1).first()
+            cursor = Cursor(*position) if page > 1 and position else None
+            cursor_ms = timed(
+                lambda: summary_repo.get_page(db, size=args.size, cursor=cursor)
+            )
+            print(f"{page:>10,}{offset_ms:>14.3f}{cursor_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark the cost of loading and serializing what the API returns: a
+history page and cache-hit lookups over rows carrying large scraped content.
+
+Usage:
+    uv run python -m benchmarks.history_payload [--rows 2000] [--size 100]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.summary import Summary
+from app.repositories import summary as summary_repo
+from app.schemas.summary import SummaryHistoryItem, SummaryResponse
+
+REPEAT = 20
+# Close to `max_content_chars`
+CONTENT = " ".join(f"word{i % 1000}" for i in range(6_000))
+
+
+def measure(fn) -> tuple[float, float]:
+    """Return (milliseconds per call, peak KiB allocated by one call) of `fn`."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    elapsed = (time.perf_counter() - start) / REPEAT * 1000
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def seed(engine, rows: int) -> None:
+    Base.metadata.create_all(engine)
+    start = datetime(2026, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(
+            Summary.__table__.insert(),
+            [
+                {
+                    "url": f"https://example-{i}.com/article",
+                    "canonical_url": f"https://example-{i}.com/article",
+                    "content": CONTENT,
+                    "word_count": len(CONTENT.split()),
+                    "summary": "A summary of the article. " * 20,
+                    "model": "llama3.2",
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--size", type=int, default=100)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    engine = create_engine(f"sqlite:///{path}")
+    print(f"seeding {args.rows:,} rows of {len(CONTENT):,} chars into {path} ...")
+    seed(engine, args.rows)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+    urls = [f"https://example-{i}.com/article" for i in range(args.size)]
+
+    def history_page() -> None:
+        # A fresh session per call, as per request
+        with Session(engine) as db:
+            for item in summary_repo.get_all(db, page=2, size=args.size)["items"]:
+                SummaryHistoryItem.model_validate(item)
+
+    def cache_hits() -> None:
+        with Session(engine) as db:
+            for url in urls:
+                SummaryResponse.model_validate(summary_repo.get_by_url(db, url))
+
+    print(f"{'path':>24}{'ms':>10}{'peak KiB':>12}")
+    for label, fn in [
+        (f"history page ({args.size})", history_page),
+        (f"cache hits ({args.size})", cache_hits),
+    ]:
+        elapsed, peak = measure(fn)
+        print(f"{label:>24}{elapsed:>10.2f}{peak:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark GET /summarize/history?q=... search: the full-text index (FTS5,
+ranked, with snippets and total) versus the substring scan it replaced.
+
+Usage:
+    uv run python -m benchmarks.history_search [--rows 1000000] [--size 20]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.summary import Summary
+from app.repositories import summary as summary_repo
+
+REPEAT = 5
+VOCABULARY = 20_000
+WORDS_PER_SUMMARY = 60
+# (label, query): a rare word, a common word, two words, a prefix
+QUERIES = [
+    ("rare", "w19999"),
+    ("common", "w7"),
+    ("two words", "w7 w12"),
+    ("prefix", "w123"),
+]
+
+
+def timed(fn) -> float:
+    """Return milliseconds per call of `fn`."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def seed(engine, rows: int) -> None:
+    Base.metadata.create_all(engine)
+    # Zipf-like word frequencies, like natural text
+    rng = random.Random(0)
+    words = [f"w{i}" for i in range(VOCABULARY)]
+    weights = [1 / (i + 1) for i in range(VOCABULARY)]
+    start = datetime(2026, 1, 1)
+    batch = []
+    with engine.begin() as connection:
+        for i in range(rows):
+            summary = " ".join(rng.choices(words, weights, k=WORDS_PER_SUMMARY))
+            batch.append(
+                {
+                    "url": f"https://example-{i}.com/article",
+                    "canonical_url": f"https://example-{i}.com/article",
+                    "summary": summary,
+                    "model": "llama3.2",
+                    "created_at": start + timedelta(seconds=i),
+                }
+            )
+            if len(batch) == 50_000:
+                connection.execute(Summary.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(Summary.__table__.insert(), batch)
+
+
+def scan(db: Session, q: str, size: int) -> None:
+    """The former search: a substring match on both columns, plus its count."""
+    match = or_(Summary.url.ilike(f"%{q}%"), Summary.summary.ilike(f"%{q}%"))
+    db.scalar(select(func.count()).select_from(Summary).where(match))
+    db.query(Summary).filter(match).order_by(Summary.created_at.desc()).limit(
+        size
+    ).all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--size", type=int, default=20)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    engine = create_engine(f"sqlite:///{path}")
+    print(f"seeding {args.rows:,} rows into {path} ...")
+    seed(engine, args.rows)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+    print(f"{'query':>12}{'matches':>10}{'scan (ms)':>12}{'fts (ms)':>12}")
+    with Session(engine) as db:
+        for label, q in QUERIES:
+            total = summary_repo.count(db, q=q)
+            scan_ms = timed(lambda: scan(db, q, args.size))
+            fts_ms = timed(lambda: summary_repo.get_all(db, size=args.size, q=q))
+            print(f"{label:>12}{total:>10,}{scan_ms:>12.3f}{fts_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
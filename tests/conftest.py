@@ -1,30 +1,59 @@
+import tempfile
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from app.database import Base, get_db
+from app.cache import history_counts, summary_cache
+from app.database import Base, get_async_db, get_async_session_factory, get_db
 from app.limiter import limiter
 from app.main import app
+from app.services import dns, failures
+
+# The sync and async engines must see the same data, so tests use a temporary
+# SQLite file rather than an in-memory database (which is per-connection).
+DB_PATH = Path(tempfile.mkdtemp()) / "test.db"
 
-engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+engine = create_engine(
+    f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False}
+)
+
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}", poolclass=NullPool)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base.metadata.create_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clean_db():
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
 @pytest.fixture
 def db_session():
-    connection = engine.connect()
-    transaction = connection.begin()
-    db = TestingSessionLocal(bind=connection)
+    db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        transaction.rollback()
-        connection.close()
+
+
+@pytest.fixture
+async def async_db_session():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
 
 
 @pytest.fixture
@@ -32,13 +61,73 @@ def client(db_session):
     def override_get_db():
         yield db_session
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: (
+        TestingAsyncSessionLocal
+    )
     with TestClient(app) as client:
         yield client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def small_pool_client(client):
+    """
+    `client` with the async dependencies bound to a pool of 2 connections
+    that gives up waiting after half a second, to catch connections held
+    across slow work.
+    """
+    pooled_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{DB_PATH}", pool_size=2, max_overflow=0, pool_timeout=0.5
+    )
+    session_factory = async_sessionmaker(
+        pooled_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+    yield client
+    client.portal.call(pooled_engine.dispose)
+
+
 @pytest.fixture(autouse=True)
 def reset_limiter():
     limiter.reset()
     yield
+
+
+@pytest.fixture(autouse=True)
+def reset_summary_cache():
+    summary_cache.clear()
+    history_counts.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_fetch_failures():
+    failures.fetch_failures.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def fake_dns(monkeypatch):
+    """
+    Resolve host names without the network: localhost is loopback, every other
+    name is a public documentation address.
+    """
+
+    async def lookup(host: str) -> list[str]:
+        return ["127.0.0.1"] if host == "localhost" else ["93.184.216.34"]
+
+    dns.dns_cache.clear()
+    monkeypatch.setattr(dns, "_lookup", lookup)
+    yield
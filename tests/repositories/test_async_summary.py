@@ -0,0 +1,209 @@
+from datetime import datetime
+
+from sqlalchemy import inspect
+
+from app.repositories import async_summary as summary_repo
+from app.utils import minhash
+
+
+async def test_create(async_db_session):
+    record = await summary_repo.create(
+        async_db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+
+    await async_db_session.refresh(record, ["content"])  # deferred
+
+    assert record.id is not None
+    assert record.url == "https://example.com"
+    assert record.summary == "A summary"
+    assert record.content == "A content"
+    assert record.created_at is not None
+
+
+async def test_get_by_id(async_db_session):
+    record_create = await summary_repo.create(
+        async_db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    record = await summary_repo.get_by_id(async_db_session, record_create.id)
+
+    assert record is not None
+    assert record.id == record_create.id
+
+
+async def test_get_by_id_not_found(async_db_session):
+    record = await summary_repo.get_by_id(async_db_session, 9999)
+
+    assert record is None
+
+
+async def test_get_by_url(async_db_session):
+    await summary_repo.create(
+        async_db_session,
+        url="https://example-1.com",
+        summary="A summary #1",
+        content="A content #1",
+        model="llama3.2",
+    )
+    record = await summary_repo.create(
+        async_db_session,
+        url="https://example-2.com",
+        summary="A summary #2",
+        content="A content #2",
+        model="llama3.2",
+    )
+    result = await summary_repo.get_by_url(async_db_session, "https://example-2.com")
+
+    assert result is not None
+    assert result.id == record.id
+
+
+async def test_get_by_url_loads_response_attributes_only(async_db_session):
+    await summary_repo.create(
+        async_db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="word " * 400,
+        model="llama3.2",
+        minhash=minhash.signature("word " * 400),
+    )
+    async_db_session.expunge_all()
+
+    result = await summary_repo.get_by_url(async_db_session, "https://example.com")
+
+    assert result is not None
+    assert {"content", "minhash"} <= inspect(result).unloaded
+    assert result.reading_time_minutes == 2
+
+
+async def test_get_by_url_since_miss(async_db_session):
+    record = await summary_repo.create(
+        async_db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    record.fetched_at = datetime(2020, 1, 1)
+    await async_db_session.commit()
+
+    since = datetime(2024, 1, 1)
+    result = await summary_repo.get_by_url(
+        async_db_session, "https://example.com", since=since
+    )
+
+    assert result is None
+
+
+async def test_update(async_db_session):
+    record_create = await summary_repo.create(
+        async_db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    record_update = await summary_repo.update(
+        async_db_session,
+        record=record_create,
+        summary="New summary",
+        format="prose",
+        length="medium",
+        content="New content",
+        model="llama7.1",
+    )
+    await async_db_session.refresh(record_update, ["content"])  # deferred
+
+    assert record_update.summary == "New summary"
+    assert record_update.content == "New content"
+    assert record_update.model == "llama7.1"
+
+
+async def test_get_variants(async_db_session):
+    for length in ("short", "long"):
+        await summary_repo.create(
+            async_db_session,
+            url="https://example.com",
+            summary=f"A {length} summary",
+            content="A content",
+            model="llama3.2",
+            length=length,
+        )
+    await summary_repo.create(
+        async_db_session,
+        url="https://other.com",
+        summary="Other",
+        content="A content",
+        model="llama3.2",
+    )
+
+    variants = await summary_repo.get_variants(async_db_session, "https://example.com")
+
+    assert {v.length for v in variants} == {"short", "long"}
+    assert [v.content for v in variants] == ["A content", "A content"]
+
+
+async def test_get_by_content_hash(async_db_session):
+    record = await summary_repo.create(
+        async_db_session,
+        url="https://example.com/story",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+        content_hash="abc",
+    )
+
+    result = await summary_repo.get_by_content_hash(
+        async_db_session, "abc", length="medium", format="prose"
+    )
+    missing = await summary_repo.get_by_content_hash(
+        async_db_session, "def", length="medium", format="prose"
+    )
+
+    assert result is not None
+    assert result.id == record.id
+    assert missing is None
+
+
+async def test_get_near_duplicates(async_db_session):
+    article = " ".join(f"Sentence {i} of a long article." for i in range(100))
+    record = await summary_repo.create(
+        async_db_session,
+        url="https://example.com/story",
+        summary="A summary",
+        content=article,
+        model="llama3.2",
+        minhash=minhash.signature(article),
+    )
+    await summary_repo.create(
+        async_db_session,
+        url="https://other.com/story",
+        summary="Other",
+        content="Unrelated",
+        model="llama3.2",
+        minhash=minhash.signature("Unrelated"),
+    )
+
+    candidates = await summary_repo.get_near_duplicates(
+        async_db_session,
+        minhash.signature(article + " Updated today."),
+        length="medium",
+        format="prose",
+    )
+    excluded = await summary_repo.get_near_duplicates(
+        async_db_session,
+        minhash.signature(article),
+        length="medium",
+        format="prose",
+        exclude_id=record.id,
+    )
+
+    assert [c.id for c in candidates] == [record.id]
+    assert excluded == []
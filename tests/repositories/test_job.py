@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from app.repositories import job as job_repo
+
+
+async def test_create(async_db_session):
+    job = await job_repo.create(
+        async_db_session,
+        urls=["https://example-1.com", "https://example-2.com"],
+        callback_url="https://hooks.example.com",
+    )
+
+    assert job.id
+    assert job.status == "pending"
+    assert job.total == 2
+    assert job.completed == 0
+    assert job.callback_url == "https://hooks.example.com"
+
+
+async def test_add_result_records_progress(async_db_session):
+    job = await job_repo.create(async_db_session, urls=["https://example.com"])
+
+    await job_repo.add_result(async_db_session, job.id, 0, {"url": "https://a.com"})
+    await job_repo.add_result(async_db_session, job.id, 0, {"url": "https://b.com"})
+    job_id = job.id
+    async_db_session.expire_all()
+    reloaded = await job_repo.get_by_id(async_db_session, job_id)
+
+    assert reloaded is not None
+    assert reloaded.completed == 1
+    assert reloaded.results == [{"url": "https://b.com"}]
+
+
+async def test_get_claimable(async_db_session):
+    pending = await job_repo.create(async_db_session, urls=["https://a.com"])
+    live = await job_repo.create(async_db_session, urls=["https://b.com"])
+    stale = await job_repo.create(async_db_session, urls=["https://c.com"])
+    done = await job_repo.create(async_db_session, urls=["https://d.com"])
+    now = datetime(2026, 1, 1, 12)
+    for job, heartbeat_at in ((live, now), (stale, now - timedelta(minutes=5))):
+        job.status, job.heartbeat_at = "running", heartbeat_at
+    await job_repo.set_status(async_db_session, done.id, "completed")
+
+    claimable = await job_repo.get_claimable(
+        async_db_session, stale_before=now - timedelta(minutes=1)
+    )
+
+    assert set(claimable) == {pending.id, stale.id}
+
+
+async def test_claim_is_exclusive(async_db_session):
+    job = await job_repo.create(async_db_session, urls=["https://a.com"])
+    stale_before = datetime(2000, 1, 1)
+
+    first = await job_repo.claim(async_db_session, job.id, "worker-1", stale_before)
+    second = await job_repo.claim(async_db_session, job.id, "worker-2", stale_before)
+    await async_db_session.refresh(job)
+
+    assert (first, second) == (True, False)
+    assert job.status == "running"
+    assert job.owner == "worker-1"
+    assert await job_repo.heartbeat(async_db_session, job.id, "worker-1")
+    assert not await job_repo.heartbeat(async_db_session, job.id, "worker-2")
+
+
+async def test_claim_takes_over_stale_lease(async_db_session):
+    job = await job_repo.create(async_db_session, urls=["https://a.com"])
+    await job_repo.claim(async_db_session, job.id, "worker-1", datetime(2000, 1, 1))
+
+    taken = await job_repo.claim(
+        async_db_session, job.id, "worker-2", stale_before=datetime(2100, 1, 1)
+    )
+    await async_db_session.refresh(job)
+
+    assert taken
+    assert job.owner == "worker-2"
+    assert not await job_repo.heartbeat(async_db_session, job.id, "worker-1")
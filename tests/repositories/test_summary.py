@@ -1,7 +1,12 @@
 from datetime import datetime
 from typing import cast
 
+from sqlalchemy import inspect, text
+
+from app.models.minhash_band import MinHashBand
 from app.repositories import summary as summary_repo
+from app.utils import minhash
+from app.utils.pagination import Cursor
 
 
 def test_create(db_session):
@@ -163,6 +168,106 @@ def test_get_all_non_matching_filter_term(db_session):
     assert items["size"] == 2
 
 
+def test_search_ranks_by_relevance(db_session):
+    for summary in [
+        "Gardening tips, with one aside on rust.",
+        "Rust ownership: how rust tracks borrows, and why rust needs no GC.",
+        "A summary about cooking",
+    ]:
+        summary_repo.create(
+            db_session,
+            url="https://example.com",
+            summary=summary,
+            content="A content",
+            model="llama3.2",
+        )
+
+    items = summary_repo.get_all(db_session, page=1, size=10, q="rust")
+
+    assert [item.summary[:4] for item in items["items"]] == ["Rust", "Gard"]
+    assert items["total"] == 2
+
+
+def test_search_matches_all_words_and_last_as_prefix(db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com/a",
+        summary="Summarizing articles with local models",
+        content="A content",
+        model="llama3.2",
+    )
+    summary_repo.create(
+        db_session,
+        url="https://example.com/b",
+        summary="Summarizing podcasts",
+        content="A content",
+        model="llama3.2",
+    )
+
+    both = summary_repo.get_all(db_session, page=1, size=10, q="summar")
+    one = summary_repo.get_all(db_session, page=1, size=10, q="Local summar")
+    none = summary_repo.get_all(db_session, page=1, size=10, q="summar local")
+
+    assert both["total"] == 2
+    assert [item.url for item in one["items"]] == ["https://example.com/a"]
+    assert none["total"] == 0
+
+
+def test_search_returns_snippets(db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="An overview of the python packaging ecosystem",
+        content="A content",
+        model="llama3.2",
+    )
+
+    items = summary_repo.get_all(db_session, page=1, size=10, q="python")
+
+    assert items["snippets"][record.id] == (
+        "An overview of the <b>python</b> packaging ecosystem"
+    )
+    assert summary_repo.get_all(db_session, page=1, size=10)["snippets"] == {}
+
+
+def test_search_ignores_query_syntax(db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="C++ AND templates",
+        content="A content",
+        model="llama3.2",
+    )
+
+    assert summary_repo.get_all(db_session, q='c++ "and" (templ*')["total"] == 1
+    assert summary_repo.get_all(db_session, q="+-*")["total"] == 0
+
+
+def test_search_index_follows_updates_and_deletes(db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="A summary about python",
+        content="A content",
+        model="llama3.2",
+    )
+
+    summary_repo.update(
+        db_session,
+        record=record,
+        content="A content",
+        summary="A summary about haskell",
+        length="medium",
+        format="prose",
+        model="llama3.2",
+    )
+    assert summary_repo.count(db_session, q="python") == 0
+    assert summary_repo.count(db_session, q="haskell") == 1
+
+    summary_repo.delete(db_session, summary_id=record.id)
+    assert summary_repo.count(db_session, q="haskell") == 0
+
+
 def test_get_all_page_beyond_range(db_session):
     for i in range(5):
         summary_repo.create(
@@ -286,6 +391,25 @@ def test_delete(db_session):
     assert cast(int, record_create.id) == record_delete.id
 
 
+def test_delete_removes_minhash_bands(db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    db_session.add_all(
+        MinHashBand(summary_id=record.id, band=band, bucket=bucket)
+        for band, bucket in enumerate(minhash.bands(minhash.signature("A content")))
+    )
+    db_session.commit()
+
+    summary_repo.delete(db_session, summary_id=record.id)
+
+    assert db_session.query(MinHashBand).count() == 0
+
+
 def test_delete_not_found(db_session):
     record = summary_repo.delete(db_session, summary_id=9999)
 
@@ -329,6 +453,60 @@ def test_reading_time_is_zero_when_no_content(db_session):
     assert record.reading_time_minutes == 0
 
 
+def test_reading_time_from_word_count(db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        content=" word\n" * 500,
+        summary="A summary",
+        model="llama3.2",
+    )
+
+    assert record.word_count == 500
+    assert record.reading_time_minutes == 2
+
+
+def test_update_recounts_words(db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        content="word " * 400,
+        summary="A summary",
+        model="llama3.2",
+    )
+
+    summary_repo.update(
+        db_session,
+        record=record,
+        content="word " * 1000,
+        summary="A summary",
+        length="medium",
+        format="prose",
+        model="llama3.2",
+    )
+    db_session.expire_all()
+
+    assert record.word_count == 1000
+    assert record.reading_time_minutes == 5
+
+
+def test_get_all_does_not_load_content(db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com",
+        content="word " * 400,
+        summary="A summary",
+        model="llama3.2",
+    )
+    db_session.expunge_all()
+
+    item = summary_repo.get_all(db_session, page=1, size=10)["items"][0]
+
+    assert "content" in inspect(item).unloaded
+    assert item.reading_time_minutes == 2
+    assert item.content == "word " * 400  # still loadable on access
+
+
 def test_get_by_url(db_session):
     summary_repo.create(
         db_session,
@@ -388,7 +566,7 @@ def test_get_by_url_since_miss(db_session):
         model="llama3.2",
     )
     # Force the record to look old
-    record.created_at = datetime(2020, 1, 1)
+    record.fetched_at = datetime(2020, 1, 1)
     db_session.commit()
 
     # Cutoff is after the record's timestamp → should not be returned
@@ -396,3 +574,127 @@ def test_get_by_url_since_miss(db_session):
     result = summary_repo.get_by_url(db_session, "https://example.com", since=since)
 
     assert result is None
+
+
+def test_get_by_url_filters_by_variant(db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="A long summary",
+        content="A content",
+        model="llama3.2",
+        length="long",
+    )
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="A short summary",
+        content="A content",
+        model="llama3.2",
+        length="short",
+        format="markdown",
+    )
+
+    result = summary_repo.get_by_url(
+        db_session, "https://example.com", length="short", format="markdown"
+    )
+    missing = summary_repo.get_by_url(
+        db_session, "https://example.com", length="short", format="prose"
+    )
+
+    assert result is not None
+    assert result.id == record.id
+    assert missing is None
+
+
+def create_many(db_session, count):
+    records = [
+        summary_repo.create(
+            db_session,
+            url=f"https://example-{i}.com",
+            summary="A summary",
+            content="A content",
+            model="llama3.2",
+        )
+        for i in range(count)
+    ]
+    # Same created_at throughout, so the order comes from the id tie-break
+    for record in records:
+        record.created_at = datetime(2026, 1, 1)
+    db_session.commit()
+    return records
+
+
+def test_get_page_walks_all_records_forward_and_back(db_session):
+    records = create_many(db_session, 5)
+    newest_first = [r.id for r in reversed(records)]
+
+    seen, cursor, pages = [], None, []
+    while True:
+        result = summary_repo.get_page(db_session, size=2, cursor=cursor)
+        pages.append(result)
+        seen += [item.id for item in result["items"]]
+        if not result["has_next"]:
+            break
+        last = result["items"][-1]
+        cursor = Cursor(last.created_at, last.id)
+
+    assert seen == newest_first
+    assert [p["has_prev"] for p in pages] == [False, True, True]
+
+    first = pages[-1]["items"][0]
+    back = summary_repo.get_page(
+        db_session, size=2, cursor=Cursor(first.created_at, first.id, before=True)
+    )
+    assert [item.id for item in back["items"]] == newest_first[2:4]
+    assert back["has_prev"] is True
+    assert back["has_next"] is True
+
+
+def test_get_page_filters_by_query(db_session):
+    create_many(db_session, 3)
+    summary_repo.create(
+        db_session,
+        url="https://python.org",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+
+    result = summary_repo.get_page(db_session, size=10, q="python")
+
+    assert [item.url for item in result["items"]] == ["https://python.org"]
+    assert summary_repo.count(db_session, q="python") == 1
+
+
+def test_get_page_after_deleted_cursor_record(db_session):
+    records = create_many(db_session, 3)
+    middle = records[1]
+    cursor = Cursor(middle.created_at, middle.id)
+    summary_repo.delete(db_session, summary_id=middle.id)
+
+    result = summary_repo.get_page(db_session, size=10, cursor=cursor)
+
+    assert [item.id for item in result["items"]] == [records[0].id]
+
+
+def test_get_page_with_server_default_timestamps(db_session):
+    # Rows written by SQLite's CURRENT_TIMESTAMP have no fractional seconds
+    for i in range(3):
+        db_session.execute(
+            text(
+                "INSERT INTO summaries (url, canonical_url, summary, model) "
+                "VALUES (:url, :url, 'A summary', 'llama3.2')"
+            ),
+            {"url": f"https://example-{i}.com/"},
+        )
+    db_session.commit()
+
+    first = summary_repo.get_page(db_session, size=1)
+    last = first["items"][0]
+    rest = summary_repo.get_page(
+        db_session, size=10, cursor=Cursor(last.created_at, last.id)
+    )
+
+    assert len(rest["items"]) == 2
+    assert last.id not in [item.id for item in rest["items"]]
@@ -1,5 +1,7 @@
 from unittest.mock import AsyncMock, patch
 
+from app.config import settings
+
 
 def test_health_ok(client):
     with patch("app.services.ollama.check_health", new=AsyncMock(return_value=True)):
@@ -35,3 +37,20 @@ def test_health_ollama_unreachable(client):
     assert data["status"] == "error"
     assert data["db"] == "ok"
     assert data["ollama"] == "unreachable"
+
+
+def test_metrics_reports_summary_cache(client):
+    response = client.get("/health/metrics")
+
+    data = response.json()
+    assert response.status_code == 200
+    assert data["summary_cache"]["hits"] == 0
+    assert data["summary_cache"]["entries"] == 0
+
+
+def test_metrics_reports_extraction_queue(client):
+    response = client.get("/health/metrics")
+
+    data = response.json()["extraction"]
+    assert data["queued"] == 0
+    assert data["workers"] == settings.extraction_workers
@@ -1,5 +1,8 @@
+import asyncio
 import json
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -7,12 +10,16 @@ import pytest
 
 from app.config import settings
 from app.repositories import summary as summary_repo
+from app.services import failures, scraper
+from app.services.scraper import Page
+from app.utils.hashing import content_hash
 
 
 @pytest.mark.parametrize("length", ["short", "medium", "long"])
 def test_post_summarize_success_lengths(client, db_session, length):
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value="article text")
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="the summary")
@@ -84,6 +91,7 @@ def test_get_summarize_history_list_with_query(client, db_session):
     data = response.json()
     assert response.status_code == 200
     assert len(data["items"]) == 1
+    assert data["items"][0]["snippet"] == "A summary"  # matched in the url
     assert data["page"] == 1
     assert data["size"] == 10
     assert data["total"] == 1
@@ -255,7 +263,7 @@ def test_get_summarize_history_id_not_found(client):
 
 def test_post_summarize_scraper_error(client):
     with patch(
-        "app.services.scraper.fetch_text",
+        "app.services.scraper.fetch_page",
         new=AsyncMock(
             side_effect=httpx.HTTPStatusError(
                 "error", request=MagicMock(), response=MagicMock(status_code=404)
@@ -269,7 +277,8 @@ def test_post_summarize_scraper_error(client):
 
 def test_post_summarize_ollama_error(client):
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value="article text")
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
     ):
         with patch(
             "app.services.ollama.summarize",
@@ -280,6 +289,34 @@ def test_post_summarize_ollama_error(client):
     assert response.status_code == 503
 
 
+async def slow_fetch(url: str) -> Page:
+    await asyncio.sleep(1)
+    return Page(f"article text of {url}")
+
+
+def test_concurrent_misses_do_not_exhaust_pool(small_pool_client):
+    # More simultaneous misses than the pool has connections, each slower
+    # than the pool timeout: none may hold a connection while it waits
+    urls = [f"https://example.com/{i}" for i in range(6)]
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(side_effect=slow_fetch)
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            with ThreadPoolExecutor(len(urls)) as executor:
+                responses = list(
+                    executor.map(
+                        lambda url: small_pool_client.post(
+                            "/summarize", json={"url": url}
+                        ),
+                        urls,
+                    )
+                )
+
+    assert [r.status_code for r in responses] == [201] * len(urls)
+
+
 def test_delete_summarize_history_id_success(client, db_session):
     record = summary_repo.create(
         db_session,
@@ -334,7 +371,8 @@ def test_retry_summary_success(client, db_session):
         model="llama3.2",
     )
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value="article text")
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="the summary")
@@ -345,16 +383,88 @@ def test_retry_summary_success(client, db_session):
     assert response.json()["summary"] == "the summary"
     assert response.json()["url"] == "https://example.com"
     record_id = response.json()["id"]
+    # The retry was written through the route's own (async) session
+    db_session.expire_all()
     record = summary_repo.get_by_id(db_session, record_id)
     assert record is not None
     assert record.content == "article text"
 
 
-def test_post_summarize_truncates_long_content(client):
+def test_retry_skips_generation_when_not_modified(client, db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    record.etag = '"v1"'
+    db_session.commit()
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("", '"v1"', None, not_modified=True)),
+    ) as mock_fetch:
+        with patch("app.services.ollama.summarize", new=AsyncMock()) as mock_ollama:
+            response = client.post(f"/summarize/history/{record.id}/retry")
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == "A summary"
+    assert mock_fetch.call_args.kwargs["etag"] == '"v1"'
+    mock_ollama.assert_not_called()
+
+
+def test_retry_skips_generation_when_content_unchanged(client, db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com",
+        summary="A summary",
+        content="article text",
+        model="llama3.2",
+    )
+    record.content_hash = content_hash("article text")
+    record.fetched_at = datetime(2020, 1, 1)
+    db_session.commit()
+    created_at = record.created_at
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text", '"v2"')),
+    ):
+        with patch("app.services.ollama.summarize", new=AsyncMock()) as mock_ollama:
+            response = client.post(f"/summarize/history/{record.id}/retry")
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == "A summary"
+    mock_ollama.assert_not_called()
+    db_session.expire_all()
+    record = summary_repo.get_by_id(db_session, record.id)
+    assert record.etag == '"v2"'
+    # Revalidated, so it counts as fresh again, but keeps its place in history
+    assert record.fetched_at > datetime(2020, 1, 1)
+    assert record.created_at == created_at
+
+
+def test_create_stores_validators_and_hash(client, db_session):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text", '"v1"', "Wed, 01 Jan 2026")),
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            response = client.post("/summarize", json={"url": "https://example.com"})
+
+    record = summary_repo.get_by_id(db_session, response.json()["id"])
+    assert record.etag == '"v1"'
+    assert record.last_modified == "Wed, 01 Jan 2026"
+    assert record.content_hash == content_hash("article text")
+
+
+def test_post_summarize_truncates_long_content(client, monkeypatch):
+    monkeypatch.setattr(settings, "max_content_chars", 50_000)
     long_text = "a" * 100_000
 
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value=long_text)
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page(long_text))
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="the summary")
@@ -365,7 +475,8 @@ def test_post_summarize_truncates_long_content(client):
     assert len(actual_text) == 50_000
 
 
-def test_retry_summarize_truncates_long_content(client, db_session):
+def test_retry_summarize_truncates_long_content(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "max_content_chars", 50_000)
     record = summary_repo.create(
         db_session,
         url="https://example.com",
@@ -376,7 +487,7 @@ def test_retry_summarize_truncates_long_content(client, db_session):
     long_text = "a" * 100_000
 
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value=long_text)
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page(long_text))
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="the summary")
@@ -391,7 +502,9 @@ def test_post_summarize_returns_reading_time(client):
     # 400 words → 2 minutes at 200 wpm
     text = "word " * 400
 
-    with patch("app.services.scraper.fetch_text", new=AsyncMock(return_value=text)):
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page(text))
+    ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
         ):
@@ -452,32 +565,27 @@ def test_export_empty_db(client):
 
 def test_blocked_domain_rejected(client, monkeypatch):
     monkeypatch.setattr(settings, "url_blocklist", "evil.com")
-    with patch("app.schemas.summary.socket.gethostbyname", return_value="1.2.3.4"):
-        response = client.post("/summarize", json={"url": "http://evil.com/page"})
+    response = client.post("/summarize", json={"url": "http://evil.com/page"})
     assert response.status_code == 422
 
 
 def test_allowlist_permits_listed_domain(client, monkeypatch):
     monkeypatch.setattr(settings, "url_allowlist", "allowed.com")
-    with patch("app.schemas.summary.socket.gethostbyname", return_value="1.2.3.4"):
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ):
         with patch(
-            "app.services.scraper.fetch_text", new=AsyncMock(return_value="text")
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
         ):
-            with patch(
-                "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
-            ):
-                response = client.post(
-                    "/summarize", json={"url": "http://allowed.com/page"}
-                )
+            response = client.post(
+                "/summarize", json={"url": "http://allowed.com/page"}
+            )
     assert response.status_code == 201
 
 
 def test_allowlist_rejects_unlisted_domain(client, monkeypatch):
     monkeypatch.setattr(settings, "url_allowlist", "allowed.com")
-    with patch("app.schemas.summary.socket.gethostbyname", return_value="1.2.3.4"):
-        response = client.post(
-            "/summarize", json={"url": "http://not-allowed.com/page"}
-        )
+    response = client.post("/summarize", json={"url": "http://not-allowed.com/page"})
     assert response.status_code == 422
 
 
@@ -487,6 +595,23 @@ def test_url_validation_localhost(client):
     assert response.status_code == 422
 
 
+def test_url_validation_private_ip(client):
+    response = client.post("/summarize", json={"url": "http://10.0.0.1/page"})
+
+    assert response.status_code == 422
+
+
+def test_host_resolving_to_private_address_rejected(client, monkeypatch):
+    async def lookup(host):
+        return ["192.168.1.10"]
+
+    monkeypatch.setattr("app.services.dns._lookup", lookup)
+    response = client.post("/summarize", json={"url": "http://intranet.example/"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "URL must point to a public address"
+
+
 def test_url_validation_localhost_ip(client):
     response = client.post("/summarize", json={"url": "http://127.0.0.1/page"})
 
@@ -521,7 +646,7 @@ def test_request_with_correct_key_succeeds(client, monkeypatch):
     monkeypatch.setattr(settings, "api_key", "secret")
 
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value="some text")
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("some text"))
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
@@ -538,7 +663,7 @@ def test_request_with_correct_key_succeeds(client, monkeypatch):
 def test_auth_disabled_when_key_is_empty(client, monkeypatch):
     monkeypatch.setattr(settings, "api_key", None)
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value="some text")
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("some text"))
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
@@ -550,7 +675,7 @@ def test_auth_disabled_when_key_is_empty(client, monkeypatch):
 
 def test_batch_summarize_all_success(client):
     with patch(
-        "app.services.scraper.fetch_text", new=AsyncMock(return_value="some text")
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("some text"))
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
@@ -569,8 +694,8 @@ def test_batch_summarize_partial_failure(client):
 
 def test_batch_exceeds_max_size_returns_422(client):
     with patch(
-        "app.services.scraper.fetch_text",
-        new=AsyncMock(side_effect=["some text", httpx.RequestError("timeout")]),
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=[Page("some text"), httpx.RequestError("timeout")]),
     ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
@@ -593,7 +718,9 @@ def test_batch_exceeds_max_size_returns_422(client):
 
 
 def test_post_summarize_cache_miss(client):
-    with patch("app.services.scraper.fetch_text", new=AsyncMock(return_value="text")):
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
         ):
@@ -612,10 +739,12 @@ def test_post_summarize_cache_miss_outdated(client, db_session):
         model="llama3.2",
     )
     # Force the record to look old
-    record.created_at = datetime(2020, 1, 1)
+    record.fetched_at = datetime(2020, 1, 1)
     db_session.commit()
 
-    with patch("app.services.scraper.fetch_text", new=AsyncMock(return_value="text")):
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ):
         with patch(
             "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
         ):
@@ -639,3 +768,637 @@ def test_post_summarize_cache_hit(client, db_session):
     assert response.status_code == 200
     assert response.headers["x-cache"] == "HIT"
     assert response.json()["summary"] == "A summary"
+
+
+def test_post_summarize_memory_cache_hit_skips_db(client):
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            client.post("/summarize", json={"url": "https://example.com/"})
+
+    with patch(
+        "app.repositories.async_summary.get_by_url", new=AsyncMock()
+    ) as mock_get_by_url:
+        response = client.post("/summarize", json={"url": "https://example.com/"})
+
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "HIT"
+    assert response.json()["summary"] == "summary"
+    mock_get_by_url.assert_not_called()
+
+
+def test_post_summarize_cache_is_variant_aware(client, db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com/",
+        summary="A markdown summary",
+        content="A content",
+        model="llama3.2",
+        length="medium",
+        format="markdown",
+    )
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="prose")
+        ):
+            response = client.post(
+                "/summarize",
+                json={"url": "https://example.com/", "format": "prose"},
+            )
+
+    assert response.status_code == 201
+    assert response.headers["x-cache"] == "MISS"
+    assert response.json()["summary"] == "prose"
+
+
+def test_post_summarize_derives_short_from_long_without_scraping(client, db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com/",
+        summary="A long summary",
+        content="A content",
+        model="llama3.2",
+        length="long",
+    )
+    with patch("app.services.scraper.fetch_page", new=AsyncMock()) as mock_fetch:
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="short")
+        ) as mock_ollama:
+            response = client.post(
+                "/summarize", json={"url": "https://example.com/", "length": "short"}
+            )
+
+    assert response.status_code == 201
+    assert response.json()["summary"] == "short"
+    mock_fetch.assert_not_called()
+    assert mock_ollama.call_args.kwargs["text"] == "A long summary"
+    assert mock_ollama.call_args.kwargs["length"] == "short"
+
+
+def test_post_summarize_derives_from_stored_content(client, db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com/",
+        summary="A short summary",
+        content="A content",
+        model="llama3.2",
+        length="short",
+    )
+    with patch("app.services.scraper.fetch_page", new=AsyncMock()) as mock_fetch:
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="long")
+        ) as mock_ollama:
+            response = client.post(
+                "/summarize", json={"url": "https://example.com/", "length": "long"}
+            )
+
+    assert response.status_code == 201
+    mock_fetch.assert_not_called()
+    assert mock_ollama.call_args.kwargs["text"] == "A content"
+
+
+async def fake_stream(text, length, format):
+    for token in ["The ", "stream", "ed summary"]:
+        yield token
+
+
+def test_stream_summary_emits_tokens_and_persists(client, db_session):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
+    ):
+        with patch("app.services.ollama.summarize_stream", new=fake_stream):
+            response = client.post(
+                "/summarize/stream", json={"url": "https://example.com"}
+            )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["x-cache"] == "MISS"
+    events = [e for e in response.text.split("\n\n") if e]
+    assert events[0] == 'event: token\ndata: {"token": "The "}'
+    assert events[-1].startswith("event: done")
+    done = json.loads(events[-1].split("data: ", 1)[1])
+    assert done["summary"] == "The streamed summary"
+    record = summary_repo.get_by_id(db_session, done["id"])
+    assert record is not None
+    assert record.content == "article text"
+
+
+async def slow_stream(text, length, format):
+    for token in ["The ", "stream", "ed summary"]:
+        await asyncio.sleep(0.4)
+        yield token
+
+
+def test_concurrent_streams_do_not_exhaust_pool(small_pool_client):
+    urls = [f"https://example.com/{i}" for i in range(6)]
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(side_effect=slow_fetch)
+    ):
+        with patch("app.services.ollama.summarize_stream", new=slow_stream):
+            with ThreadPoolExecutor(len(urls)) as executor:
+                responses = list(
+                    executor.map(
+                        lambda url: small_pool_client.post(
+                            "/summarize/stream", json={"url": url}
+                        ),
+                        urls,
+                    )
+                )
+
+    for response in responses:
+        events = [e for e in response.text.split("\n\n") if e]
+        assert events[-1].startswith("event: done")
+
+
+def test_stream_summary_cache_hit(client, db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com/",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    response = client.post("/summarize/stream", json={"url": "https://example.com/"})
+
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "HIT"
+    assert response.text.startswith("event: done")
+    assert '"summary": "A summary"' in response.text
+
+
+def test_stream_summary_ollama_error_emits_error_event(client, db_session):
+    async def failing_stream(text, length, format):
+        yield "partial"
+        raise httpx.RequestError("connection lost")
+
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
+    ):
+        with patch("app.services.ollama.summarize_stream", new=failing_stream):
+            response = client.post(
+                "/summarize/stream", json={"url": "https://example.com"}
+            )
+
+    assert "event: error" in response.text
+    assert summary_repo.get_all(db_session)["total"] == 0
+
+
+def test_stream_summary_ollama_error_line_is_not_persisted(client, db_session):
+    lines = [
+        json.dumps({"response": "partial", "done": False}),
+        json.dumps({"error": "model runner has unexpectedly stopped"}),
+    ]
+
+    async def aiter_lines():
+        for line in lines:
+            yield line
+
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.aiter_lines = aiter_lines
+    mock_stream = MagicMock()
+    mock_stream.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_stream.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
+    ):
+        with patch("httpx.AsyncClient.stream", new=mock_stream):
+            response = client.post(
+                "/summarize/stream", json={"url": "https://example.com"}
+            )
+
+    assert "event: error" in response.text
+    assert "event: done" not in response.text
+    assert summary_repo.get_all(db_session)["total"] == 0
+
+
+def wait_for_job(client, job_id, attempts=100):
+    for _ in range(attempts):
+        data = client.get(f"/summarize/jobs/{job_id}").json()
+        if data["status"] in ("completed", "failed"):
+            return data
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_create_job_returns_202_and_completes(client):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=[Page("some text"), httpx.RequestError("timeout")]),
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            response = client.post(
+                "/summarize/jobs",
+                json={"urls": ["https://example-1.com", "https://example-2.com"]},
+            )
+            assert response.status_code == 202
+            job = response.json()
+            assert response.headers["location"] == f"/summarize/jobs/{job['id']}"
+            assert job["total"] == 2
+            data = wait_for_job(client, job["id"])
+
+    assert data["status"] == "completed"
+    assert data["completed"] == 2
+    results = sorted(data["results"], key=lambda r: r["url"])
+    assert results[0]["success"] is True
+    assert results[0]["result"]["summary"] == "summary"
+    assert results[1]["success"] is False
+
+
+def test_get_job_not_found(client):
+    response = client.get("/summarize/jobs/unknown")
+
+    assert response.status_code == 404
+
+
+def test_batch_size_limit_is_configurable(client, monkeypatch):
+    monkeypatch.setattr(settings, "max_batch_size", 2)
+
+    response = client.post(
+        "/summarize/batch",
+        json={"urls": [f"https://example-{i}.com" for i in range(3)]},
+    )
+
+    assert response.status_code == 422
+    assert "cannot exceed 2 URLs" in response.text
+
+
+def test_non_html_url_returns_422(client):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(
+            side_effect=scraper.UnsupportedContentError(
+                "URL must point to an HTML page, got video/mp4"
+            )
+        ),
+    ):
+        response = client.post("/summarize", json={"url": "https://example.com/v"})
+
+    assert response.status_code == 422
+    assert "video/mp4" in response.json()["detail"]
+
+
+def test_redirect_error_returns_422(client):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=scraper.RedirectError("Too many redirects")),
+    ):
+        response = client.post("/summarize", json={"url": "https://example.com/"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Too many redirects"
+
+
+def test_tracking_param_variant_hits_cache(client, db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com/article",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+
+    response = client.post(
+        "/summarize",
+        json={"url": "https://www.example.com/article/?utm_source=feed#top"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "HIT"
+    assert response.json()["summary"] == "A summary"
+
+
+def test_redirected_url_is_aliased_to_final_url(client):
+    page = Page("text", url="https://example.com/article?id=1")
+    with (
+        patch("app.services.scraper.fetch_page", new=AsyncMock(return_value=page)),
+        patch("app.services.ollama.summarize", new=AsyncMock(return_value="summary")),
+    ):
+        first = client.post("/summarize", json={"url": "https://short.example/x"})
+
+    with patch("app.services.scraper.fetch_page", new=AsyncMock()) as mock_fetch:
+        via_alias = client.post("/summarize", json={"url": "https://short.example/x"})
+        via_final = client.post(
+            "/summarize", json={"url": "https://example.com/article?id=1"}
+        )
+
+    assert first.status_code == 201
+    assert via_alias.headers["x-cache"] == "HIT"
+    assert via_final.headers["x-cache"] == "HIT"
+    assert via_alias.json()["id"] == via_final.json()["id"] == first.json()["id"]
+    mock_fetch.assert_not_called()
+
+
+def test_variant_derived_from_redirected_source_is_stored_under_final_url(client):
+    page = Page("text", url="https://example.com/article")
+    with (
+        patch("app.services.scraper.fetch_page", new=AsyncMock(return_value=page)),
+        patch("app.services.ollama.summarize", new=AsyncMock(return_value="long")),
+    ):
+        source = client.post(
+            "/summarize", json={"url": "http://example.com/article", "length": "long"}
+        )
+
+    with (
+        patch("app.services.scraper.fetch_page", new=AsyncMock()) as mock_fetch,
+        patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="short")
+        ) as mock_ollama,
+    ):
+        responses = [
+            client.post(
+                "/summarize",
+                json={"url": "http://example.com/article", "length": "short"},
+            )
+            for _ in range(3)
+        ]
+
+    assert source.status_code == 201
+    assert [r.headers["x-cache"] for r in responses] == ["MISS", "HIT", "HIT"]
+    assert len({r.json()["id"] for r in responses}) == 1
+    mock_ollama.assert_awaited_once()
+    mock_fetch.assert_not_called()
+
+
+def test_canonical_link_does_not_claim_other_path(client, db_session):
+    page_a = Page(
+        "text a",
+        url="https://medium.com/@a/post",
+        canonical_url="https://medium.com/@b/post",
+    )
+    with (
+        patch("app.services.scraper.fetch_page", new=AsyncMock(return_value=page_a)),
+        patch("app.services.ollama.summarize", new=AsyncMock(return_value="by a")),
+    ):
+        first = client.post("/summarize", json={"url": "https://medium.com/@a/post"})
+
+    page_b = Page("text b", url="https://medium.com/@b/post")
+    with (
+        patch("app.services.scraper.fetch_page", new=AsyncMock(return_value=page_b)),
+        patch("app.services.ollama.summarize", new=AsyncMock(return_value="by b")),
+    ):
+        other = client.post("/summarize", json={"url": "https://medium.com/@b/post"})
+
+    record = summary_repo.get_by_id(db_session, first.json()["id"])
+    assert record is not None
+    assert record.canonical_url == "https://medium.com/@a/post"
+    assert other.headers["x-cache"] == "MISS"
+    assert other.json()["summary"] == "by b"
+
+
+def test_canonical_link_reuses_summary_of_canonical_page(client, db_session):
+    summary_repo.create(
+        db_session,
+        url="https://example.com/story",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    page = Page(
+        "amp text",
+        url="https://example.com/story/amp",
+        canonical_url="https://example.com/story",
+    )
+    with (
+        patch("app.services.scraper.fetch_page", new=AsyncMock(return_value=page)),
+        patch("app.services.ollama.summarize", new=AsyncMock()) as mock_ollama,
+    ):
+        response = client.post(
+            "/summarize", json={"url": "https://example.com/story/amp"}
+        )
+
+    assert response.status_code == 201
+    assert response.json()["summary"] == "A summary"
+    record = summary_repo.get_by_id(db_session, response.json()["id"])
+    assert record is not None
+    assert record.canonical_url == "https://example.com/story/amp"
+    mock_ollama.assert_not_called()
+
+
+def test_post_summarize_reuses_summary_of_identical_content(client, db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com/story",
+        summary="A summary",
+        content="article text",
+        model="llama3.2",
+    )
+    record.content_hash = content_hash("article text")
+    db_session.commit()
+    with (
+        patch(
+            "app.services.scraper.fetch_page",
+            new=AsyncMock(return_value=Page("article text")),
+        ),
+        patch("app.services.ollama.summarize", new=AsyncMock()) as mock_ollama,
+    ):
+        response = client.post("/summarize", json={"url": "https://mirror.com/story"})
+
+    assert response.status_code == 201
+    assert response.json()["summary"] == "A summary"
+    assert response.json()["url"] == "https://mirror.com/story"
+    mock_ollama.assert_not_called()
+
+
+def test_stream_summary_reuses_summary_of_identical_content(client, db_session):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com/story",
+        summary="A summary",
+        content="article text",
+        model="llama3.2",
+    )
+    record.content_hash = content_hash("article text")
+    db_session.commit()
+    with (
+        patch(
+            "app.services.scraper.fetch_page",
+            new=AsyncMock(return_value=Page("article text")),
+        ),
+        patch("app.services.ollama.summarize_stream") as mock_stream,
+    ):
+        response = client.post(
+            "/summarize/stream", json={"url": "https://mirror.com/story"}
+        )
+
+    assert response.status_code == 200
+    assert "event: token" not in response.text
+    assert '"summary": "A summary"' in response.text
+    mock_stream.assert_not_called()
+
+
+def test_backed_off_host_returns_503_with_retry_after(client):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=failures.HostBackoffError("example.com", 7.2)),
+    ):
+        response = client.post("/summarize", json={"url": "https://example.com/"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "8"
+    assert "example.com" in response.json()["detail"]
+
+
+def make_expired(db_session, minutes_ago):
+    record = summary_repo.create(
+        db_session,
+        url="https://example.com/",
+        summary="A summary",
+        content="A content",
+        model="llama3.2",
+    )
+    record.fetched_at = datetime.now(UTC).replace(tzinfo=None) - timedelta(
+        minutes=minutes_ago
+    )
+    db_session.commit()
+    return record
+
+
+def test_post_summarize_serves_stale_and_refreshes(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "cache_stale_minutes", 30)
+    record = make_expired(db_session, settings.cache_ttl_minutes + 10)
+
+    with (
+        patch("app.services.summarizer.refresh_in_background") as mock_refresh,
+        patch("app.services.scraper.fetch_page", new=AsyncMock()) as mock_fetch,
+    ):
+        response = client.post("/summarize", json={"url": "https://example.com/"})
+
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "STALE"
+    assert response.json()["summary"] == "A summary"
+    mock_refresh.assert_called_once()
+    assert mock_refresh.call_args.args[1] == record.id
+    mock_fetch.assert_not_called()
+
+
+def test_post_summarize_beyond_stale_window_regenerates(
+    client, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "cache_stale_minutes", 30)
+    make_expired(db_session, settings.cache_ttl_minutes + 40)
+
+    with (
+        patch(
+            "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+        ),
+        patch("app.services.ollama.summarize", new=AsyncMock(return_value="new")),
+        patch("app.services.summarizer.refresh_in_background") as mock_refresh,
+    ):
+        response = client.post("/summarize", json={"url": "https://example.com/"})
+
+    assert response.status_code == 201
+    assert response.headers["x-cache"] == "MISS"
+    mock_refresh.assert_not_called()
+
+
+def test_stream_summary_serves_stale(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "cache_stale_minutes", 30)
+    make_expired(db_session, settings.cache_ttl_minutes + 10)
+
+    with patch("app.services.summarizer.refresh_in_background") as mock_refresh:
+        response = client.post(
+            "/summarize/stream", json={"url": "https://example.com/"}
+        )
+
+    assert response.headers["x-cache"] == "STALE"
+    assert "event: done" in response.text
+    mock_refresh.assert_called_once()
+
+
+def test_history_cursor_pagination_walks_forward_and_back(client, db_session):
+    ids = [
+        summary_repo.create(
+            db_session,
+            url=f"https://example-{i}.com",
+            summary="A summary",
+            content="A content",
+            model="llama3.2",
+        ).id
+        for i in range(5)
+    ]
+
+    first = client.get("/summarize/history?size=2&cursor=").json()
+    second = client.get(first["next"]).json()
+    third = client.get(second["next"]).json()
+    back = client.get(third["prev"]).json()
+
+    assert first["page"] is None
+    assert first["total"] is None
+    assert first["prev"] is None
+    assert first["next"].startswith("/summarize/history?size=2&cursor=")
+    pages = [first, second, third]
+    assert [item["id"] for page in pages for item in page["items"]] == ids[::-1]
+    assert third["next"] is None
+    assert [item["id"] for item in back["items"]] == [
+        item["id"] for item in second["items"]
+    ]
+
+
+def test_history_cursor_survives_revalidated_item(client, db_session):
+    records = [
+        summary_repo.create(
+            db_session,
+            url=f"https://example-{i}.com/",
+            summary="A summary",
+            content="article text",
+            model="llama3.2",
+        )
+        for i in range(6)
+    ]
+    for record in records:
+        record.content_hash = content_hash("article text")
+    db_session.commit()
+    first = client.get("/summarize/history?size=2&cursor=").json()
+    # The last item of the page is found unchanged on retry
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text", '"v2"')),
+    ):
+        retry = client.post(f"/summarize/history/{first['items'][-1]['id']}/retry")
+
+    second = client.get(first["next"]).json()
+
+    assert retry.status_code == 200
+    assert [item["id"] for item in second["items"]] == [
+        records[3].id,
+        records[2].id,
+    ]
+
+
+def test_history_cursor_pagination_with_query_and_total(client, db_session):
+    for url in ("https://python.org", "https://python.com", "https://example.com"):
+        summary_repo.create(
+            db_session,
+            url=url,
+            summary="A summary",
+            content="A content",
+            model="llama3.2",
+        )
+
+    data = client.get(
+        "/summarize/history?size=1&q=python&cursor=&with_total=true"
+    ).json()
+
+    assert data["total"] == 2
+    assert data["next"].startswith("/summarize/history?size=1&q=python&cursor=")
+    assert client.get(data["next"]).json()["next"] is None
+
+
+def test_history_invalid_cursor_returns_400(client):
+    response = client.get("/summarize/history?cursor=garbage")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,128 @@
+import asyncio
+
+import httpcore
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import dns
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls: list[str] = []
+
+    async def lookup(host):
+        calls.append(host)
+        await asyncio.sleep(0.01)
+        if host == "missing.example":
+            raise OSError("Name or service not known")
+        return ["93.184.216.34", "93.184.216.35"]
+
+    monkeypatch.setattr(dns, "_lookup", lookup)
+    return calls
+
+
+async def test_resolve_caches_lookups(lookups):
+    first = await dns.resolve("example.com")
+    second = await dns.resolve("example.com")
+
+    assert first == second == ["93.184.216.34", "93.184.216.35"]
+    assert lookups == ["example.com"]
+    assert dns.dns_cache.stats()["hits"] == 1
+
+
+async def test_concurrent_lookups_are_coalesced(lookups):
+    await asyncio.gather(*[dns.resolve("example.com") for _ in range(10)])
+
+    assert lookups == ["example.com"]
+
+
+async def test_ip_literal_is_not_looked_up(lookups):
+    assert await dns.resolve("1.2.3.4") == ["1.2.3.4"]
+    assert await dns.resolve("[2606:4700::1]") == ["2606:4700::1"]
+    assert lookups == []
+
+
+async def test_failed_lookup_is_negatively_cached(lookups):
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await dns.resolve("missing.example")
+
+    assert lookups == ["missing.example"]
+
+
+async def test_expired_entry_is_looked_up_again(lookups, monkeypatch):
+    monkeypatch.setattr(settings, "dns_cache_ttl_seconds", 0)
+    await dns.resolve("example.com")
+    await dns.resolve("example.com")
+
+    assert lookups == ["example.com", "example.com"]
+
+
+async def test_cache_evicts_least_recently_used():
+    cache = dns.DNSCache(max_entries=2)
+    cache.put("a", ["1.1.1.1"], 60)
+    cache.put("b", ["1.1.1.2"], 60)
+    cache.get("a")
+    cache.put("c", ["1.1.1.3"], 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+async def test_resolve_public_rejects_private_address(monkeypatch):
+    async def lookup(host):
+        return ["93.184.216.34", "10.0.0.5"]
+
+    monkeypatch.setattr(dns, "_lookup", lookup)
+    with pytest.raises(dns.BlockedAddressError):
+        await dns.resolve_public("mixed.example")
+
+
+class RecordingBackend(httpcore.AsyncMockBackend):
+    def __init__(self) -> None:
+        super().__init__(
+            [b"HTTP/1.1 200 OK\r\n", b"Content-Length: 2\r\n", b"\r\n", b"ok"]
+        )
+        self.connections: list[tuple[str, int]] = []
+
+    async def connect_tcp(self, host, port, *args, **kwargs):
+        self.connections.append((host, port))
+        return await super().connect_tcp(host, port, *args, **kwargs)
+
+
+async def test_pinned_transport_connects_to_resolved_address(lookups):
+    backend = RecordingBackend()
+    transport = dns.PinnedTransport(httpx.Limits(), backend=backend)
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("http://example.com:8080/a")
+
+    assert response.text == "ok"
+    assert response.request.headers["host"] == "example.com:8080"
+    assert backend.connections == [("93.184.216.34", 8080)]
+
+
+async def test_pinned_transport_pools_per_host_name(lookups):
+    backend = RecordingBackend()
+    transport = dns.PinnedTransport(httpx.Limits(), backend=backend)
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("http://a.example/")
+        await client.get("http://b.example/")
+
+    # Same address, but one connection per host name
+    assert backend.connections == [("93.184.216.34", 80), ("93.184.216.34", 80)]
+
+
+async def test_pinned_transport_rejects_private_address(monkeypatch):
+    async def lookup(host):
+        return ["10.0.0.5"]
+
+    monkeypatch.setattr(dns, "_lookup", lookup)
+    backend = RecordingBackend()
+    transport = dns.PinnedTransport(httpx.Limits(), backend=backend)
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(dns.BlockedAddressError):
+            await client.get("http://intranet.example/")
+
+    assert backend.connections == []
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.services import extractors
+
+CORPUS = Path(__file__).parents[2] / "benchmarks" / "corpus"
+
+
+@pytest.fixture(params=sorted(extractors.EXTRACTORS))
+def extractor(request):
+    return extractors.get_extractor(request.param)
+
+
+def test_returns_plain_text(extractor):
+    html = "<html><body><p>Hello <b>world</b></p></body></html>"
+
+    assert extractor.extract(html) == "Hello world"
+
+
+def test_strips_script_style_and_comments(extractor):
+    html = """<html><head><style>body{}</style></head>
+    <body><script>alert(1)</script><!-- hidden --><p>Real content</p></body></html>"""
+
+    assert extractor.extract(html) == "Real content"
+
+
+def test_keeps_text_after_skipped_tags(extractor):
+    html = "<div><script>x()</script>after <i>script</i></div>"
+
+    assert extractor.extract(html) == "after script"
+
+
+def test_decodes_entities(extractor):
+    assert extractor.extract("<p>Fish &amp; chips&nbsp;today</p>") == (
+        "Fish & chips\xa0today"
+    )
+
+
+def test_empty_document(extractor):
+    assert extractor.extract("") == ""
+
+
+def test_lxml_falls_back_on_unparseable_input():
+    html = '<?xml version="1.0" encoding="utf-8"?><html><p>Hi</p></html>'
+
+    assert extractors.LxmlExtractor().extract(html) == "Hi"
+
+
+@pytest.mark.parametrize("page", sorted(CORPUS.glob("*.html")), ids=lambda p: p.stem)
+def test_backends_agree_on_corpus(page):
+    html = page.read_text(encoding="utf-8")
+
+    assert extractors.LxmlExtractor().extract(html) == (
+        extractors.SoupExtractor().extract(html)
+    )
+
+
+def test_default_backend_from_settings(monkeypatch):
+    assert extractors.get_extractor().name == "lxml"
+    monkeypatch.setattr(settings, "html_extractor", "bs4")
+    assert extractors.get_extractor().name == "bs4"
+
+
+def test_main_mode_keeps_article_only():
+    paragraph = "Article prose with enough words, commas, and detail to score. " * 5
+    html = f"""<html><body><nav><a href="/">Home</a> <a href="/x">Menu</a></nav>
+    <article><p>{paragraph}</p><p>{paragraph}</p></article>
+    <footer>Footer text</footer></body></html>"""
+
+    extraction = extractors.extract_document(html.encode(), "utf-8", "lxml", "main")
+
+    assert "Home" not in extraction.text
+    assert "Footer" not in extraction.text
+    assert extraction.full_chars > len(extraction.text)
+
+
+def test_main_mode_falls_back_to_full_text():
+    extraction = extractors.extract_document(
+        b"<p>Just a short note</p>", "utf-8", "lxml", "main"
+    )
+
+    assert extraction.text == "Just a short note"
+
+
+def test_full_mode_keeps_everything():
+    html = b"<nav>Menu</nav><p>Body</p>"
+
+    extraction = extractors.extract_document(html, "utf-8", "bs4", "full")
+
+    assert extraction == ("Menu Body", 9, None)
@@ -0,0 +1,110 @@
+import httpx
+import pytest
+
+from app.services import dns, failures
+from app.services.failures import FailureCache, HostBackoffError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable time.monotonic for the failure cache."""
+    now = [1000.0]
+    monkeypatch.setattr(failures.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache():
+    return FailureCache(
+        ttl=60, max_entries=100, backoff_threshold=2, backoff_base=5, backoff_max=20
+    )
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com/")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_failed_url_raises_cached_error_until_ttl(cache, clock):
+    error = status_error(404)
+    cache.record_failure("https://example.com/a", error)
+
+    with pytest.raises(httpx.HTTPStatusError) as raised:
+        cache.check("https://www.example.com/a?utm_source=x")
+    assert str(raised.value) == str(error)
+    assert raised.value.response.status_code == 404
+
+    clock[0] += 61
+    cache.check("https://example.com/a")
+    assert cache.stats()["hits"] == 1
+
+
+def test_each_hit_raises_a_new_instance(cache, clock):
+    cache.record_failure("https://example.com/a", httpx.ConnectError("refused"))
+
+    raised = []
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError, match="refused") as info:
+            cache.check("https://example.com/a")
+        raised.append(info.value)
+
+    assert raised[0] is not raised[1]
+
+
+def test_other_urls_of_host_unaffected_by_url_failures(cache, clock):
+    for _ in range(5):
+        cache.record_failure("https://example.com/a", status_error(404))
+
+    cache.check("https://example.com/b")
+
+
+def test_blocked_address_is_cached(cache, clock):
+    cache.record_failure("https://internal.example/", dns.BlockedAddressError("x"))
+
+    with pytest.raises(dns.BlockedAddressError):
+        cache.check("https://internal.example/")
+
+
+def test_host_backoff_grows_exponentially_and_is_capped(cache, clock):
+    cache.record_failure("https://example.com/1", httpx.ReadTimeout("timeout"))
+    cache.check("https://example.com/other")  # below the threshold
+
+    delays = []
+    for i in range(2, 6):
+        cache.record_failure(f"https://example.com/{i}", httpx.ReadTimeout("timeout"))
+        with pytest.raises(HostBackoffError) as raised:
+            cache.check("https://example.com/other")
+        delays.append(raised.value.retry_after)
+        clock[0] += raised.value.retry_after
+
+    assert delays == [5, 10, 20, 20]
+    cache.check("https://example.com/other")
+
+
+def test_success_resets_host_backoff(cache, clock):
+    for i in range(3):
+        cache.record_failure(f"https://example.com/{i}", status_error(503))
+
+    cache.record_success("https://example.com/ok")
+
+    cache.check("https://example.com/other")
+
+
+def test_zero_ttl_disables_url_cache(clock):
+    cache = FailureCache(
+        ttl=0, max_entries=10, backoff_threshold=5, backoff_base=1, backoff_max=1
+    )
+    cache.record_failure("https://example.com/", status_error(404))
+
+    cache.check("https://example.com/")
+
+
+def test_oldest_failures_are_evicted(cache, clock):
+    cache.max_entries = 2
+    for i in range(3):
+        cache.record_failure(f"https://example.com/{i}", status_error(404))
+
+    cache.check("https://example.com/0")
+    with pytest.raises(httpx.HTTPStatusError):
+        cache.check("https://example.com/2")
@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.repositories import job as job_repo
+from app.services import jobs
+from app.services.scraper import Page
+from tests.conftest import DB_PATH, TestingAsyncSessionLocal
+
+
+async def test_run_skips_urls_already_processed(async_db_session):
+    job = await job_repo.create(
+        async_db_session, urls=["https://done.com", "https://todo.com"]
+    )
+    await job_repo.add_result(
+        async_db_session, job.id, 0, {"url": "https://done.com", "success": True}
+    )
+    job_id = job.id
+
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ) as mock_fetch:
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            await jobs.run(job_id, TestingAsyncSessionLocal)
+
+    async_db_session.expire_all()
+    job = await job_repo.get_by_id(async_db_session, job_id)
+    assert job is not None
+    assert job.status == "completed"
+    assert job.completed == 2
+    mock_fetch.assert_awaited_once_with("https://todo.com")
+
+
+async def test_run_posts_to_callback(async_db_session):
+    job = await job_repo.create(
+        async_db_session,
+        urls=["https://example.com"],
+        callback_url="https://hooks.example.com/done",
+    )
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            with patch(
+                "httpx.AsyncClient.post", new=AsyncMock(return_value=mock_response)
+            ) as mock_post:
+                await jobs.run(job.id, TestingAsyncSessionLocal)
+
+    args, kwargs = mock_post.call_args
+    assert args[0] == "https://hooks.example.com/done"
+    assert kwargs["json"]["status"] == "completed"
+    assert kwargs["json"]["completed"] == 1
+
+
+async def test_resume_restarts_unfinished_jobs(async_db_session):
+    job = await job_repo.create(async_db_session, urls=["https://example.com"])
+
+    with patch("app.services.jobs.start") as mock_start:
+        await jobs.resume(TestingAsyncSessionLocal)
+
+    mock_start.assert_called_once_with(job.id, TestingAsyncSessionLocal)
+
+
+async def test_run_skips_job_claimed_by_live_worker(async_db_session):
+    job = await job_repo.create(async_db_session, urls=["https://example.com"])
+    await job_repo.claim(async_db_session, job.id, "other-worker", datetime.now())
+
+    with patch("app.services.scraper.fetch_page", new=AsyncMock()) as mock_fetch:
+        await jobs.run(job.id, TestingAsyncSessionLocal)
+
+    await async_db_session.refresh(job)
+    assert job.owner == "other-worker"
+    assert job.completed == 0
+    mock_fetch.assert_not_called()
+
+
+async def test_concurrent_runs_process_each_url_once(async_db_session):
+    job = await job_repo.create(
+        async_db_session, urls=["https://a.com", "https://b.com"]
+    )
+    job_id = job.id
+
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(return_value=Page("text"))
+    ) as mock_fetch:
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            await asyncio.gather(
+                *[jobs.run(job_id, TestingAsyncSessionLocal) for _ in range(3)]
+            )
+
+    async_db_session.expire_all()
+    reloaded = await job_repo.get_by_id(async_db_session, job_id)
+    assert reloaded is not None
+    assert reloaded.status == "completed"
+    assert reloaded.completed == reloaded.total == 2
+    assert mock_fetch.await_count == 2
+
+
+async def slow_fetch(url: str) -> Page:
+    await asyncio.sleep(1)
+    return Page(f"text of {url}")
+
+
+async def test_concurrent_jobs_do_not_exhaust_pool(async_db_session):
+    # More jobs than the pool has connections, each URL slower than the pool
+    # timeout: no job may hold a connection while its URLs are summarized
+    pooled_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{DB_PATH}", pool_size=2, max_overflow=0, pool_timeout=0.5
+    )
+    session_factory = async_sessionmaker(
+        pooled_engine, autoflush=False, expire_on_commit=False
+    )
+    job_ids = [
+        (await job_repo.create(async_db_session, urls=[f"https://{i}.example"])).id
+        for i in range(4)
+    ]
+
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(side_effect=slow_fetch)
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            await asyncio.gather(*[jobs.run(id, session_factory) for id in job_ids])
+    await pooled_engine.dispose()
+
+    for job_id in job_ids:
+        async_db_session.expire_all()
+        job = await job_repo.get_by_id(async_db_session, job_id)
+        assert job is not None
+        assert job.status == "completed"
+        assert job.results[0]["success"]
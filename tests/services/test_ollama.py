@@ -1,3 +1,4 @@
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -76,3 +77,130 @@ async def test_not_healthy():
         result = await ollama.check_health()
 
         assert result is False
+
+
+def mock_stream_of(lines):
+    async def aiter_lines():
+        for line in lines:
+            yield line
+
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.aiter_lines = aiter_lines
+    mock_stream = MagicMock()
+    mock_stream.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_stream.return_value.__aexit__ = AsyncMock(return_value=None)
+    return mock_stream
+
+
+async def test_summarize_stream_yields_tokens():
+    lines = [
+        json.dumps({"response": "Hello", "done": False}),
+        "",
+        json.dumps({"response": " world", "done": False}),
+        json.dumps({"response": "", "done": True}),
+    ]
+    mock_stream = mock_stream_of(lines)
+
+    with patch("httpx.AsyncClient.stream", new=mock_stream):
+        tokens = [t async for t in ollama.summarize_stream("article text")]
+
+    assert tokens == ["Hello", " world"]
+    _, kwargs = mock_stream.call_args
+    assert kwargs["json"]["stream"] is True
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        [
+            json.dumps({"response": "Hello", "done": False}),
+            json.dumps({"error": "model runner has unexpectedly stopped"}),
+        ],
+        [json.dumps({"response": "Hello", "done": False})],
+        [json.dumps({"response": " ", "done": False}), json.dumps({"done": True})],
+    ],
+    ids=["error-line", "no-done", "empty"],
+)
+async def test_summarize_stream_raises_on_failed_generation(lines):
+    with patch("httpx.AsyncClient.stream", new=mock_stream_of(lines)):
+        with pytest.raises(ollama.GenerationError):
+            async for _ in ollama.summarize_stream("article text"):
+                pass
+
+
+async def test_summarize_raises_on_empty_summary():
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"response": "  \n"}
+
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=mock_response)):
+        with pytest.raises(ollama.GenerationError):
+            await ollama.summarize("article text")
+
+
+def test_split_text_respects_budget_and_sentences():
+    text = " ".join(f"Sentence number {i} is here." for i in range(200))
+
+    chunks = ollama.split_text(text, max_tokens=100)
+
+    assert len(chunks) > 1
+    assert all(ollama.estimate_tokens(c) <= 100 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_split_text_splits_overlong_sentence_on_words():
+    text = " ".join(["word"] * 1000)
+
+    chunks = ollama.split_text(text, max_tokens=100)
+
+    assert all(ollama.estimate_tokens(c) <= 100 for c in chunks)
+    assert " ".join(chunks) == text
+
+
+async def test_short_text_is_summarized_in_one_call():
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"response": "summary"}
+
+    with patch(
+        "httpx.AsyncClient.post", new=AsyncMock(return_value=mock_response)
+    ) as mock_post:
+        await ollama.summarize("A short article.")
+
+    assert mock_post.await_count == 1
+
+
+async def test_long_text_is_summarized_map_reduce(monkeypatch):
+    monkeypatch.setattr(settings, "ollama_context_tokens", 1024 + 300)
+    text = " ".join(f"Sentence number {i} is here." for i in range(300))
+    mock_response = MagicMock()
+    mock_response.raise_for_status = MagicMock()
+    mock_response.json.return_value = {"response": "Chunk summary."}
+
+    with patch(
+        "httpx.AsyncClient.post", new=AsyncMock(return_value=mock_response)
+    ) as mock_post:
+        result = await ollama.summarize(text, "short")
+
+    prompts = [call.kwargs["json"]["prompt"] for call in mock_post.call_args_list]
+    assert result == "Chunk summary."
+    assert len(prompts) > 2
+    assert all("section of a longer article" in p for p in prompts[:-1])
+    assert "1-2 sentences" in prompts[-1]
+    assert "Chunk summary." in prompts[-1]
+
+
+async def test_condense_truncates_when_map_step_does_not_shrink(monkeypatch):
+    monkeypatch.setattr(settings, "ollama_context_tokens", 1024 + 300)
+    text = " ".join(f"Sentence number {i} is here." for i in range(300))
+
+    async def echo(prompt):
+        return prompt.split("\n\n", 1)[1] + " And more."
+
+    with patch("app.services.ollama._generate", new=AsyncMock(side_effect=echo)):
+        condensed = await ollama.condense(text)
+
+    assert ollama.estimate_tokens(condensed) <= ollama.input_token_budget()
+    assert text.startswith(condensed)
@@ -0,0 +1,95 @@
+from lxml import html as lxml_html
+
+from app.services import readability
+
+ARTICLE = " ".join(
+    f"Paragraph {i} of the story has plenty of prose, with commas, and detail."
+    for i in range(4)
+)
+
+PAGE = f"""<html><body>
+<div class="cookie-banner"><p>We use cookies to improve your experience, okay?</p></div>
+<nav><ul>
+  <li><a href="/a">Home</a></li><li><a href="/b">World news today</a></li>
+</ul></nav>
+<div class="layout">
+  <div class="content">
+    <h1>Headline of the story</h1>
+    <div class="post-body">
+      <p>{ARTICLE}</p>
+      <p>{ARTICLE}</p>
+      <p>{ARTICLE}</p>
+    </div>
+  </div>
+  <div id="comments">
+    <p>First comment that is long enough to be scored as text.</p>
+  </div>
+  <div class="links">
+    <p><a href="/1">A link list that is long enough to be scored</a></p>
+  </div>
+</div>
+<footer><p>Copyright notice and legal text that goes on for a while.</p></footer>
+</body></html>"""
+
+
+def main_text(page: str) -> str:
+    return readability.extract_main_text(lxml_html.document_fromstring(page))
+
+
+def test_keeps_article_body_and_heading():
+    text = main_text(PAGE)
+
+    assert text.startswith("Headline of the story")
+    assert text.count("Paragraph 0") == 3
+
+
+def test_drops_boilerplate():
+    text = main_text(PAGE)
+
+    assert "cookies" not in text
+    assert "World news" not in text
+    assert "comment" not in text
+    assert "Copyright" not in text
+    assert "link list" not in text
+
+
+def test_returns_empty_without_enough_prose():
+    page = "<html><body><nav><a href='/'>Home</a></nav><p>Short.</p></body></html>"
+
+    assert main_text(page) == ""
+
+
+def test_link_heavy_block_loses_to_prose():
+    links = "".join(f"<p><a href='/{i}'>{ARTICLE[:60]}</a></p>" for i in range(20))
+    page = f"<html><body><div>{links}</div><div><p>{ARTICLE}</p></div></body></html>"
+
+    text = main_text(page)
+
+    assert text == ARTICLE
+
+
+def test_listing_page_returns_empty():
+    cards = "".join(
+        f'<div class="card"><h2>Story {i}</h2><p>{ARTICLE}</p></div>' for i in range(6)
+    )
+    page = f"<html><body><div class='stories'>{cards}</div></body></html>"
+
+    assert main_text(page) == ""
+
+
+def test_lead_teaser_of_front_page_returns_empty():
+    lead = f"<section class='lead'><p>{ARTICLE}</p></section>"
+    teasers = "".join(
+        f"<div><a href='/{i}'>Teaser {i}</a> with a short line of text under it</div>"
+        for i in range(60)
+    )
+    page = f"<html><body><div>{lead}{teasers}</div></body></html>"
+
+    assert main_text(page) == ""
+
+
+def test_class_weight():
+    element = lxml_html.fragment_fromstring('<div class="sidebar"></div>')
+    assert readability.class_weight(element) == -25
+    element = lxml_html.fragment_fromstring('<div id="article-content"></div>')
+    assert readability.class_weight(element) == 25
@@ -1,41 +1,311 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import gzip
+from unittest.mock import patch
 
 import httpx
 import pytest
 
-from app.services import scraper
+from app.config import settings
+from app.services import dns, failures, scraper
 
 
 @pytest.fixture
-def mock_html_response():
-    mock = MagicMock()
-    mock.raise_for_status = MagicMock()
-    return mock
+def serve():
+    """
+    Route the scraper's requests to `handler` instead of the network and
+    return the list of requests it received.
+    """
+    patchers = []
+    requests: list[httpx.Request] = []
 
+    def start(handler):
+        def record(request):
+            requests.append(request)
+            return handler(request)
 
-async def test_returns_plain_text(mock_html_response):
-    mock_html_response.text = "<html><body><p>Hello world</p></body></html>"
-    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_html_response)):
-        result = await scraper.fetch_text("https://example.com")
+        client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        patcher = patch("app.services.scraper.get_scraper_client", return_value=client)
+        patcher.start()
+        patchers.append(patcher)
+        return requests
 
-        assert result == "Hello world"
+    yield start
+    for patcher in patchers:
+        patcher.stop()
 
 
-async def test_strips_script_and_style_tags(mock_html_response):
-    mock_html_response.text = """<html><head><style>body{}</style></head>
-    <body><script>alert(1)</script><p>Real content</p></body></html>"""
-    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_html_response)):
-        result = await scraper.fetch_text("https://example.com")
+def html(body: bytes | str, **kwargs) -> httpx.Response:
+    headers = kwargs.pop("headers", {"content-type": "text/html; charset=utf-8"})
+    return httpx.Response(200, content=body, headers=headers, **kwargs)
 
-        assert result == "Real content"
-        assert "alert" not in result
-        assert "body{}" not in result
 
+async def test_returns_plain_text(serve):
+    serve(lambda request: html("<html><body><p>Hello world</p></body></html>"))
 
-async def test_raises_http_error(mock_html_response):
-    mock_html_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-        "error", request=MagicMock(), response=MagicMock()
+    result = (await scraper.fetch_page("https://example.com")).text
+
+    assert result == "Hello world"
+
+
+async def test_strips_script_and_style_tags(serve):
+    serve(
+        lambda request: html(
+            """<html><head><style>body{}</style></head>
+            <body><script>alert(1)</script><p>Real content</p></body></html>"""
+        )
+    )
+
+    result = (await scraper.fetch_page("https://example.com")).text
+
+    assert result == "Real content"
+    assert "alert" not in result
+    assert "body{}" not in result
+
+
+async def test_raises_http_error(serve):
+    serve(lambda request: httpx.Response(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await scraper.fetch_page("https://example.com")
+
+
+async def test_requests_keep_host_name(serve):
+    requests = serve(lambda request: html("<p>Hello</p>"))
+
+    await scraper.fetch_page("https://example.com/page")
+
+    # The address is pinned by the transport at connect time (see test_dns)
+    assert str(requests[0].url) == "https://example.com/page"
+
+
+async def test_rejects_host_resolving_to_loopback(serve):
+    requests = serve(lambda request: html("<p>Hello</p>"))
+
+    with pytest.raises(dns.BlockedAddressError):
+        await scraper.fetch_page("http://localhost/page")
+
+    assert requests == []
+
+
+async def test_rejects_non_html_content_type(serve):
+    async def stream_forever():
+        raise AssertionError("body must not be read")
+        yield b""
+
+    serve(
+        lambda request: httpx.Response(
+            200, headers={"content-type": "video/mp4"}, content=stream_forever()
+        )
+    )
+
+    with pytest.raises(scraper.UnsupportedContentError):
+        await scraper.fetch_page("https://example.com/movie")
+
+
+async def test_accepts_missing_content_type(serve):
+    serve(lambda request: html("<p>Untyped</p>", headers={}))
+
+    assert (await scraper.fetch_page("https://example.com")).text == "Untyped"
+
+
+async def test_stops_reading_at_byte_cap(serve, monkeypatch):
+    monkeypatch.setattr(settings, "max_download_bytes", 1000)
+    chunks_sent = 0
+
+    async def stream_forever():
+        nonlocal chunks_sent
+        yield b"<p>"
+        while True:
+            chunks_sent += 1
+            yield b"word " * 100
+
+    serve(lambda request: html(stream_forever()))
+
+    result = (await scraper.fetch_page("https://example.com/huge")).text
+
+    assert chunks_sent < 5
+    assert len(result) <= 1000
+
+
+async def test_cap_applies_to_decompressed_bytes(serve, monkeypatch):
+    monkeypatch.setattr(settings, "max_download_bytes", 1000)
+    body = gzip.compress(b"<p>" + b"a " * 100_000)
+    serve(
+        lambda request: html(
+            body, headers={"content-type": "text/html", "content-encoding": "gzip"}
+        )
+    )
+
+    result = (await scraper.fetch_page("https://example.com/bomb")).text
+
+    assert len(result) <= 1000
+
+
+async def test_decodes_declared_charset(serve):
+    serve(
+        lambda request: html(
+            "<p>Café</p>".encode("latin-1"),
+            headers={"content-type": "text/html; charset=iso-8859-1"},
+        )
+    )
+
+    assert (await scraper.fetch_page("https://example.com")).text == "Café"
+
+
+async def test_logs_reduction_ratio(serve):
+    paragraph = "Article prose with enough words, commas, and detail to score. " * 5
+    nav = " ".join(f"<a href='/{i}'>Menu item {i}</a>" for i in range(100))
+    serve(
+        lambda request: html(f"<nav>{nav}</nav><article><p>{paragraph}</p></article>")
+    )
+
+    with patch("app.services.scraper.log") as mock_log:
+        text = (await scraper.fetch_page("https://example.com/story")).text
+
+    assert "Menu" not in text
+    _, kwargs = next(
+        c for c in mock_log.info.call_args_list if c.args == ("content extracted",)
+    )
+    assert kwargs["mode"] == "main"
+    assert kwargs["reduction"] > 2
+
+
+async def test_returns_validators(serve):
+    serve(
+        lambda request: html(
+            "<p>Hi</p>",
+            headers={
+                "content-type": "text/html",
+                "etag": '"abc"',
+                "last-modified": "Wed, 01 Jan 2026 00:00:00 GMT",
+            },
+        )
+    )
+
+    page = await scraper.fetch_page("https://example.com")
+
+    assert page == scraper.Page(
+        "Hi", '"abc"', "Wed, 01 Jan 2026 00:00:00 GMT", url="https://example.com"
     )
-    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=mock_html_response)):
+
+
+async def test_conditional_fetch_not_modified(serve):
+    requests = serve(lambda request: httpx.Response(304))
+
+    page = await scraper.fetch_page(
+        "https://example.com", etag='"abc"', last_modified="Wed, 01 Jan 2026"
+    )
+
+    assert page.not_modified
+    assert page.text == ""
+    assert requests[0].headers["if-none-match"] == '"abc"'
+    assert requests[0].headers["if-modified-since"] == "Wed, 01 Jan 2026"
+
+
+async def test_unconditional_fetch_sends_no_validators(serve):
+    requests = serve(lambda request: html("<p>Hi</p>"))
+
+    await scraper.fetch_page("https://example.com")
+
+    assert "if-none-match" not in requests[0].headers
+    assert "if-modified-since" not in requests[0].headers
+
+
+async def test_follows_redirects_and_checks_each_hop(serve):
+    def handler(request):
+        if request.headers["host"] == "short.example":
+            return httpx.Response(301, headers={"location": "https://example.com/a"})
+        return html("<p>Target</p>")
+
+    requests = serve(handler)
+
+    page = await scraper.fetch_page("https://short.example/x")
+
+    assert page.text == "Target"
+    assert page.url == "https://example.com/a"
+    assert [str(r.url) for r in requests] == [
+        "https://short.example/x",
+        "https://example.com/a",
+    ]
+
+
+async def test_redirect_loop_is_rejected(serve, monkeypatch):
+    monkeypatch.setattr(settings, "max_redirects", 3)
+    requests = serve(
+        lambda request: httpx.Response(302, headers={"location": "/again"})
+    )
+
+    with pytest.raises(scraper.RedirectError):
+        await scraper.fetch_page("https://example.com/")
+
+    assert len(requests) == 4
+
+
+async def test_redirect_to_blocked_domain_is_rejected(serve, monkeypatch):
+    monkeypatch.setattr(settings, "url_blocklist", "evil.com")
+    serve(
+        lambda request: httpx.Response(302, headers={"location": "https://evil.com/"})
+    )
+
+    with pytest.raises(scraper.RedirectError):
+        await scraper.fetch_page("https://example.com/")
+
+
+async def test_redirect_to_private_address_is_rejected(serve):
+    requests = serve(
+        lambda request: httpx.Response(302, headers={"location": "http://localhost/"})
+    )
+
+    with pytest.raises(dns.BlockedAddressError):
+        await scraper.fetch_page("https://example.com/")
+
+    assert len(requests) == 1
+
+
+async def test_returns_same_site_canonical_link(serve):
+    serve(
+        lambda request: html(
+            '<head><link rel="canonical" href="/story?id=1"></head><p>Hi</p>'
+        )
+    )
+
+    page = await scraper.fetch_page("https://example.com/amp/story")
+
+    assert page.canonical_url == "https://example.com/story?id=1"
+
+
+async def test_ignores_cross_site_canonical_link(serve):
+    serve(
+        lambda request: html(
+            '<head><link rel="canonical" href="https://other.com/x"></head><p>Hi</p>'
+        )
+    )
+
+    page = await scraper.fetch_page("https://example.com/story")
+
+    assert page.canonical_url is None
+
+
+async def test_failed_url_is_not_fetched_again(serve):
+    requests = serve(lambda request: httpx.Response(404))
+
+    for _ in range(3):
         with pytest.raises(httpx.HTTPStatusError):
-            await scraper.fetch_text("https://example.com")
+            await scraper.fetch_page("https://example.com/missing")
+
+    assert len(requests) == 1
+
+
+async def test_failing_host_is_backed_off(serve, monkeypatch):
+    monkeypatch.setattr(failures.fetch_failures, "backoff_threshold", 2)
+
+    def handler(request):
+        raise httpx.ConnectTimeout("timeout", request=request)
+
+    requests = serve(handler)
+    for path in ("a", "b"):
+        with pytest.raises(httpx.ConnectTimeout):
+            await scraper.fetch_page(f"https://example.com/{path}")
+
+    with pytest.raises(failures.HostBackoffError):
+        await scraper.fetch_page("https://example.com/c")
+    assert len(requests) == 2
@@ -0,0 +1,311 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.minhash_band import MinHashBand
+from app.repositories import async_summary as async_summary_repo
+from app.services import summarizer
+from app.services.scraper import Page
+from app.utils import minhash
+from app.utils.hashing import content_hash
+from tests.conftest import TestingAsyncSessionLocal
+
+
+async def slow_fetch(url, **validators):
+    await asyncio.sleep(0.01)
+    return Page("article text")
+
+
+async def test_generate_coalesces_concurrent_requests(async_db_session):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=slow_fetch),
+    ) as mock_fetch:
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ) as mock_ollama:
+            results = await asyncio.gather(
+                *[
+                    summarizer.generate(
+                        TestingAsyncSessionLocal,
+                        "https://Example.com#top",
+                        "medium",
+                        "prose",
+                    )
+                    for _ in range(5)
+                ],
+                summarizer.generate(
+                    TestingAsyncSessionLocal, "https://example.com/", "medium", "prose"
+                ),
+            )
+
+    assert (
+        results
+        == [(Page("article text"), "summary", minhash.signature("article text"))] * 6
+    )
+    assert mock_fetch.await_count == 1
+    assert mock_ollama.await_count == 1
+
+
+async def test_generate_does_not_coalesce_different_variants(async_db_session):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=slow_fetch),
+    ) as mock_fetch:
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            await asyncio.gather(
+                summarizer.generate(
+                    TestingAsyncSessionLocal, "https://example.com/", "short", "prose"
+                ),
+                summarizer.generate(
+                    TestingAsyncSessionLocal, "https://example.com/", "long", "prose"
+                ),
+            )
+
+    assert mock_fetch.await_count == 2
+
+
+async def test_create_shares_one_record(async_db_session):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=slow_fetch),
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            records = await asyncio.gather(
+                *[
+                    summarizer.create(
+                        TestingAsyncSessionLocal,
+                        "https://example.com/",
+                        "medium",
+                        "prose",
+                    )
+                    for _ in range(5)
+                ]
+            )
+
+    assert len({record.id for record in records}) == 1
+
+
+async def test_create_outlives_cancelled_first_caller():
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=slow_fetch),
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            first = asyncio.create_task(
+                summarizer.create(
+                    TestingAsyncSessionLocal, "https://example.com/", "medium", "prose"
+                )
+            )
+            await asyncio.sleep(0)
+            second = asyncio.create_task(
+                summarizer.create(
+                    TestingAsyncSessionLocal, "https://example.com/", "medium", "prose"
+                )
+            )
+            await asyncio.sleep(0)
+            first.cancel()
+            record = await second
+
+    async with TestingAsyncSessionLocal() as db:
+        stored = await async_summary_repo.get_by_id(db, record.id)
+    assert first.cancelled()
+    assert stored is not None
+    assert stored.summary == "summary"
+
+
+async def test_generate_reuses_summary_of_duplicate_content(async_db_session):
+    source = await async_summary_repo.create(
+        async_db_session,
+        url="https://example.com/story",
+        content="article text",
+        summary="existing summary",
+        model="llama3.2",
+        content_hash=content_hash("article text"),
+    )
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article  text\n")),
+    ):
+        with patch("app.services.ollama.summarize", new=AsyncMock()) as mock_ollama:
+            _, summary, _ = await summarizer.generate(
+                TestingAsyncSessionLocal,
+                "https://mirror.example/story",
+                "medium",
+                "prose",
+            )
+
+    assert summary == source.summary
+    mock_ollama.assert_not_called()
+
+
+async def test_generate_ignores_duplicate_of_other_variant(async_db_session):
+    await async_summary_repo.create(
+        async_db_session,
+        url="https://example.com/story",
+        content="article text",
+        summary="existing summary",
+        model="llama3.2",
+        length="short",
+        content_hash=content_hash("article text"),
+    )
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ) as mock_ollama:
+            _, summary, _ = await summarizer.generate(
+                TestingAsyncSessionLocal,
+                "https://mirror.example/story",
+                "long",
+                "prose",
+            )
+
+    assert summary == "summary"
+    mock_ollama.assert_awaited_once()
+
+
+async def test_generate_reuses_summary_of_near_duplicate_content(async_db_session):
+    article = " ".join(f"Sentence {i} of a long article." for i in range(100))
+    await async_summary_repo.create(
+        async_db_session,
+        url="https://example.com/story",
+        content=article,
+        summary="existing summary",
+        model="llama3.2",
+        content_hash=content_hash(article),
+        minhash=minhash.signature(article),
+    )
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page(f"Ad: buy now. {article} Updated 10:32.")),
+    ):
+        with patch("app.services.ollama.summarize", new=AsyncMock()) as mock_ollama:
+            _, summary, _ = await summarizer.generate(
+                TestingAsyncSessionLocal,
+                "https://mirror.example/story",
+                "medium",
+                "prose",
+            )
+
+    assert summary == "existing summary"
+    mock_ollama.assert_not_called()
+
+
+async def test_generate_ignores_near_duplicate_below_threshold(
+    async_db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "near_duplicate_threshold", 1.01)
+    article = " ".join(f"Sentence {i} of a long article." for i in range(100))
+    await async_summary_repo.create(
+        async_db_session,
+        url="https://example.com/story",
+        content=article,
+        summary="existing summary",
+        model="llama3.2",
+        minhash=minhash.signature(article),
+    )
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page(f"{article} Updated 10:32.")),
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ) as mock_ollama:
+            _, summary, _ = await summarizer.generate(
+                TestingAsyncSessionLocal,
+                "https://mirror.example/story",
+                "medium",
+                "prose",
+            )
+
+    assert summary == "summary"
+    mock_ollama.assert_awaited_once()
+
+
+async def test_create_stores_minhash_bands(async_db_session):
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(return_value=Page("article text")),
+    ):
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="summary")
+        ):
+            record = await summarizer.create(
+                TestingAsyncSessionLocal, "https://example.com/", "medium", "prose"
+            )
+
+    assert record.minhash == minhash.signature("article text")
+    bands = await async_db_session.scalars(select(MinHashBand))
+    assert len(list(bands)) == minhash.BANDS
+
+
+async def test_create_computes_signature_once():
+    with (
+        patch(
+            "app.services.scraper.fetch_page",
+            new=AsyncMock(return_value=Page("article text")),
+        ),
+        patch("app.services.ollama.summarize", new=AsyncMock(return_value="summary")),
+        patch("app.utils.minhash.signature", wraps=minhash.signature) as mock_signature,
+    ):
+        record = await summarizer.create(
+            TestingAsyncSessionLocal, "https://example.com/", "medium", "prose"
+        )
+
+    mock_signature.assert_called_once_with("article text")
+    assert record.minhash == minhash.signature("article text")
+
+
+async def test_background_refreshes_share_one_run(async_db_session):
+    record = await async_summary_repo.create(
+        async_db_session,
+        url="https://example.com/",
+        content="old text",
+        summary="old summary",
+        model="llama3.2",
+    )
+    with patch(
+        "app.services.scraper.fetch_page", new=AsyncMock(side_effect=slow_fetch)
+    ) as mock_fetch:
+        with patch(
+            "app.services.ollama.summarize", new=AsyncMock(return_value="new summary")
+        ):
+            for _ in range(3):
+                summarizer.refresh_in_background(TestingAsyncSessionLocal, record.id)
+            await asyncio.gather(*summarizer._background)
+
+    assert mock_fetch.await_count == 1
+    await async_db_session.refresh(record)
+    assert record.summary == "new summary"
+
+
+async def test_background_refresh_failure_is_logged(async_db_session):
+    record = await async_summary_repo.create(
+        async_db_session,
+        url="https://example.com/",
+        content="old text",
+        summary="old summary",
+        model="llama3.2",
+    )
+    with patch(
+        "app.services.scraper.fetch_page",
+        new=AsyncMock(side_effect=httpx.ConnectError("down")),
+    ):
+        summarizer.refresh_in_background(TestingAsyncSessionLocal, record.id)
+        (result,) = await asyncio.gather(*summarizer._background)
+
+    assert result is None
+    await async_db_session.refresh(record)
+    assert record.summary == "old summary"
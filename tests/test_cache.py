@@ -0,0 +1,91 @@
+from datetime import UTC, datetime
+
+from app.cache import SummaryCache
+from app.models.summary import Summary
+from app.utils.urls import canonicalize_url
+
+
+def make_record(id=1, url="https://example.com/", summary="A summary", **kwargs):
+    return Summary(
+        id=id,
+        url=url,
+        canonical_url=canonicalize_url(url),
+        summary=summary,
+        content="word " * 400,
+        model="llama3.2",
+        length=kwargs.get("length", "medium"),
+        format=kwargs.get("format", "prose"),
+        created_at=datetime(2026, 1, 1),
+        fetched_at=kwargs.get("fetched_at", datetime.now(UTC).replace(tzinfo=None)),
+    )
+
+
+def test_get_after_put_is_a_hit():
+    cache = SummaryCache(max_entries=10, max_bytes=1_000_000)
+    cache.put(make_record())
+
+    entry = cache.get("https://example.com/", "medium", "prose")
+
+    assert entry is not None
+    assert entry.summary == "A summary"
+    assert entry.reading_time_minutes == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_includes_length_and_format():
+    cache = SummaryCache(max_entries=10, max_bytes=1_000_000)
+    cache.put(make_record())
+
+    assert cache.get("https://example.com/", "short", "prose") is None
+    assert cache.get("https://example.com/", "medium", "markdown") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_expired_entry_is_a_miss():
+    cache = SummaryCache(max_entries=10, max_bytes=1_000_000)
+    cache.put(make_record(fetched_at=datetime(2020, 1, 1)))
+
+    assert cache.get("https://example.com/", "medium", "prose") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = SummaryCache(max_entries=2, max_bytes=1_000_000)
+    cache.put(make_record(id=1, url="https://a.com/"))
+    cache.put(make_record(id=2, url="https://b.com/"))
+    cache.get("https://a.com/", "medium", "prose")
+    cache.put(make_record(id=3, url="https://c.com/"))
+
+    assert cache.get("https://a.com/", "medium", "prose") is not None
+    assert cache.get("https://b.com/", "medium", "prose") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_total_bytes():
+    cache = SummaryCache(max_entries=100, max_bytes=1_000)
+    cache.put(make_record(id=1, url="https://a.com/", summary="x" * 500))
+    cache.put(make_record(id=2, url="https://b.com/", summary="x" * 500))
+
+    assert cache.get("https://a.com/", "medium", "prose") is None
+    assert cache.stats()["bytes"] <= 1_000
+
+
+def test_invalidate():
+    cache = SummaryCache(max_entries=10, max_bytes=1_000_000)
+    cache.put(make_record())
+    cache.invalidate("https://example.com/", "medium", "prose")
+
+    assert cache.get("https://example.com/", "medium", "prose") is None
+
+
+def test_get_follows_alias():
+    cache = SummaryCache(max_entries=10, max_bytes=1_000_000)
+    cache.put(make_record(url="https://example.com/article"))
+    cache.alias(
+        "https://short.example/x?utm_source=feed", "https://example.com/article"
+    )
+
+    entry = cache.get("https://short.example/x", "medium", "prose")
+
+    assert entry is not None
+    assert entry.url == "https://example.com/article"
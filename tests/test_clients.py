@@ -0,0 +1,23 @@
+from app import clients
+from app.config import settings
+
+
+async def test_scraper_client_is_shared():
+    assert clients.get_scraper_client() is clients.get_scraper_client()
+    await clients.close_clients()
+
+
+async def test_ollama_client_uses_configured_timeout():
+    client = clients.get_ollama_client()
+
+    assert client.timeout.read == settings.ollama_timeout_seconds
+    await clients.close_clients()
+
+
+async def test_close_clients_recreates_on_next_use():
+    client = clients.get_scraper_client()
+    await clients.close_clients()
+
+    assert client.is_closed
+    assert clients.get_scraper_client() is not client
+    await clients.close_clients()
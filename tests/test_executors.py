@@ -0,0 +1,82 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+
+from app.executors import CPUOffloader
+from app.services.extractors import extract_document
+
+
+def worker_pid(data: bytes) -> int:
+    return os.getpid()
+
+
+@pytest.fixture
+def offloader():
+    offloader = CPUOffloader(workers=1, threshold_bytes=100)
+    yield offloader
+    offloader.shutdown()
+
+
+async def test_small_input_runs_in_thread(offloader):
+    pid = await offloader.run(worker_pid, b"x" * 10)
+
+    assert pid == os.getpid()
+    assert offloader.stats()["completed_in_threads"] == 1
+    assert offloader._pool is None
+
+
+async def test_large_input_runs_in_process(offloader):
+    pid = await offloader.run(worker_pid, b"x" * 100)
+
+    assert pid != os.getpid()
+    assert offloader.stats()["completed_in_processes"] == 1
+
+
+async def test_extracts_in_worker_process(offloader):
+    html = "<p>Café</p><script>x</script>".ljust(200).encode("latin-1")
+
+    extraction = await offloader.run(extract_document, html, "latin-1", "lxml")
+
+    assert extraction.text == "Café"
+
+
+async def test_zero_workers_always_uses_threads():
+    offloader = CPUOffloader(workers=0, threshold_bytes=0)
+
+    assert await offloader.run(worker_pid, b"x" * 1000) == os.getpid()
+
+
+async def test_broken_pool_falls_back_to_thread(offloader):
+    original = offloader._submit
+
+    async def submit(kind, fn, *args):
+        if kind == "process":
+            raise BrokenProcessPool()
+        return await original(kind, fn, *args)
+
+    with patch.object(offloader, "_submit", side_effect=submit):
+        assert await offloader.run(worker_pid, b"x" * 100) == os.getpid()
+
+
+async def test_stats_report_queue_depth(offloader):
+    release = asyncio.Event()
+
+    async def blocked(kind, fn, *args):
+        offloader._in_flight[kind] += 1
+        await release.wait()
+        offloader._in_flight[kind] -= 1
+
+    with patch.object(offloader, "_submit", side_effect=blocked):
+        tasks = [
+            asyncio.create_task(offloader.run(worker_pid, b"x" * 100)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        stats = offloader.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert stats["running"] == 1
+    assert stats["queued"] == 2
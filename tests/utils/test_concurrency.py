@@ -0,0 +1,64 @@
+import asyncio
+
+from app.utils.concurrency import ConcurrencyLimiter
+
+
+async def run_tasks(limiter, keys):
+    running = 0
+    peak = 0
+    peak_per_key: dict[str, int] = {}
+    running_per_key: dict[str, int] = {}
+
+    async def work(key):
+        nonlocal running, peak
+        async with limiter.slot(key):
+            running += 1
+            running_per_key[key] = running_per_key.get(key, 0) + 1
+            peak = max(peak, running)
+            peak_per_key[key] = max(peak_per_key.get(key, 0), running_per_key[key])
+            await asyncio.sleep(0.01)
+            running -= 1
+            running_per_key[key] -= 1
+
+    await asyncio.gather(*[work(key) for key in keys])
+    return peak, peak_per_key
+
+
+async def test_global_limit_is_respected():
+    limiter = ConcurrencyLimiter(3)
+
+    peak, _ = await run_tasks(limiter, [None] * 10)
+
+    assert peak == 3
+    assert limiter.stats() == {"limit": 3, "active": 0, "waiting": 0}
+
+
+async def test_per_key_limit_is_respected():
+    limiter = ConcurrencyLimiter(10, per_key_limit=2)
+
+    peak, peak_per_key = await run_tasks(limiter, ["a.com"] * 6 + ["b.com"] * 6)
+
+    assert peak == 4
+    assert peak_per_key == {"a.com": 2, "b.com": 2}
+
+
+async def test_cancelled_waiter_releases_its_key():
+    limiter = ConcurrencyLimiter(1, per_key_limit=1)
+    holder_entered = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot("a.com"):
+            holder_entered.set()
+            await asyncio.sleep(0.05)
+
+    holder = asyncio.create_task(hold())
+    await holder_entered.wait()
+    waiter = asyncio.create_task(limiter.slot("a.com").__aenter__())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    await holder
+
+    assert limiter.stats()["waiting"] == 0
+    async with limiter.slot("a.com"):
+        pass
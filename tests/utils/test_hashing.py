@@ -0,0 +1,13 @@
+from app.utils.hashing import content_hash
+
+
+def test_content_hash_ignores_whitespace_layout():
+    assert content_hash("An  article\n\ttext ") == content_hash("An article text")
+
+
+def test_content_hash_normalizes_unicode():
+    assert content_hash("café") == content_hash("café")
+
+
+def test_content_hash_differs_for_different_text():
+    assert content_hash("An article") != content_hash("Another article")
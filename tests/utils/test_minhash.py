@@ -0,0 +1,70 @@
+import random
+
+from app.utils import minhash
+
+ARTICLE = " ".join(
+    f"Paragraph {i} of the article explains point {i % 7} in some detail."
+    for i in range(200)
+)
+
+
+def jaccard(a: str, b: str) -> float:
+    x, y = set(minhash.shingles(a).tolist()), set(minhash.shingles(b).tolist())
+    return len(x & y) / len(x | y)
+
+
+def test_signature_is_deterministic():
+    sig = minhash.signature(ARTICLE)
+
+    assert sig is not None
+    assert len(sig) == minhash.NUM_PERM * 4
+    assert minhash.signature(ARTICLE) == sig
+
+
+def test_signature_ignores_case_and_punctuation():
+    assert minhash.signature("Hello, World! Again.") == minhash.signature(
+        "hello world again"
+    )
+
+
+def test_signature_of_text_without_words_is_none():
+    assert minhash.signature("") is None
+    assert minhash.signature(" -- ") is None
+
+
+def test_short_text_has_one_shingle():
+    assert len(minhash.shingles("two words")) == 1
+
+
+def test_similarity_estimates_jaccard():
+    rng = random.Random(1)
+    words = [f"w{rng.randint(0, 5000)}" for _ in range(3000)]
+    edited = list(words)
+    for i in rng.sample(range(len(words)), 60):
+        edited[i] = "changed"
+    a, b = " ".join(words), " ".join(edited)
+
+    (estimate,) = minhash.similarities(minhash.signature(a), [minhash.signature(b)])
+
+    assert abs(estimate - jaccard(a, b)) < 0.1
+
+
+def test_near_duplicates_share_a_band_bucket():
+    edited = f"Advertisement. {ARTICLE} Updated 10:32. Related: other stories."
+    unrelated = " ".join(f"Completely different text number {i}." for i in range(200))
+
+    buckets = set(minhash.bands(minhash.signature(ARTICLE)))
+
+    assert buckets & set(minhash.bands(minhash.signature(edited)))
+    assert not buckets & set(minhash.bands(minhash.signature(unrelated)))
+
+
+def test_bands_are_distinct_per_band():
+    # The same rows in two different bands must not collide
+    sig = bytes(minhash.NUM_PERM * 4)
+
+    assert len(set(minhash.bands(sig))) == minhash.BANDS
+
+
+def test_similarities_of_no_candidates():
+    assert len(minhash.similarities(minhash.signature(ARTICLE), [])) == 0
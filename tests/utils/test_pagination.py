@@ -1,4 +1,19 @@
-from app.utils.pagination import build_pagination_links
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.utils.pagination import (
+    Cursor,
+    build_pagination_links,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def encode_cursor_like(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
 
 
 def test_single_page_no_links():
@@ -44,3 +59,35 @@ def test_extra_params_included_in_links():
 
     assert next_url == "/endpoint?size=10&q=python&page=6"
     assert prev_url == "/endpoint?size=10&q=python&page=4"
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(datetime(2026, 1, 2, 3, 4, 5, 678), 42, before=True)
+
+    token = encode_cursor(cursor)
+
+    assert "=" not in token
+    assert decode_cursor(token) == cursor
+
+
+@pytest.mark.parametrize("token", ["garbage", "e30", encode_cursor_like([1, 2])])
+def test_decode_invalid_cursor(token):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(token)
+
+
+def test_cursor_links():
+    next_url, prev_url = build_pagination_links(
+        base_path="/endpoint",
+        size=10,
+        extra_params={"q": "python"},
+        next_cursor="abc",
+        prev_cursor="xyz",
+    )
+
+    assert next_url == "/endpoint?size=10&q=python&cursor=abc"
+    assert prev_url == "/endpoint?size=10&q=python&cursor=xyz"
+
+
+def test_cursor_links_without_cursors():
+    assert build_pagination_links(base_path="/endpoint", size=10) == (None, None)
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*[flight.do("key", work) for _ in range(10)])
+
+    assert results == ["result"] * 10
+    assert calls == 1
+    assert len(flight) == 0
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(flight.do("a", work), flight.do("b", work))
+
+    assert calls == 2
+
+
+async def test_exception_is_shared_and_key_released():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(flight) == 0
+    with pytest.raises(ValueError):
+        await flight.do("key", fail)
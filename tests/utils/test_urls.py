@@ -0,0 +1,56 @@
+import pytest
+
+from app.config import settings
+from app.utils.urls import canonicalize_url, is_public_address
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("HTTPS://Example.COM", "https://example.com/"),
+        ("https://www.example.com/a", "https://example.com/a"),
+        ("https://example.com/a/", "https://example.com/a"),
+        ("https://example.com:443/a", "https://example.com/a"),
+        ("http://example.com:8080/a", "http://example.com:8080/a"),
+        ("https://example.com/a#section", "https://example.com/a"),
+        ("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+        ("https://example.com/a?x=2&x=1", "https://example.com/a?x=2&x=1"),
+        (
+            "https://example.com/a?utm_source=news&id=7&fbclid=abc&gclid=1",
+            "https://example.com/a?id=7",
+        ),
+        ("https://example.com/A/Path", "https://example.com/A/Path"),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_canonicalize_url_is_idempotent():
+    url = "https://WWW.example.com:443/a/b/?utm_medium=x&q=a+b&z=&a=%20#top"
+
+    canonical = canonicalize_url(url)
+
+    assert canonicalize_url(canonical) == canonical
+
+
+def test_tracking_params_are_configurable(monkeypatch):
+    monkeypatch.setattr(settings, "url_tracking_params", "ref,sess_*")
+
+    assert (
+        canonicalize_url("https://example.com/?ref=x&sess_id=1&utm_source=y")
+        == "https://example.com/?utm_source=y"
+    )
+
+
+def test_keep_www_when_configured(monkeypatch):
+    monkeypatch.setattr(settings, "canonical_strip_www", False)
+
+    assert canonicalize_url("https://www.example.com/") == "https://www.example.com/"
+
+
+def test_is_public_address():
+    assert is_public_address("93.184.216.34")
+    assert not is_public_address("10.0.0.1")
+    assert not is_public_address("127.0.0.1")
+    assert not is_public_address("::1")